@@ -7,20 +7,43 @@ https://github.com/pworoniecki/frapol-ecoNET-300-Home-Assistant-Integration
 
 from __future__ import annotations
 
-from datetime import timedelta
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.loader import async_get_loaded_integration
 
 from .api import FrapolEconet300ApiClient
-from .const import DOMAIN, LOGGER, NAME
+from .const import (
+    CONF_FLIGHT_RECORDER,
+    CONF_REPLAY_SPEED,
+    DATA_FLEET_SCHEDULER,
+    DEFAULT_REPLAY_SPEED,
+    DOMAIN,
+    LOGGER,
+    NAME,
+    SIGNAL_METADATA_LOADED,
+)
 from .coordinator import FrapolEconet300DataUpdateCoordinator
 from .data import FrapolEconet300Data
+from .flight_recorder import (
+    FrapolEconet300FlightRecorder,
+    FrapolEconet300FlightRecorderMode,
+    FrapolEconet300ReplayTransport,
+    read_recording,
+)
+from .metadata import FrapolEconet300MetadataStore, firmware_fingerprint
+from .profiles import FrapolEconet300ProfileStore
+from .scheduler import FrapolEconet300FleetScheduler
+from .services import async_setup_services
+from .transport import FrapolEconet300Transport
+from .writer import FrapolEconet300WritePipeline
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import FrapolEconet300ConfigEntry
 
@@ -30,46 +53,135 @@ PLATFORMS: list[Platform] = [
 ]
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001 Unused function argument: `config`
+    """Set up services, which are shared by all entries."""
+    async_setup_services(hass)
+    return True
+
+
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: FrapolEconet300ConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-
-    # TODO consider always_update=False - should work well to avoid duplicate updates dispatched to listeners
+    # Coordinator polls regParams on an adaptive interval, the client skips other tiers
+    # which are not due yet
     coordinator = FrapolEconet300DataUpdateCoordinator(
         hass=hass,
         logger=LOGGER,
         name=DOMAIN,
-        update_interval=timedelta(seconds=5),
+        config_entry=entry,
+        always_update=False,
+    )
+    # Polls of all entries are staggered and their requests share a fleet-wide limit
+    fleet = hass.data.setdefault(DATA_FLEET_SCHEDULER, FrapolEconet300FleetScheduler())
+    fleet.register(entry.entry_id)
+    entry.async_on_unload(lambda: fleet.unregister(entry.entry_id))
+    # Raw responses can be recorded, or replayed instead of the device for debugging
+    flight_recorder_mode = entry.options.get(
+        CONF_FLIGHT_RECORDER, FrapolEconet300FlightRecorderMode.OFF
+    )
+    recording_path = Path(
+        hass.config.path(DOMAIN, f"flight_recorder_{entry.entry_id}.ndjson.gz")
     )
+    flight_recorder = None
+    replay = None
+    if flight_recorder_mode == FrapolEconet300FlightRecorderMode.RECORD:
+        flight_recorder = FrapolEconet300FlightRecorder(recording_path)
+        entry.async_on_unload(flight_recorder.async_close)
+    elif flight_recorder_mode == FrapolEconet300FlightRecorderMode.REPLAY:
+        recording = await hass.async_add_executor_job(
+            lambda: list(read_recording(recording_path))
+        )
+        LOGGER.warning(
+            "Replaying %d recorded responses in place of the device", len(recording)
+        )
+        replay = FrapolEconet300ReplayTransport(
+            recording,
+            speed=entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED) or None,
+        )
+    # The device copes badly with concurrent connections, it gets a serialized one
+    client = FrapolEconet300ApiClient(
+        host=entry.data[CONF_HOST],
+        username=entry.data[CONF_USERNAME],
+        password=entry.data[CONF_PASSWORD],
+        transport=replay or FrapolEconet300Transport(limiter=fleet.limiter),
+        flight_recorder=flight_recorder,
+    )
+    entry.async_on_unload(client.close)
     entry.runtime_data = FrapolEconet300Data(
-        client=FrapolEconet300ApiClient(
-            host=entry.data[CONF_HOST],
-            username=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-            session=async_get_clientsession(hass),
-        ),
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        writer=FrapolEconet300WritePipeline(hass, coordinator),
+        fleet=fleet,
+        replay=replay,
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    # Entities start from the last known snapshot if any, the device is polled meanwhile
+    started_from_snapshot = await coordinator.async_load_snapshot()
+    if not started_from_snapshot:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
+
+    entry.runtime_data.metadata = FrapolEconet300MetadataStore(
+        hass, client, coordinator.data.uid
+    )
+    # Started from the snapshot, it is loaded once platforms are set up
+    if not started_from_snapshot:
+        await entry.runtime_data.metadata.async_load(
+            firmware_fingerprint(coordinator.data.sys_params)
+        )
+    entry.runtime_data.profiles = FrapolEconet300ProfileStore(
+        hass, coordinator.data.uid
+    )
+    await entry.runtime_data.profiles.async_load()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    if started_from_snapshot:
+        entry.async_create_background_task(
+            hass,
+            _async_load_metadata_and_refresh(hass, entry),
+            f"{DOMAIN} first refresh",
+        )
+
     return True
 
 
+async def _async_load_metadata_and_refresh(
+    hass: HomeAssistant,
+    entry: FrapolEconet300ConfigEntry,
+) -> None:
+    """
+    Load metadata, then poll the device, for entities set up from the snapshot.
+
+    Metadata is fetched from the device unless stored for its firmware. Entities it
+    describes are added before the poll, so their values are read by it.
+    """
+    coordinator = entry.runtime_data.coordinator
+    await entry.runtime_data.metadata.async_load(
+        firmware_fingerprint(coordinator.data.sys_params)
+    )
+    async_dispatcher_send(hass, SIGNAL_METADATA_LOADED.format(entry.entry_id))
+    await coordinator.async_refresh()
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: FrapolEconet300ConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        # Send pending writes while the connection, closed on unload, is still open
+        await entry.runtime_data.writer.async_shutdown()
+    return unload_ok
 
 
 async def async_reload_entry(
@@ -0,0 +1,89 @@
+"""
+Time-bucket aggregation of regParams values for frapol_econet300_heat_recovery.
+
+Readings are piecewise constant between polls, so every value is weighted by how long it
+was held. Only changed values are fed in, unchanged ones are accounted for lazily when
+the next value arrives or the window closes - constant time per sample and constant
+memory per aggregated value.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FrapolEconet300WindowResult:
+    """Aggregates of a closed window."""
+
+    mean: float
+    min: float
+    max: float
+    samples: int
+
+
+class FrapolEconet300TimeWeightedWindow:
+    """
+    Time-weighted mean, min and max over a tumbling window.
+
+    None marks a gap (e.g. the device being unavailable), which is left out of the mean.
+    The value held when a window closes carries over into the next one.
+    """
+
+    __slots__ = (
+        "_duration",
+        "_max",
+        "_min",
+        "_samples",
+        "_since",
+        "_value",
+        "_weighted_sum",
+    )
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._value: float | None = None
+        self._since = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._weighted_sum = 0.0
+        self._duration = 0.0
+        self._samples = 0
+        self._min = self._value if self._value is not None else math.inf
+        self._max = self._value if self._value is not None else -math.inf
+
+    def add(self, value: float | None, now: float) -> None:
+        """Record the value held from now on."""
+        self._accumulate(now)
+        self._value = value
+        if value is not None:
+            self._samples += 1
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+
+    def close(self, now: float) -> FrapolEconet300WindowResult | None:
+        """Close the window and start the next one, return None if it held no value."""
+        self._accumulate(now)
+        result = None
+        if self._duration > 0:
+            result = FrapolEconet300WindowResult(
+                mean=self._weighted_sum / self._duration,
+                min=self._min,
+                max=self._max,
+                samples=self._samples,
+            )
+        self._reset()
+        return result
+
+    def _accumulate(self, now: float) -> None:
+        if self._value is not None and now > self._since:
+            self._weighted_sum += self._value * (now - self._since)
+            self._duration += now - self._since
+        self._since = now
+
+
+def window_end(now: float, window: float) -> float:
+    """Return end of the window containing `now`, aligned to multiples of its length."""
+    return (math.floor(now / window) + 1) * window
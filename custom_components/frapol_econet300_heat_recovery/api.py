@@ -2,14 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
 import socket
-import traceback
-from typing import Any
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-import async_timeout
 
-from .const import API_REG_PARAMS_ENDPOINT, API_SET_PARAM_ENDPOINT, API_SET_PARAM_ENDPOINT_NAME_QUERY_PARAM, API_SET_PARAM_ENDPOINT_VALUE_QUERY_PARAM, API_SYS_PARAMS_ENDPOINT, LOGGER
+from .const import (
+    API_EDIT_PARAMS_ENDPOINT,
+    API_REFRESH_INTERVAL_TOLERANCE,
+    API_REG_PARAMS_ENDPOINT,
+    API_REG_PARAMS_KEY,
+    API_REG_PARAMS_REFRESH_INTERVAL,
+    API_SET_PARAM_ENDPOINT,
+    API_SET_PARAM_ENDPOINT_NAME_QUERY_PARAM,
+    API_SET_PARAM_ENDPOINT_VALUE_QUERY_PARAM,
+    API_SYS_PARAMS_ENDPOINT,
+    API_SYS_PARAMS_KEY,
+    API_SYS_PARAMS_REFRESH_INTERVAL,
+    LOGGER,
+)
+from .decoder import decode_json, decode_reg_params
+from .flight_recorder import (
+    RECORDED_ERROR_CONNECTION,
+    RECORDED_ERROR_TIMEOUT,
+    FrapolEconet300FlightRecorder,
+    FrapolEconet300ReplayTransport,
+)
+from .metrics import FrapolEconet300Metrics
+from .resilience import (
+    FrapolEconet300CircuitBreaker,
+    FrapolEconet300CircuitState,
+    FrapolEconet300LatencyTracker,
+    FrapolEconet300RetryPolicy,
+)
+from .transport import (
+    FrapolEconet300RequestPriority,
+    FrapolEconet300Response,
+    FrapolEconet300Transport,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import timedelta
 
 
 class FrapolEconet300ApiClientError(Exception):
@@ -28,24 +66,60 @@ class FrapolEconet300ApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
-def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
+class FrapolEconet300ApiClientCircuitOpenError(
+    FrapolEconet300ApiClientCommunicationError,
+):
+    """Exception to indicate that requests are suspended, the device is down."""
+
+
+def _verify_response_or_raise(response: FrapolEconet300Response) -> None:
     """Verify that the response is valid."""
     if response.status in (401, 403):
         msg = "Invalid credentials"
         raise FrapolEconet300ApiClientAuthenticationError(
             msg,
         )
-    response.raise_for_status()
+    if response.status >= HTTPStatus.BAD_REQUEST:
+        msg = f"Unexpected response status - {response.status} {response.reason}"
+        raise FrapolEconet300ApiClientCommunicationError(
+            msg,
+        )
 
 
-class FrapolEconet300ApiClient:
+@dataclass
+class FrapolEconet300EndpointTier:
+    """Endpoint refreshed on its own interval, with its last response cached."""
+
+    name: str
+    relative_url: str
+    interval: timedelta
+    decoder: Callable[[bytes], Any] = decode_json
+    data: dict[str, Any] | None = None
+    fetched_at: float | None = None
+
+    def is_due(self, now: float) -> bool:
+        """Return True if the cached response is missing or older than the interval."""
+        if self.data is None or self.fetched_at is None:
+            return True
+        return (
+            now - self.fetched_at
+            >= (self.interval - API_REFRESH_INTERVAL_TOLERANCE).total_seconds()
+        )
+
 
-    def __init__(
+class FrapolEconet300ApiClient:
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
         self,
         host: str,
         username: str,
         password: str,
-        session: aiohttp.ClientSession,
+        *,
+        transport: FrapolEconet300Transport | FrapolEconet300ReplayTransport,
+        retry_policy: FrapolEconet300RetryPolicy | None = None,
+        latency_tracker: FrapolEconet300LatencyTracker | None = None,
+        circuit_breaker: FrapolEconet300CircuitBreaker | None = None,
+        metrics: FrapolEconet300Metrics | None = None,
+        flight_recorder: FrapolEconet300FlightRecorder | None = None,
     ) -> None:
         LOGGER.debug(f"Initializing API with host: {host} and username: {username}")
 
@@ -57,108 +131,272 @@ class FrapolEconet300ApiClient:
             host = f"http://{host}"
 
         self._host = host
-        self._session = session
+        self._transport = transport
         self._auth = aiohttp.BasicAuth(username, password)
-        self._reg_params = None
-        self._sys_params = None
+        self.retry_policy = retry_policy or FrapolEconet300RetryPolicy()
+        self.latency_tracker = latency_tracker or FrapolEconet300LatencyTracker()
+        self.circuit_breaker = circuit_breaker or FrapolEconet300CircuitBreaker()
+        self.metrics = metrics or FrapolEconet300Metrics()
+        # Records raw responses, if set
+        self.flight_recorder = flight_recorder
+        # Names of current regParams values to keep, None keeps all of them
+        self.reg_params_projection: frozenset[str] | None = None
+        self._tiers: dict[str, FrapolEconet300EndpointTier] = {
+            API_REG_PARAMS_KEY: FrapolEconet300EndpointTier(
+                name=API_REG_PARAMS_KEY,
+                relative_url=API_REG_PARAMS_ENDPOINT,
+                interval=API_REG_PARAMS_REFRESH_INTERVAL,
+                decoder=self._decode_reg_params,
+            ),
+            API_SYS_PARAMS_KEY: FrapolEconet300EndpointTier(
+                name=API_SYS_PARAMS_KEY,
+                relative_url=API_SYS_PARAMS_ENDPOINT,
+                interval=API_SYS_PARAMS_REFRESH_INTERVAL,
+            ),
+        }
 
-    async def refresh_state(self):
-        LOGGER.info("Refreshing state")
-        self._reg_params = await self._get_reg_params()
-        self._sys_params = await self._get_sys_params()
-        LOGGER.info("State refreshed")
+    async def refresh_state(self, force_tiers: Iterable[str] | None = None) -> set[str]:
+        """
+        Refresh tiers which are due (or forced) concurrently.
 
-    async def get_all_data(self):
-        if self._reg_params is None:
-            LOGGER.info("Reg params not loaded yet, state will be refreshed")
-            await self.refresh_state()
-        elif self._sys_params is None:
-            LOGGER.info("Sys params not loaded yet, state will be refreshed")
-            await self.refresh_state()
+        Return names of tiers whose data changed.
+        """
+        now = time.monotonic()
+        forced = set(force_tiers or ())
+        due = [
+            tier
+            for tier in self._tiers.values()
+            if tier.name in forced or tier.is_due(now)
+        ]
+        if not due:
+            return set()
 
+        LOGGER.debug("Refreshing state of: %s", ", ".join(tier.name for tier in due))
+        changed = await asyncio.gather(*(self._refresh_tier(tier) for tier in due))
+        LOGGER.debug("State refreshed")
         return {
-            "regParams": self._reg_params,
-            "sysParams": self._sys_params
+            tier.name
+            for tier, tier_changed in zip(due, changed, strict=True)
+            if tier_changed
         }
 
+    def _decode_reg_params(self, body: bytes) -> dict[str, Any]:
+        return decode_reg_params(body, self.reg_params_projection)
+
+    @property
+    def queued_requests(self) -> int:
+        """Return number of requests waiting for their turn to be sent."""
+        return self._transport.queued
+
+    async def close(self) -> None:
+        """Close the connection to the device."""
+        await self._transport.close()
+
+    async def get_all_data(self):
+        if any(tier.data is None for tier in self._tiers.values()):
+            LOGGER.info("Not all params loaded yet, state will be refreshed")
+            await self.refresh_state()
+
+        return {name: tier.data for name, tier in self._tiers.items()}
+
     async def get_current_reg_param(self, param_name: str):
-        if self._reg_params is None:
+        if self._tiers[API_REG_PARAMS_KEY].data is None:
             LOGGER.info("Reg params not loaded yet, state will be refreshed")
             await self.refresh_state()
-        return self._reg_params.get("curr")(param_name)
+        return self._tiers[API_REG_PARAMS_KEY].data.get("curr").get(param_name)
 
     async def get_sys_param(self, param_name: str):
-        if self._sys_params is None:
+        if self._tiers[API_SYS_PARAMS_KEY].data is None:
             LOGGER.info("Sys params not loaded yet, state will be refreshed")
             await self.refresh_state()
-        return self._sys_params.get(param_name)
+        return self._tiers[API_SYS_PARAMS_KEY].data.get(param_name)
+
+    async def probe(self) -> dict[str, Any]:
+        """Fetch only sysParams, e.g. to validate credentials and read the uid."""
+        tier = self._tiers[API_SYS_PARAMS_KEY]
+        await self._refresh_tier(tier)
+        return tier.data
+
+    async def fetch_raw(
+        self,
+        relative_url: str,
+        priority: FrapolEconet300RequestPriority = FrapolEconet300RequestPriority.POLL,
+    ) -> bytes:
+        """Fetch a response body as is, e.g. to serve it to other clients."""
+        return await self._api_wrapper(
+            method="get", relative_url=relative_url, priority=priority, decoder=bytes
+        )
 
-    async def _get_reg_params(self) -> dict[str, Any] | None:
-        LOGGER.info("Retrieving regParams")
-        regParams = await self._api_wrapper(
+    async def get_edit_params(self) -> dict[str, Any]:
+        """Fetch editParams - descriptions of editable params, fixed per firmware."""
+        LOGGER.info("Retrieving editParams")
+        return await self._api_wrapper(
+            method="get",
+            relative_url=API_EDIT_PARAMS_ENDPOINT,
+            priority=FrapolEconet300RequestPriority.DIAGNOSTIC,
+        )
+
+    async def get_reg_params_catalogue(self) -> dict[str, Any]:
+        """Fetch the full regParams document, with units and visibility of params."""
+        LOGGER.info("Retrieving regParams catalogue")
+        return await self._api_wrapper(
             method="get",
             relative_url=API_REG_PARAMS_ENDPOINT,
+            priority=FrapolEconet300RequestPriority.DIAGNOSTIC,
         )
-        LOGGER.info("regParams retrieved")
-        LOGGER.debug("Retrieved regParams: %s", regParams)
-        return regParams
 
-    async def _get_sys_params(self) -> dict[str, Any] | None:
-        LOGGER.info("Retrieving sysParams")
-        sysParams = await self._api_wrapper(
+    async def _refresh_tier(self, tier: FrapolEconet300EndpointTier) -> bool:
+        """Fetch a single tier and cache it, return True if its data changed."""
+        LOGGER.debug("Retrieving %s", tier.name)
+        data = await self._api_wrapper(
             method="get",
-            relative_url=API_SYS_PARAMS_ENDPOINT,
+            relative_url=tier.relative_url,
+            decoder=tier.decoder,
         )
-        LOGGER.info("sysParams retrieved")
-        LOGGER.debug("Retrieved sysParams: %s", sysParams)
-        return sysParams
+        LOGGER.debug("%s retrieved", tier.name)
+        LOGGER.debug("Retrieved %s: %s", tier.name, data)
+        tier.fetched_at = time.monotonic()
+        if data == tier.data:
+            # Keep the cached object, consumers detect unchanged tiers by identity
+            return False
+        tier.data = data
+        return True
 
     async def set_param(self, param_name: str, param_value: str):
         LOGGER.info("Updating param: %s to value: %s", param_name, param_value)
         response = await self._api_wrapper(
             method="get",
+            priority=FrapolEconet300RequestPriority.WRITE,
             relative_url=f"{API_SET_PARAM_ENDPOINT}?{API_SET_PARAM_ENDPOINT_NAME_QUERY_PARAM}={param_name}&{API_SET_PARAM_ENDPOINT_VALUE_QUERY_PARAM}={param_value}",
         )
         LOGGER.info("Param: %s updated to value: %s", param_name, param_value)
         return response
 
-    # TODO add retries
-    async def _api_wrapper(
+    async def _api_wrapper(  # noqa: PLR0913 Too many arguments in function definition
         self,
         method: str,
         relative_url: str,
+        *,
         data: dict | None = None,
         headers: dict | None = None,
+        priority: FrapolEconet300RequestPriority = FrapolEconet300RequestPriority.POLL,
+        decoder: Callable[[bytes], Any] = decode_json,
     ) -> Any:
-        url = self._host + relative_url
-        LOGGER.info("Sending %s request to URL: %s", method, url)
-        """Get information from the API."""
+        """Get information from the API, retrying errors while the circuit is closed."""
+        endpoint = relative_url.split("?", 1)[0]
+        if not self.circuit_breaker.allow_request():
+            msg = f"Device is not responding, request to {endpoint} skipped"
+            raise FrapolEconet300ApiClientCircuitOpenError(msg)
+
+        # A half-open circuit lets a single probe through, it is not retried
+        probe = self.circuit_breaker.state is not FrapolEconet300CircuitState.CLOSED
+        max_attempts = 1 if probe else self.retry_policy.max_attempts
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                    auth=self._auth,
-                )
-                _verify_response_or_raise(response)
-                return await response.json()
+            for attempt in range(max_attempts):
+                try:
+                    result = await self._send_request(
+                        method,
+                        relative_url,
+                        endpoint=endpoint,
+                        data=data,
+                        headers=headers,
+                        priority=priority,
+                        decoder=decoder,
+                    )
+                except FrapolEconet300ApiClientAuthenticationError:
+                    # The device did respond, so it is healthy for the circuit breaker
+                    self.circuit_breaker.record_success()
+                    self.metrics.record_error(endpoint)
+                    raise
+                except FrapolEconet300ApiClientCommunicationError as exception:
+                    if attempt + 1 >= max_attempts:
+                        self.circuit_breaker.record_failure()
+                        self.metrics.record_error(endpoint)
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                    LOGGER.debug(
+                        "Retrying request to %s in %.2fs after error: %s",
+                        endpoint,
+                        delay,
+                        exception,
+                    )
+                    self.metrics.record_retry(endpoint)
+                    await asyncio.sleep(delay)
+                except FrapolEconet300ApiClientError:
+                    self.circuit_breaker.record_failure()
+                    self.metrics.record_error(endpoint)
+                    raise
+                else:
+                    self.circuit_breaker.record_success()
+                    return result
+        finally:
+            # A cancelled probe records no outcome, the circuit would stay half-open
+            if probe:
+                self.circuit_breaker.release_probe()
 
+    async def _send_request(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        relative_url: str,
+        *,
+        endpoint: str,
+        data: dict | None,
+        headers: dict | None,
+        priority: FrapolEconet300RequestPriority,
+        decoder: Callable[[bytes], Any],
+    ) -> Any:
+        url = self._host + relative_url
+        request_timeout = self.latency_tracker.timeout(endpoint)
+        LOGGER.debug("Sending %s request to URL: %s", method, url)
+        try:
+            response = await self._transport.request(
+                method,
+                url,
+                priority=priority,
+                request_timeout=request_timeout,
+                auth=self._auth,
+                headers=headers,
+                json_data=data,
+            )
+            self.metrics.record_response(endpoint, response.latency, len(response.body))
+            if self.flight_recorder is not None:
+                self.flight_recorder.record(relative_url, response)
+            _verify_response_or_raise(response)
+            result = decoder(response.body)
+        except FrapolEconet300ApiClientError:
+            raise
+        except ValueError as exception:
+            msg = f"Malformed response - {exception}"
+            raise FrapolEconet300ApiClientCommunicationError(
+                msg,
+            ) from exception
         except TimeoutError as exception:
-            msg = f"Timeout error fetching information - {exception}"
+            self.metrics.record_timeout(endpoint)
+            if self.flight_recorder is not None:
+                self.flight_recorder.record_error(relative_url, RECORDED_ERROR_TIMEOUT)
+            msg = (
+                "Timeout error fetching information after "
+                f"{request_timeout:.1f}s - {exception}"
+            )
             raise FrapolEconet300ApiClientCommunicationError(
                 msg,
             ) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
-            print(traceback.format_exc())
+            LOGGER.debug("Request to %s failed", url, exc_info=True)
+            if self.flight_recorder is not None:
+                self.flight_recorder.record_error(
+                    relative_url, RECORDED_ERROR_CONNECTION
+                )
             msg = f"Error fetching information - {exception}"
             raise FrapolEconet300ApiClientCommunicationError(
                 msg,
             ) from exception
         except Exception as exception:  # pylint: disable=broad-except
-            print(traceback.format_exc())
+            LOGGER.debug("Request to %s failed unexpectedly", url, exc_info=True)
             msg = f"Something really wrong happened! - {exception}"
             raise FrapolEconet300ApiClientError(
                 msg,
             ) from exception
+
+        self.latency_tracker.record(endpoint, response.latency)
+        return result
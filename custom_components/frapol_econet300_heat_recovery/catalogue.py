@@ -0,0 +1,100 @@
+"""
+Entity catalogue discovered from the params reported by the device.
+
+Hand-written descriptions cover the most common params, every other one the device
+reports in regParams gets a generic sensor. Those the device does not show in its own
+schema view are disabled by default, so their entities are not created and their values
+not decoded until a user enables them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import (
+    DEVICE_CLASS_UNITS,
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.util import slugify
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from .metadata import FrapolEconet300MetadataStore
+
+# Only units accepted as-is by the device class are mapped
+UNIT_DEVICE_CLASSES: dict[str, SensorDeviceClass] = {
+    "°C": SensorDeviceClass.TEMPERATURE,
+    "K": SensorDeviceClass.TEMPERATURE,
+    "ms": SensorDeviceClass.DURATION,
+    "s": SensorDeviceClass.DURATION,
+    "min": SensorDeviceClass.DURATION,
+    "h": SensorDeviceClass.DURATION,
+    "d": SensorDeviceClass.DURATION,
+    "Pa": SensorDeviceClass.PRESSURE,
+    "kPa": SensorDeviceClass.PRESSURE,
+    "bar": SensorDeviceClass.PRESSURE,
+    "g": SensorDeviceClass.WEIGHT,
+    "kg": SensorDeviceClass.WEIGHT,
+    "kW": SensorDeviceClass.POWER,
+    "J": SensorDeviceClass.ENERGY,
+    "Wh": SensorDeviceClass.ENERGY,
+    "kWh": SensorDeviceClass.ENERGY,
+    "Hz": SensorDeviceClass.FREQUENCY,
+}
+
+
+def unit_is_valid(unit: str, device_class: SensorDeviceClass | None) -> bool:
+    """Return True if a unit reported by the device is accepted by the device class."""
+    if device_class is None or device_class not in DEVICE_CLASS_UNITS:
+        return True
+    return unit in DEVICE_CLASS_UNITS[device_class]
+
+
+@dataclass
+class FrapolEconet300DiscoveredSensor:
+    """Sensor of a reported param the integration has no description for."""
+
+    api_param_name: str
+    description: SensorEntityDescription
+    id_suffix: str
+
+
+def discover_sensors(
+    metadata: FrapolEconet300MetadataStore | None,
+    exclude: Collection[str],
+) -> list[FrapolEconet300DiscoveredSensor]:
+    """Describe a sensor for every reported param without a hand-written one."""
+    if metadata is None:
+        return []
+
+    sensors = []
+    for name, param in sorted(metadata.reported_params().items()):
+        if name in exclude:
+            continue
+        device_class = UNIT_DEVICE_CLASSES.get(param.unit) if param.numeric else None
+        if device_class is SensorDeviceClass.ENERGY:
+            state_class = SensorStateClass.TOTAL
+        elif param.numeric:
+            state_class = SensorStateClass.MEASUREMENT
+        else:
+            state_class = None
+        id_suffix = f"param_{slugify(name)}"
+        sensors.append(
+            FrapolEconet300DiscoveredSensor(
+                api_param_name=name,
+                description=SensorEntityDescription(
+                    key=f"frapol_econet300_heat_{id_suffix}",
+                    name=name,
+                    native_unit_of_measurement=param.unit if param.numeric else None,
+                    device_class=device_class,
+                    state_class=state_class,
+                    entity_registry_enabled_default=param.visible is True,
+                ),
+                id_suffix=id_suffix,
+            ),
+        )
+    return sensors
@@ -0,0 +1,330 @@
+"""
+Command line tools for ecoNET300 devices, running without Home Assistant.
+
+Run through `scripts/econet`, which loads the standalone modules of the integration
+without its Home Assistant setup, e.g. `scripts/econet proxy --host 192.168.1.50
+--username admin`.
+
+`poll` reads devices from a JSON file, a list of objects with `host`, `username` and
+optionally `name`, `password` and `interval` (in seconds). Every poll of every device is
+written as a single NDJSON line, `{"t": ..., "device": ..., "uid": ..., "values":
+{...}}`. With `--changed-only`, only the first line of a device has all values, the next
+ones have just `"changed"` values, with None for removed ones, and polls without changes
+are not written. Failed polls are written as `{"t": ..., "device": ..., "error":
+"..."}`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import IO, Any
+
+from .api import FrapolEconet300ApiClient, FrapolEconet300ApiClientError
+from .const import (
+    API_REG_PARAMS_KEY,
+    API_REG_PARAMS_REFRESH_INTERVAL,
+    FLEET_MAX_CONCURRENT_REQUESTS,
+    POLLER_DEFAULT_INTERVAL,
+    POLLER_OUTPUT_BACKUPS,
+    POLLER_OUTPUT_MAX_BYTES,
+    PROXY_DEFAULT_BIND,
+    PROXY_DEFAULT_PORT,
+)
+from .flight_recorder import rotate_file
+from .model import FrapolEconet300Snapshot
+from .proxy import FrapolEconet300Proxy
+from .scheduler import FrapolEconet300FleetScheduler
+from .transport import FrapolEconet300Transport
+
+# Read instead of the --password option, which would be visible in the process list
+PASSWORD_ENVIRONMENT_VARIABLE = "ECONET300_PASSWORD"  # noqa: S105 Possible hardcoded password
+
+
+def _create_client(arguments: argparse.Namespace) -> FrapolEconet300ApiClient:
+    return FrapolEconet300ApiClient(
+        host=arguments.host,
+        username=arguments.username,
+        password=arguments.password,
+        transport=FrapolEconet300Transport(),
+    )
+
+
+async def _run_proxy(arguments: argparse.Namespace) -> None:
+    client = _create_client(arguments)
+    proxy = FrapolEconet300Proxy(
+        client,
+        arguments.username,
+        arguments.password,
+        reg_params_interval=timedelta(seconds=arguments.interval),
+    )
+    try:
+        await proxy.start(arguments.bind, arguments.port)
+        await asyncio.Event().wait()
+    finally:
+        await proxy.close()
+        await client.close()
+
+
+@dataclass(frozen=True)
+class FrapolEconet300PolledDevice:
+    """Device polled by the headless poller."""
+
+    name: str
+    host: str
+    username: str
+    password: str
+    interval: timedelta
+
+
+def load_devices(
+    path: Path, default_password: str, default_interval: float
+) -> list[FrapolEconet300PolledDevice]:
+    """Read devices from a JSON file, raise ValueError if they are not valid."""
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        msg = "Devices file has to contain a list of devices"
+        raise ValueError(msg)  # noqa: TRY004 Prefer `TypeError` exception for invalid type
+    devices = []
+    for number, entry in enumerate(entries, start=1):
+        try:
+            devices.append(
+                FrapolEconet300PolledDevice(
+                    name=str(entry.get("name", entry["host"])),
+                    host=entry["host"],
+                    username=entry["username"],
+                    password=entry.get("password", default_password),
+                    interval=timedelta(
+                        seconds=float(entry.get("interval", default_interval))
+                    ),
+                ),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as exception:
+            msg = f"Invalid device #{number} - {exception!r}"
+            raise ValueError(msg) from exception
+    names = [device.name for device in devices]
+    if len(set(names)) != len(names):
+        msg = "Device names have to be unique"
+        raise ValueError(msg)
+    return devices
+
+
+class FrapolEconet300SnapshotStream:
+    """Write records as NDJSON lines to stdout, or to a file rotated by size."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = POLLER_OUTPUT_MAX_BYTES,
+        backups: int = POLLER_OUTPUT_BACKUPS,
+    ) -> None:
+        """Initialize."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file: IO[str] | None = None
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write a record as a single line, flushed so consumers can tail it."""
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        file = self._open()
+        file.write(line)
+        file.flush()
+
+    def _open(self) -> IO[str]:
+        if self.path is None:
+            return sys.stdout
+        if self._file is not None and self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._file = None
+            rotate_file(self.path, self.backups)
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def close(self) -> None:
+        """Close the file, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def poll_device(  # noqa: PLR0913 Too many arguments in function definition
+    device: FrapolEconet300PolledDevice,
+    client: FrapolEconet300ApiClient,
+    fleet: FrapolEconet300FleetScheduler,
+    stream: FrapolEconet300SnapshotStream,
+    *,
+    changed_only: bool = False,
+    polls: int | None = None,
+) -> None:
+    """
+    Poll a device on its interval, aligned by the fleet scheduler.
+
+    Every poll is written to the stream.
+    """
+    previous: FrapolEconet300Snapshot | None = None
+    poll = 0
+    while polls is None or poll < polls:
+        if poll:
+            await asyncio.sleep(
+                fleet.align(device.name, device.interval).total_seconds()
+            )
+        poll += 1
+        record: dict[str, Any] = {"t": time.time(), "device": device.name}
+        try:
+            await client.refresh_state(force_tiers=(API_REG_PARAMS_KEY,))
+            snapshot = FrapolEconet300Snapshot.from_tiers(
+                await client.get_all_data(), previous
+            )
+        except FrapolEconet300ApiClientError as exception:
+            record["error"] = str(exception)
+            stream.write(record)
+            continue
+
+        record["uid"] = snapshot.uid
+        if changed_only and previous is not None:
+            changed = snapshot.diff(previous)
+            if changed:
+                record["changed"] = changed
+                stream.write(record)
+        else:
+            record["values"] = snapshot.current_params()
+            stream.write(record)
+        previous = snapshot
+
+
+async def _run_poll(arguments: argparse.Namespace) -> None:
+    fleet = FrapolEconet300FleetScheduler(max_concurrent=arguments.max_concurrent)
+    stream = FrapolEconet300SnapshotStream(arguments.output)
+    clients = []
+    for device in arguments.devices:
+        fleet.register(device.name)
+        clients.append(
+            FrapolEconet300ApiClient(
+                host=device.host,
+                username=device.username,
+                password=device.password,
+                transport=FrapolEconet300Transport(limiter=fleet.limiter),
+            ),
+        )
+    try:
+        await asyncio.gather(
+            *(
+                poll_device(
+                    device,
+                    client,
+                    fleet,
+                    stream,
+                    changed_only=arguments.changed_only,
+                    polls=arguments.polls,
+                )
+                for device, client in zip(arguments.devices, clients, strict=True)
+            ),
+        )
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+        stream.close()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="econet", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log debug messages"
+    )
+    device = argparse.ArgumentParser(add_help=False)
+    device.add_argument("--host", required=True, help="address of the device")
+    device.add_argument("--username", required=True)
+    device.add_argument(
+        "--password",
+        default=os.environ.get(PASSWORD_ENVIRONMENT_VARIABLE, ""),
+        help=f"defaults to ${PASSWORD_ENVIRONMENT_VARIABLE}",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    proxy = commands.add_parser(
+        "proxy",
+        parents=[device],
+        help="poll the device once and serve cached responses to any number of clients",
+    )
+    proxy.add_argument(
+        "--bind", default=PROXY_DEFAULT_BIND, help="address to listen on"
+    )
+    proxy.add_argument("--port", type=int, default=PROXY_DEFAULT_PORT)
+    proxy.add_argument(
+        "--interval",
+        type=float,
+        default=API_REG_PARAMS_REFRESH_INTERVAL.total_seconds(),
+        help="seconds between regParams polls",
+    )
+    proxy.set_defaults(run=_run_proxy)
+
+    poll = commands.add_parser(
+        "poll", help="poll devices listed in a file, streaming NDJSON snapshots"
+    )
+    poll.add_argument("devices_file", type=Path, help="JSON list of devices")
+    poll.add_argument(
+        "--password",
+        default=os.environ.get(PASSWORD_ENVIRONMENT_VARIABLE, ""),
+        help="for devices without one in the file, "
+        f"defaults to ${PASSWORD_ENVIRONMENT_VARIABLE}",
+    )
+    poll.add_argument(
+        "--interval",
+        type=float,
+        default=POLLER_DEFAULT_INTERVAL,
+        help="seconds between polls of devices without an interval in the file",
+    )
+    poll.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=FLEET_MAX_CONCURRENT_REQUESTS,
+        help="requests sent to all devices at once",
+    )
+    poll.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="write only values changed since the last poll",
+    )
+    poll.add_argument(
+        "--output",
+        type=Path,
+        help="file to append to, rotated once full, instead of stdout",
+    )
+    poll.add_argument(
+        "--polls", type=int, help="stop after this many polls of every device"
+    )
+    poll.set_defaults(run=_run_poll)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command given on the command line, return exit status."""
+    parser = _parser()
+    arguments = parser.parse_args(argv)
+    if arguments.command == "poll":
+        try:
+            arguments.devices = load_devices(
+                arguments.devices_file, arguments.password, arguments.interval
+            )
+        except (OSError, ValueError) as exception:
+            parser.error(f"Unable to load devices - {exception}")
+    # Logs go to stderr, so they never mix with NDJSON written to stdout
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=logging.DEBUG if arguments.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(arguments.run(arguments))
+    return 0
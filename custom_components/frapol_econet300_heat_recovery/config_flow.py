@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import ipaddress
+
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import network
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from slugify import slugify
 
 from .api import (
@@ -15,7 +21,47 @@ from .api import (
     FrapolEconet300ApiClientCommunicationError,
     FrapolEconet300ApiClientError,
 )
-from .const import CONFIG_ENTRY_DESCRIPTION, CONFIG_ENTRY_TITLE, DOMAIN, LOGGER
+from .const import (
+    AGGREGATION_WINDOW_CHOICES,
+    CONF_AGGREGATION_WINDOWS,
+    CONF_AIRFLOW_CURVE,
+    CONF_FILTER_DEADBAND,
+    CONF_FILTER_DEADBAND_MODE,
+    CONF_FILTER_MAX_INTERVAL,
+    CONF_FILTER_MIN_INTERVAL,
+    CONF_FILTER_SMOOTHING,
+    CONF_FILTER_SMOOTHING_WINDOW,
+    CONF_FLIGHT_RECORDER,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_REPLAY_SPEED,
+    CONF_SENSOR_FILTERS,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_SUBNET,
+    CONFIG_ENTRY_DESCRIPTION,
+    CONFIG_ENTRY_TITLE,
+    DEFAULT_AGGREGATION_WINDOWS,
+    DEFAULT_AIRFLOW_CURVE,
+    DEFAULT_FILTER_SMOOTHING_WINDOW,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DOMAIN,
+    LOGGER,
+)
+from .energy import FrapolEconet300AirflowCurve
+from .filters import (
+    FrapolEconet300DeadbandMode,
+    FrapolEconet300FilterConfig,
+    FrapolEconet300Smoothing,
+)
+from .flight_recorder import FrapolEconet300FlightRecorderMode
+from .scanner import FrapolEconet300DiscoveredDevice, scan_subnet
+from .sensor import reg_params_sensors
+from .transport import FrapolEconet300Transport
+
+CONF_SENSOR = "sensor"
 
 
 class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -23,13 +69,138 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004 Unused static method argument: `config_entry`
+    ) -> FrapolEconet300OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return FrapolEconet300OptionsFlowHandler()
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._discovered: dict[str, FrapolEconet300DiscoveredDevice] = {}
+        self._credentials: dict[str, str] = {}
+
     async def async_step_user(
         self,
-        user_input: dict | None = None,
+        user_input: dict | None = None,  # noqa: ARG002 Unused method argument: `user_input`
     ) -> config_entries.ConfigFlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["discovery", "manual"]
+        )
+
+    async def async_step_discovery(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Scan a subnet for devices answering with given credentials."""
         _errors = {}
         if user_input is not None:
+            self._credentials = {
+                CONF_USERNAME: user_input[CONF_USERNAME],
+                CONF_PASSWORD: user_input[CONF_PASSWORD],
+            }
+            try:
+                devices = await scan_subnet(
+                    async_get_clientsession(self.hass),
+                    user_input[CONF_SUBNET],
+                    auth=aiohttp.BasicAuth(
+                        user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+                    ),
+                )
+            except ValueError as exception:
+                LOGGER.warning(exception)
+                _errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                configured = self._async_current_ids()
+                self._discovered = {
+                    device.host: device
+                    for device in devices
+                    if device.uid is None or device.uid not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                _errors["base"] = "no_devices"
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SUBNET,
+                        default=(user_input or {}).get(CONF_SUBNET)
+                        or await self._default_subnet()
+                        or vol.UNDEFINED,
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_USERNAME,
+                        default=(user_input or {}).get(CONF_USERNAME, vol.UNDEFINED),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(CONF_PASSWORD): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def async_step_pick(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Let the user pick one of discovered devices."""
+        if user_input is not None:
+            device = self._discovered[user_input[CONF_HOST]]
+            data = {CONF_HOST: device.host, **self._credentials}
+            if device.uid is None:
+                # Credentials were rejected, let the user correct them
+                return await self.async_step_manual(
+                    {**data, CONF_PASSWORD: ""}, validate=False
+                )
+            return await self._async_create_device_entry(device.uid, data)
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=device.host,
+                                    label=f"{device.host} ({device.uid})"
+                                    if device.uid is not None
+                                    else device.host,
+                                )
+                                for device in self._discovered.values()
+                            ],
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_manual(
+        self,
+        user_input: dict | None = None,
+        *,
+        validate: bool = True,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure a device by its address."""
+        _errors = {}
+        if user_input is not None and validate:
             try:
                 uid = await self._get_device_uid(
                     host=user_input[CONF_HOST],
@@ -46,18 +217,12 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
-                ## The unique_id should never be something that can change
-                ## https://developers.home-assistant.io/docs/config_entries_config_flow_handler#unique-ids
-                await self.async_set_unique_id(uid)
-                self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=CONFIG_ENTRY_TITLE,
-                    description=CONFIG_ENTRY_DESCRIPTION,
-                    data=user_input,
-                )
+                return await self._async_create_device_entry(uid, user_input)
+        elif user_input is not None:
+            _errors["base"] = "auth"
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -86,12 +251,347 @@ class BlueprintFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _get_device_uid(self, host: str, username: str, password: str) -> None:
+    async def _async_create_device_entry(
+        self, uid: str, data: dict
+    ) -> config_entries.ConfigFlowResult:
+        ## The unique_id should never be something that can change
+        ## https://developers.home-assistant.io/docs/config_entries_config_flow_handler#unique-ids
+        await self.async_set_unique_id(uid)
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=CONFIG_ENTRY_TITLE,
+            description=CONFIG_ENTRY_DESCRIPTION,
+            data=data,
+        )
+
+    async def _default_subnet(self) -> str | None:
+        """Return the /24 subnet Home Assistant itself is in."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+            return str(ipaddress.IPv4Network(f"{source_ip}/24", strict=False))
+        except (HomeAssistantError, ValueError):
+            return None
+
+    async def _get_device_uid(self, host: str, username: str, password: str) -> str:
+        """Probe sysParams over the shared session, to validate credentials."""
         client = FrapolEconet300ApiClient(
             host=host,
             username=username,
             password=password,
-            session=async_create_clientsession(self.hass),
+            transport=FrapolEconet300Transport(
+                session=async_get_clientsession(self.hass)
+            ),
+        )
+        sys_params = await client.probe()
+        return sys_params.get("uid")
+
+
+def _seconds_selector(minimum: int, maximum: int) -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=1,
+            unit_of_measurement="s",
+            mode=selector.NumberSelectorMode.BOX,
+        ),
+    )
+
+
+class FrapolEconet300OptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for polling and entity tuning."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._filtered_sensor: str | None = None
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,  # noqa: ARG002 Unused method argument: `user_input`
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=[
+                "intervals",
+                "sensor_filter",
+                "aggregation",
+                "energy",
+                "flight_recorder",
+            ],
+        )
+
+    async def async_step_intervals(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure bounds of the adaptive update interval."""
+        _errors = {}
+        if user_input is not None:
+            if (
+                user_input[CONF_MIN_UPDATE_INTERVAL]
+                > user_input[CONF_MAX_UPDATE_INTERVAL]
+            ):
+                _errors["base"] = "invalid_update_interval"
+            else:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, **user_input}
+                )
+
+        options = {**self.config_entry.options, **(user_input or {})}
+        return self.async_show_form(
+            step_id="intervals",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MIN_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                        ),
+                    ): _seconds_selector(1, 3600),
+                    vol.Required(
+                        CONF_MAX_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                        ),
+                    ): _seconds_selector(1, 3600),
+                    vol.Required(
+                        CONF_STALE_GRACE_PERIOD,
+                        default=options.get(
+                            CONF_STALE_GRACE_PERIOD, DEFAULT_STALE_GRACE_PERIOD
+                        ),
+                    ): _seconds_selector(0, 3600),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def async_step_aggregation(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure windows of aggregate sensors."""
+        if user_input is not None:
+            windows = sorted(
+                int(window) for window in user_input[CONF_AGGREGATION_WINDOWS]
+            )
+            return self.async_create_entry(
+                data={**self.config_entry.options, CONF_AGGREGATION_WINDOWS: windows}
+            )
+
+        windows = self.config_entry.options.get(
+            CONF_AGGREGATION_WINDOWS, DEFAULT_AGGREGATION_WINDOWS
+        )
+        return self.async_show_form(
+            step_id="aggregation",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_AGGREGATION_WINDOWS,
+                        default=[str(window) for window in windows],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                str(window) for window in AGGREGATION_WINDOW_CHOICES
+                            ],
+                            multiple=True,
+                            translation_key=CONF_AGGREGATION_WINDOWS,
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_energy(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure airflow by supply fan speed, used to compute recovered energy."""
+        _errors = {}
+        if user_input is not None:
+            try:
+                FrapolEconet300AirflowCurve.parse(user_input[CONF_AIRFLOW_CURVE])
+            except ValueError as exception:
+                LOGGER.info("Invalid airflow curve: %s", exception)
+                _errors[CONF_AIRFLOW_CURVE] = "invalid_airflow_curve"
+            else:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, **user_input}
+                )
+
+        options = {**self.config_entry.options, **(user_input or {})}
+        return self.async_show_form(
+            step_id="energy",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_AIRFLOW_CURVE,
+                        default=options.get(CONF_AIRFLOW_CURVE, DEFAULT_AIRFLOW_CURVE),
+                    ): selector.TextSelector(),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def async_step_flight_recorder(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure recording raw responses, or replaying them instead."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="flight_recorder",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FLIGHT_RECORDER,
+                        default=options.get(
+                            CONF_FLIGHT_RECORDER, FrapolEconet300FlightRecorderMode.OFF
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=list(FrapolEconet300FlightRecorderMode),
+                            translation_key=CONF_FLIGHT_RECORDER,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_REPLAY_SPEED,
+                        default=options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=1000,
+                            step=0.1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_sensor_filter(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Choose the sensor to configure filtering of."""
+        if user_input is not None:
+            self._filtered_sensor = user_input[CONF_SENSOR]
+            return await self.async_step_sensor_filter_settings()
+
+        sensors = [
+            selector.SelectOptionDict(
+                value=sensor_data.id_suffix,
+                label=f"{sensor_data.id_suffix} ({sensor_data.api_param_name})",
+            )
+            for sensor_data in reg_params_sensors(self.config_entry)
+        ]
+        return self.async_show_form(
+            step_id="sensor_filter",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_SENSOR): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=sensors, mode=selector.SelectSelectorMode.DROPDOWN
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_sensor_filter_settings(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure deadband, intervals and smoothing of the chosen sensor."""
+        _errors = {}
+        filters = dict(self.config_entry.options.get(CONF_SENSOR_FILTERS, {}))
+        if user_input is not None:
+            if (
+                0
+                < user_input[CONF_FILTER_MAX_INTERVAL]
+                < user_input[CONF_FILTER_MIN_INTERVAL]
+            ):
+                _errors["base"] = "invalid_filter_interval"
+            else:
+                settings = {
+                    **user_input,
+                    CONF_FILTER_SMOOTHING_WINDOW: int(
+                        user_input[CONF_FILTER_SMOOTHING_WINDOW]
+                    ),
+                }
+                if FrapolEconet300FilterConfig.from_options(settings).is_passthrough:
+                    filters.pop(self._filtered_sensor, None)
+                else:
+                    filters[self._filtered_sensor] = settings
+                return self.async_create_entry(
+                    data={**self.config_entry.options, CONF_SENSOR_FILTERS: filters}
+                )
+
+        settings = {**filters.get(self._filtered_sensor, {}), **(user_input or {})}
+        return self.async_show_form(
+            step_id="sensor_filter_settings",
+            description_placeholders={"sensor": self._filtered_sensor},
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FILTER_DEADBAND,
+                        default=settings.get(CONF_FILTER_DEADBAND, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=1000,
+                            step=0.01,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_FILTER_DEADBAND_MODE,
+                        default=settings.get(
+                            CONF_FILTER_DEADBAND_MODE,
+                            FrapolEconet300DeadbandMode.ABSOLUTE,
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=list(FrapolEconet300DeadbandMode),
+                            translation_key=CONF_FILTER_DEADBAND_MODE,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_FILTER_MIN_INTERVAL,
+                        default=settings.get(CONF_FILTER_MIN_INTERVAL, 0),
+                    ): _seconds_selector(0, 86400),
+                    vol.Required(
+                        CONF_FILTER_MAX_INTERVAL,
+                        default=settings.get(CONF_FILTER_MAX_INTERVAL, 0),
+                    ): _seconds_selector(0, 86400),
+                    vol.Required(
+                        CONF_FILTER_SMOOTHING,
+                        default=settings.get(
+                            CONF_FILTER_SMOOTHING, FrapolEconet300Smoothing.NONE
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=list(FrapolEconet300Smoothing),
+                            translation_key=CONF_FILTER_SMOOTHING,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_FILTER_SMOOTHING_WINDOW,
+                        default=settings.get(
+                            CONF_FILTER_SMOOTHING_WINDOW,
+                            DEFAULT_FILTER_SMOOTHING_WINDOW,
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=2, max=60, step=1, mode=selector.NumberSelectorMode.BOX
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
         )
-        await client.refresh_state()
-        await client.get_sys_param("uid")
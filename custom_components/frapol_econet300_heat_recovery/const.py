@@ -1,5 +1,6 @@
 """Constants for frapol_econet300_heat_recovery."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 from typing import Final
 
@@ -12,6 +13,18 @@ ISSUE_URL: Final = "https://github.com/pworoniecki/frapol-ecoNET-300-Home-Assist
 CONFIG_ENTRY_TITLE = NAME
 CONFIG_ENTRY_DESCRIPTION = NAME
 
+# Listener key of entities showing coordinator diagnostics, notified when these change
+COORDINATOR_DIAGNOSTICS_KEY: Final = "diagnostics"
+# Listener key of entities showing performance metrics, notified after every update
+COORDINATOR_METRICS_KEY: Final = "metrics"
+# Listeners of values derived from recent regParams, notified when any changes
+COORDINATOR_DERIVED_KEY: Final = "derived"
+
+# Fired once per update with the current regParams values which changed
+EVENT_PARAMS_CHANGED: Final = f"{DOMAIN}_params_changed"
+# Dispatched with the entry ID once metadata loaded after platforms were set up
+SIGNAL_METADATA_LOADED: Final = f"{DOMAIN}_metadata_loaded_{{}}"
+
 API_ENDPOINT_PREFIX: Final = "/econet"
 API_REG_PARAMS_ENDPOINT: Final = f"{API_ENDPOINT_PREFIX}/regParams"
 API_SYS_PARAMS_ENDPOINT: Final = f"{API_ENDPOINT_PREFIX}/sysParams"
@@ -20,6 +33,138 @@ API_SET_PARAM_ENDPOINT: Final = f"{API_ENDPOINT_PREFIX}/newParam"
 API_SET_PARAM_ENDPOINT_NAME_QUERY_PARAM: Final = "newParamName"
 API_SET_PARAM_ENDPOINT_VALUE_QUERY_PARAM: Final = "newParamValue"
 
+API_REG_PARAMS_KEY: Final = "regParams"
+API_SYS_PARAMS_KEY: Final = "sysParams"
+API_REG_PARAMS_CURRENT_KEY: Final = "curr"
+API_REG_PARAMS_UNITS_KEY: Final = "currUnits"
+API_REG_PARAMS_SCHEMA_KEY: Final = "schemaParams"
+
+# Each endpoint is refreshed on its own schedule - regParams carries live readings,
+# sysParams mostly static device information (uid, software versions).
+API_REG_PARAMS_REFRESH_INTERVAL: Final = timedelta(seconds=5)
+API_SYS_PARAMS_REFRESH_INTERVAL: Final = timedelta(hours=1)
+# Coordinator ticks are not exact, tiers are refreshed slightly before they are due
+API_REFRESH_INTERVAL_TOLERANCE: Final = timedelta(seconds=1)
+
+# Failed requests are retried with jittered exponential backoff
+API_RETRY_MAX_ATTEMPTS: Final = 3
+API_RETRY_BASE_DELAY: Final = 0.25
+API_RETRY_MAX_DELAY: Final = 2.0
+# Request timeout is derived from recently measured latency of the endpoint
+API_LATENCY_SAMPLES: Final = 50
+API_TIMEOUT_MIN_SAMPLES: Final = 5
+API_TIMEOUT_LATENCY_PERCENTILE: Final = 0.95
+API_TIMEOUT_LATENCY_MULTIPLIER: Final = 3.0
+API_TIMEOUT_MIN: Final = 1.0
+API_TIMEOUT_MAX: Final = 10.0
+# Unresponsive device is not queried until the circuit breaker lets a probe through
+API_CIRCUIT_FAILURE_THRESHOLD: Final = 3
+API_CIRCUIT_RESET_TIMEOUT: Final = timedelta(seconds=30)
+
+# Upper bounds (in seconds) of request latency histogram buckets
+METRICS_LATENCY_BUCKETS: Final = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every device gets a dedicated connection, requests to it are queued by priority
+TRANSPORT_MAX_IN_FLIGHT: Final = 1
+TRANSPORT_DNS_CACHE_TTL: Final = 300
+TRANSPORT_KEEPALIVE_TIMEOUT: Final = 30.0
+
+# Flight recorder of raw responses, rotated once a file exceeds the size limit
+CONF_FLIGHT_RECORDER: Final = "flight_recorder"
+FLIGHT_RECORDER_MAX_BYTES: Final = 5 * 1024 * 1024
+FLIGHT_RECORDER_BACKUPS: Final = 3
+CONF_REPLAY_SPEED: Final = "replay_speed"
+# 0 replays responses as fast as they are requested
+DEFAULT_REPLAY_SPEED: Final = 1.0
+# A zero interval would disable polling, the coordinator takes it for no interval
+REPLAY_UPDATE_INTERVAL: Final = timedelta(milliseconds=1)
+
+# Standalone proxy polls the device once and serves cached responses to all clients
+PROXY_DEFAULT_BIND: Final = "0.0.0.0"  # noqa: S104 Possible binding to all interfaces
+PROXY_DEFAULT_PORT: Final = 8300
+
+# Headless poller streams NDJSON snapshots, to stdout or to a rotated file
+POLLER_DEFAULT_INTERVAL: Final = 60
+POLLER_OUTPUT_MAX_BYTES: Final = 10 * 1024 * 1024
+POLLER_OUTPUT_BACKUPS: Final = 5
+
+# Discovery probes hosts of a subnet concurrently, with a short timeout each
+CONF_SUBNET: Final = "subnet"
+DISCOVERY_MAX_CONCURRENT: Final = 32
+DISCOVERY_TIMEOUT: Final = 1.5
+DISCOVERY_MAX_HOSTS: Final = 1024
+
+# Polling speeds up after writes and changes, then backs off while values stay stable
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL: Final = "max_update_interval"
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 5
+DEFAULT_MAX_UPDATE_INTERVAL: Final = 60
+# Last good snapshot is served as stale this long after polls start failing (seconds)
+CONF_STALE_GRACE_PERIOD: Final = "stale_grace_period"
+DEFAULT_STALE_GRACE_PERIOD: Final = 300
+UPDATE_INTERVAL_BURST_POLLS: Final = 3
+UPDATE_INTERVAL_BACKOFF_FACTOR: Final = 1.5
+# Interval is kept at least this many times the median regParams response time
+UPDATE_INTERVAL_LATENCY_FACTOR: Final = 20
+
+# Polls of all devices are spread across their interval, this many requests at once
+FLEET_MAX_CONCURRENT_REQUESTS: Final = 4
+# Random shift of a poll, as a fraction of the spacing between polls of devices
+FLEET_POLL_JITTER: Final = 0.1
+# hass.data key of the scheduler shared by all config entries
+DATA_FLEET_SCHEDULER: Final = f"{DOMAIN}_fleet_scheduler"
+
+# Per-sensor filtering of published states, options are stored by sensor id suffix
+CONF_SENSOR_FILTERS: Final = "sensor_filters"
+CONF_FILTER_DEADBAND: Final = "deadband"
+CONF_FILTER_DEADBAND_MODE: Final = "deadband_mode"
+CONF_FILTER_MIN_INTERVAL: Final = "min_interval"
+CONF_FILTER_MAX_INTERVAL: Final = "max_interval"
+CONF_FILTER_SMOOTHING: Final = "smoothing"
+CONF_FILTER_SMOOTHING_WINDOW: Final = "smoothing_window"
+DEFAULT_FILTER_SMOOTHING_WINDOW: Final = 5
+
+# Aggregate sensors publish time-weighted mean, min and max once per window (minutes)
+CONF_AGGREGATION_WINDOWS: Final = "aggregation_windows"
+DEFAULT_AGGREGATION_WINDOWS: Final = (1, 15)
+AGGREGATION_WINDOW_CHOICES: Final = (1, 5, 15, 60)
+
+# Recovered heat energy, airflow is read off a curve of fan speed (%) to airflow (m³/h)
+CONF_AIRFLOW_CURVE: Final = "airflow_curve"
+DEFAULT_AIRFLOW_CURVE: Final = "0:0, 100:300"
+AIRFLOW_CURVE_MIN_POINTS: Final = 2
+# Air at about 20°C - density 1.2 kg/m³ times specific heat 1005 J/(kg·K)
+AIR_VOLUMETRIC_HEAT_CAPACITY: Final = 1206.0
+# Intervals longer than this many maximum update intervals mean polls were missed
+ENERGY_MAX_GAP_POLLS: Final = 3
+
+# Derived metrics are computed over the last window, kept in a fixed capacity buffer
+DERIVED_WINDOW: Final = timedelta(minutes=15)
+DERIVED_BUFFER_CAPACITY: Final = 360
+# Efficiency is not computed when extract and intake differ less than this (°C)
+DERIVED_EFFICIENCY_MIN_DELTA: Final = 3.0
+# Trends are not computed from fewer samples than this
+DERIVED_TREND_MIN_SAMPLES: Final = 2
+
+METADATA_STORAGE_VERSION: Final = 1
+
+# Last known snapshot lets entities start without the device, saved at most this often
+SNAPSHOT_STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 60
+
+# Param changes made within this many seconds are coalesced and sent together
+WRITE_DEBOUNCE_COOLDOWN: Final = 0.5
+# Pause between consecutive param writes, so the device keeps up with a batch of them
+WRITE_PACING_INTERVAL: Final = 0.2
+
+# Named sets of param values, stored per device and applied with one service call
+PROFILES_STORAGE_VERSION: Final = 1
+SERVICE_APPLY_PROFILE: Final = "apply_profile"
+SERVICE_SAVE_PROFILE: Final = "save_profile"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_PROFILE: Final = "profile"
+ATTR_PARAMS: Final = "params"
+
 API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED: Final = "REKcurSupFanSpeed"
 API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED: Final = "REKcurExhFanSpeed"
 API_REG_PARAM_CURRENT_MAIN_MODE: Final = "REKWS1"
@@ -2,32 +2,363 @@
 
 from __future__ import annotations
 
+import time
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     FrapolEconet300ApiClientAuthenticationError,
     FrapolEconet300ApiClientError,
 )
+from .const import (
+    API_REG_PARAMS_ENDPOINT,
+    API_REG_PARAMS_KEY,
+    API_SYS_PARAMS_KEY,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_STALE_GRACE_PERIOD,
+    COORDINATOR_DERIVED_KEY,
+    COORDINATOR_DIAGNOSTICS_KEY,
+    COORDINATOR_METRICS_KEY,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DOMAIN,
+    EVENT_PARAMS_CHANGED,
+    LOGGER,
+    REPLAY_UPDATE_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .derived import DERIVED_INPUT_PARAMS, FrapolEconet300DerivedMetrics
+from .model import FrapolEconet300Snapshot
+from .scheduler import FrapolEconet300AdaptiveInterval
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from .data import FrapolEconet300ConfigEntry
+    from .metrics import FrapolEconet300Metrics
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class FrapolEconet300DataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+class FrapolEconet300DataUpdateCoordinator(
+    DataUpdateCoordinator[FrapolEconet300Snapshot]
+):
+    """
+    Class to manage fetching data from the API into snapshots.
+
+    Listeners registered with a frozenset context are indexed by the keys in it - names
+    of current regParams values or of API tiers - and are only notified when one of them
+    changed since the last notification. Listeners without such context are notified on
+    every change.
+
+    The coordinator drives regParams polling, its update interval adapts to changes and
+    device latency between configured bounds.
+
+    The last snapshot received from the device is persisted, so entities can start from
+    it marked as stale while the first poll is still running. Likewise, when polls fail,
+    the last good snapshot is served marked as stale for a grace period, while polling
+    backs off. Only once the grace period expires do entities become unavailable.
+
+    Every polled snapshot is also sampled into derived metrics, whose listeners are
+    notified when any derived value changes.
+    """
 
     config_entry: FrapolEconet300ConfigEntry
 
-    async def _async_update_data(self) -> Any:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize."""
+        super().__init__(*args, **kwargs)
+        options = self.config_entry.options
+        self.adaptive_interval = FrapolEconet300AdaptiveInterval(
+            min_interval=timedelta(
+                seconds=options.get(
+                    CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                )
+            ),
+            max_interval=timedelta(
+                seconds=options.get(
+                    CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                )
+            ),
+        )
+        self.update_interval = self.adaptive_interval.interval
+        self._notified_interval = self.update_interval
+        self._key_listeners: dict[str, dict[CALLBACK_TYPE, None]] = {}
+        self._global_listeners: dict[CALLBACK_TYPE, None] = {}
+        self._notified_data: FrapolEconet300Snapshot | None = None
+        # Snapshot built from the latest API tiers, reused while the client keeps
+        # returning the same ones
+        self._polled: tuple[Any, Any, FrapolEconet300Snapshot] | None = None
+        self._notified_update_success: bool | None = None
+        self._snapshot_store: Store[dict[str, Any]] = Store(
+            self.hass,
+            SNAPSHOT_STORAGE_VERSION,
+            f"{DOMAIN}.snapshot.{self.config_entry.entry_id}",
+        )
+        self.stale = False
+        self._notified_stale = False
+        self.last_device_update: datetime | None = None
+        self._stale_grace_period = options.get(
+            CONF_STALE_GRACE_PERIOD, DEFAULT_STALE_GRACE_PERIOD
+        )
+        self._failing_since: float | None = None
+        self.derived = FrapolEconet300DerivedMetrics()
+        self._derived_changed = False
+        # Params of a batch being written are kept in snapshots, even if nothing listens
+        self.written_params: frozenset[str] = frozenset()
+
+    async def async_load_snapshot(self) -> bool:
+        """
+        Use the persisted snapshot as data until the first poll succeeds.
+
+        Return False if there is none.
+        """
+        snapshot = await self._snapshot_store.async_load()
+        if (
+            not snapshot
+            or API_REG_PARAMS_KEY not in snapshot
+            or API_SYS_PARAMS_KEY not in snapshot
+        ):
+            return False
+        LOGGER.debug("Starting from the persisted snapshot")
+        self.data = FrapolEconet300Snapshot.from_tiers(snapshot)
+        self.stale = True
+        return True
+
+    def _snapshot(self, tiers: dict[str, Any]) -> FrapolEconet300Snapshot:
+        """Return snapshot of API tiers, the previous one if they did not change."""
+        reg_params, sys_params = tiers[API_REG_PARAMS_KEY], tiers[API_SYS_PARAMS_KEY]
+        if (
+            self._polled is not None
+            and self._polled[0] is reg_params
+            and self._polled[1] is sys_params
+        ):
+            return self._polled[2]
+        previous = self._polled[2] if self._polled is not None else self.data
+        snapshot = FrapolEconet300Snapshot.from_tiers(tiers, previous)
+        self._polled = (reg_params, sys_params, snapshot)
+        return snapshot
+
+    async def _async_update_data(self) -> FrapolEconet300Snapshot:
         """Update data via library."""
+        client = self.config_entry.runtime_data.client
+        client.reg_params_projection = self._reg_params_projection()
+        started_at = time.monotonic()
         try:
-            await self.config_entry.runtime_data.client.refresh_state()
-            return await self.config_entry.runtime_data.client.get_all_data()
+            await client.refresh_state(force_tiers=(API_REG_PARAMS_KEY,))
+            # Unchanged tiers keep their identity, so diffing them stays cheap
+            data = self._snapshot(await client.get_all_data())
         except FrapolEconet300ApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except FrapolEconet300ApiClientError as exception:
+            return self._stale_or_raise(exception)
+        finally:
+            client.metrics.record_update(time.monotonic() - started_at)
+            replay = self.config_entry.runtime_data.replay
+            if replay is not None:
+                # Recorded polls follow each other as fast as the replay speed allows,
+                # until recorded regParams run out, whatever is left of other endpoints
+                self.update_interval = (
+                    REPLAY_UPDATE_INTERVAL
+                    if replay.remaining_for(API_REG_PARAMS_ENDPOINT)
+                    else None
+                )
+
+        self._failing_since = None
+        self.last_device_update = dt_util.utcnow()
+        self._async_set_stale(stale=False)
+        if replay is None:
+            # Only values reported by the device are persisted, never optimistic ones
+            self._snapshot_store.async_delay_save(data.as_dict, SNAPSHOT_SAVE_DELAY)
+        self._derived_changed |= self.derived.add(data, time.monotonic())
+
+        changed = self.data is None or data.values is not self.data.values
+        latency = client.latency_tracker.percentile(API_REG_PARAMS_ENDPOINT, 0.5)
+        self._async_set_update_interval(
+            self.adaptive_interval.next_interval(changed=changed, latency=latency)
+        )
+        return data
+
+    def _stale_or_raise(
+        self, exception: FrapolEconet300ApiClientError
+    ) -> FrapolEconet300Snapshot:
+        """
+        Return the last good snapshot while the grace period lasts.
+
+        Raise UpdateFailed once it expires.
+        """
+        now = time.monotonic()
+        if self._failing_since is None:
+            self._failing_since = now
+        self._async_set_update_interval(
+            self.adaptive_interval.next_interval(changed=False, latency=None)
+        )
+        if self.data is None or now - self._failing_since >= self._stale_grace_period:
             raise UpdateFailed(exception) from exception
+        LOGGER.debug(
+            "Serving the last known snapshot while the device is not responding - %s",
+            exception,
+        )
+        self._async_set_stale(stale=True)
+        return self.data
+
+    @callback
+    def _async_set_stale(self, *, stale: bool) -> None:
+        """Mark data as stale or fresh, notifying all listeners if that changes."""
+        if stale == self.stale:
+            return
+        self.stale = stale
+        # Data may stay the same, in which case the base class does not notify listeners
+        self.hass.loop.call_soon(self.async_update_listeners)
+
+    @callback
+    def _async_set_update_interval(self, update_interval: timedelta) -> None:
+        """
+        Schedule the next poll about given interval from now.
+
+        Diagnostic listeners are notified if the interval changed. The exact delay is
+        aligned by the fleet scheduler, so polls of other entries do not coincide. While
+        a recording is replayed, polls are paced by the replay instead.
+        """
+        if self.config_entry.runtime_data.replay is not None:
+            return
+        self.update_interval = self.config_entry.runtime_data.fleet.align(
+            self.config_entry.entry_id, update_interval
+        )
+        if update_interval == self._notified_interval:
+            return
+        self._notified_interval = update_interval
+        for update_callback in list(
+            self._key_listeners.get(COORDINATOR_DIAGNOSTICS_KEY, {})
+        ):
+            update_callback()
+
+    @property
+    def metrics(self) -> FrapolEconet300Metrics:
+        """Return performance counters of the entry."""
+        return self.config_entry.runtime_data.client.metrics
+
+    def get_current_param(self, param_name: str) -> Any:
+        """Return current regParams value from the latest snapshot."""
+        return self.data.get(param_name)
+
+    @callback
+    def async_apply_params(self, values: dict[str, Any]) -> None:
+        """Apply regParams values to the snapshot ahead of the device confirming."""
+        self.adaptive_interval.burst()
+        self._async_set_update_interval(self.adaptive_interval.interval)
+        self.async_set_updated_data(self.data.with_values(values))
+
+    async def async_refresh_params(self) -> None:
+        """Fetch regParams right away, regardless of its interval, notify listeners."""
+        client = self.config_entry.runtime_data.client
+        client.reg_params_projection = self._reg_params_projection()
+        await client.refresh_state(force_tiers=(API_REG_PARAMS_KEY,))
+        self.stale = False
+        self._failing_since = None
+        self.last_device_update = dt_util.utcnow()
+        self.async_set_updated_data(self._snapshot(await client.get_all_data()))
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexing the listener by keys of its context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        keys = context if isinstance(context, frozenset) else None
+        if keys is None:
+            self._global_listeners[update_callback] = None
+        for key in keys or ():
+            self._key_listeners.setdefault(key, {})[update_callback] = None
+
+        @callback
+        def remove_indexed_listener() -> None:
+            remove_listener()
+            if keys is None:
+                self._global_listeners.pop(update_callback, None)
+            for key in keys or ():
+                listeners = self._key_listeners[key]
+                listeners.pop(update_callback, None)
+                if not listeners:
+                    del self._key_listeners[key]
+
+        return remove_indexed_listener
+
+    @property
+    def listened_keys(self) -> frozenset[str]:
+        """Return keys which at least one listener depends on."""
+        return frozenset(self._key_listeners)
+
+    def _reg_params_projection(self) -> frozenset[str] | None:
+        """Return regParams values listeners depend on, None if all may be needed."""
+        if (
+            not self._key_listeners
+            or self._global_listeners
+            or API_REG_PARAMS_KEY in self._key_listeners
+        ):
+            return None
+        projection = self.listened_keys - {
+            API_SYS_PARAMS_KEY,
+            COORDINATOR_DIAGNOSTICS_KEY,
+            COORDINATOR_METRICS_KEY,
+            COORDINATOR_DERIVED_KEY,
+        }
+        if COORDINATOR_DERIVED_KEY in self._key_listeners:
+            projection = projection.union(DERIVED_INPUT_PARAMS)
+        return projection.union(self.written_params)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose keys changed, or all if availability changed."""
+        previous_data, self._notified_data = self._notified_data, self.data
+        notify_all = (
+            previous_data is None
+            or self._notified_update_success != self.last_update_success
+            or self._notified_stale != self.stale
+        )
+        self._notified_update_success = self.last_update_success
+        self._notified_stale = self.stale
+
+        derived_changed, self._derived_changed = self._derived_changed, False
+
+        if notify_all or self.data is None:
+            super().async_update_listeners()
+            self.metrics.collect_state_writes()
+            return
+
+        changed_params = self.data.diff(previous_data)
+        projection = self.config_entry.runtime_data.client.reg_params_projection
+        if projection is not None:
+            # Params left out of a projected poll were not read, not removed
+            changed_params = {
+                name: value
+                for name, value in changed_params.items()
+                if name in projection or name in self.data.index.slots
+            }
+        changed_keys = self.data.changed_tiers(previous_data)
+        changed_keys.extend(changed_params)
+
+        if changed_params:
+            self.hass.bus.async_fire(
+                EVENT_PARAMS_CHANGED,
+                {"entry_id": self.config_entry.entry_id, "changed": changed_params},
+            )
+
+        callbacks = dict(self._global_listeners) if changed_keys else {}
+        for key in changed_keys:
+            callbacks.update(self._key_listeners.get(key, {}))
+        if derived_changed:
+            callbacks.update(self._key_listeners.get(COORDINATOR_DERIVED_KEY, {}))
+        callbacks.update(self._key_listeners.get(COORDINATOR_METRICS_KEY, {}))
+        for update_callback in callbacks:
+            update_callback()
+        self.metrics.collect_state_writes()
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
     from .api import FrapolEconet300ApiClient
     from .coordinator import FrapolEconet300DataUpdateCoordinator
+    from .flight_recorder import FrapolEconet300ReplayTransport
+    from .metadata import FrapolEconet300MetadataStore
+    from .profiles import FrapolEconet300ProfileStore
+    from .scheduler import FrapolEconet300FleetScheduler
+    from .writer import FrapolEconet300WritePipeline
 
 
 type FrapolEconet300ConfigEntry = ConfigEntry[FrapolEconet300Data]
@@ -23,3 +28,9 @@ class FrapolEconet300Data:
     client: FrapolEconet300ApiClient
     coordinator: FrapolEconet300DataUpdateCoordinator
     integration: Integration
+    writer: FrapolEconet300WritePipeline
+    fleet: FrapolEconet300FleetScheduler
+    metadata: FrapolEconet300MetadataStore | None = None
+    profiles: FrapolEconet300ProfileStore | None = None
+    # Set while a flight recording is replayed in place of the device
+    replay: FrapolEconet300ReplayTransport | None = None
@@ -0,0 +1,59 @@
+"""
+Decoding of ecoNET300 API responses.
+
+orjson (shipped with Home Assistant) is used when available, with the stdlib decoder as
+fallback.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .const import API_REG_PARAMS_CURRENT_KEY, LOGGER
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+
+_SCALAR_TYPES = (int, float, str, bool)
+
+
+def decode_json(body: bytes) -> Any:
+    """Decode a JSON response body."""
+    return _loads(body)
+
+
+def decode_reg_params(
+    body: bytes, projection: frozenset[str] | None = None
+) -> dict[str, Any]:
+    """
+    Decode regParams keeping only current values, limited to projected params if given.
+
+    Values which are not JSON scalars are dropped, so consumers can rely on their types.
+    """
+    document = _loads(body)
+    current = (
+        document.get(API_REG_PARAMS_CURRENT_KEY) if isinstance(document, dict) else None
+    )
+    if not isinstance(current, dict):
+        msg = f"Missing '{API_REG_PARAMS_CURRENT_KEY}' in regParams response"
+        raise ValueError(msg)  # noqa: TRY004 Prefer `TypeError` exception for invalid type
+
+    names = current.keys() if projection is None else projection & current.keys()
+
+    values = {}
+    for name in names:
+        value = current[name]
+        if value is None or isinstance(value, _SCALAR_TYPES):
+            values[name] = value
+        else:
+            LOGGER.debug(
+                "Skipping regParams value %s of unsupported type %s",
+                name,
+                type(value).__name__,
+            )
+    return {API_REG_PARAMS_CURRENT_KEY: values}
@@ -0,0 +1,209 @@
+"""
+Metrics derived from recent regParams values for frapol_econet300_heat_recovery.
+
+Samples are kept in a fixed-size ring buffer of flat `array("d")` columns, so memory
+stays bounded and a window of samples is a couple of slices. Metrics over the window are
+computed with `map` and `math.fsum` over whole columns, without per-sample Python
+objects.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import operator
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+    DERIVED_BUFFER_CAPACITY,
+    DERIVED_EFFICIENCY_MIN_DELTA,
+    DERIVED_TREND_MIN_SAMPLES,
+    DERIVED_WINDOW,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .model import FrapolEconet300Snapshot
+
+# Columns of the ring buffer, in order
+DERIVED_INPUT_PARAMS: tuple[str, ...] = (
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+    API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED,
+)
+_SUPPLY, _INTAKE, _EXTRACT, _EXHAUST, _SUPPLY_FAN, _EXTRACT_FAN = range(
+    len(DERIVED_INPUT_PARAMS)
+)
+
+_SECONDS_PER_HOUR = 3600
+
+
+class FrapolEconet300RingBuffer:
+    """Latest samples of several numeric columns, missing values stored as NaN."""
+
+    __slots__ = ("_columns", "_next", "_times", "capacity", "size")
+
+    def __init__(self, columns: int, capacity: int) -> None:
+        """Initialize."""
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0
+        self._times = array("d", [math.nan]) * capacity
+        self._columns = tuple(array("d", [math.nan]) * capacity for _ in range(columns))
+
+    def append(self, now: float, values: Sequence[float | None]) -> None:
+        """Store a sample, overwriting the oldest one once the buffer is full."""
+        self._times[self._next] = now
+        for column, value in zip(self._columns, values, strict=True):
+            column[self._next] = math.nan if value is None else value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _chronological(self, values: array) -> array:
+        if self.size < self.capacity:
+            return values[: self.size]
+        return values[self._next :] + values[: self._next]
+
+    def window(self, since: float) -> tuple[array, tuple[array, ...]]:
+        """Return times and columns of samples not older than `since`, oldest first."""
+        times = self._chronological(self._times)
+        start = bisect.bisect_left(times, since)
+        return times[start:], tuple(
+            self._chronological(column)[start:] for column in self._columns
+        )
+
+
+@dataclass(frozen=True)
+class FrapolEconet300DerivedValues:
+    """Metrics derived from the latest samples, None where there is not enough data."""
+
+    efficiency: float | None = None
+    rolling_efficiency: float | None = None
+    supply_temperature_trend: float | None = None
+    intake_temperature_trend: float | None = None
+    extract_temperature_trend: float | None = None
+    exhaust_temperature_trend: float | None = None
+    fan_balance: float | None = None
+
+
+def _is_valid(value: float) -> bool:
+    return not math.isnan(value)
+
+
+def efficiency(
+    supply: Sequence[float], intake: Sequence[float], extract: Sequence[float]
+) -> float | None:
+    """
+    Return supply-side temperature efficiency in % over given samples.
+
+    Samples with extract and intake temperatures closer than the minimum delta are
+    skipped, as the ratio of two small differences is dominated by sensor resolution.
+    """
+    gains = map(operator.sub, supply, intake)
+    spans = map(operator.sub, extract, intake)
+    pairs = [
+        (gain, span)
+        for gain, span in zip(gains, spans, strict=True)
+        if _is_valid(gain) and abs(span) >= DERIVED_EFFICIENCY_MIN_DELTA
+    ]
+    if not pairs:
+        return None
+    gains, spans = zip(*pairs, strict=True)
+    return round(100 * math.fsum(gains) / math.fsum(spans), 1)
+
+
+def trend(times: Sequence[float], values: Sequence[float]) -> float | None:
+    """Return least-squares slope per hour, None with fewer than two samples."""
+    points = [
+        (time, value)
+        for time, value in zip(times, values, strict=True)
+        if _is_valid(value)
+    ]
+    if len(points) < DERIVED_TREND_MIN_SAMPLES:
+        return None
+    times, values = zip(*points, strict=True)
+    mean_time = math.fsum(times) / len(times)
+    mean_value = math.fsum(values) / len(values)
+    offsets = [time - mean_time for time in times]
+    variance = math.fsum(map(operator.mul, offsets, offsets))
+    if variance == 0:
+        return None
+    covariance = math.fsum(
+        map(operator.mul, offsets, (value - mean_value for value in values))
+    )
+    return round(covariance / variance * _SECONDS_PER_HOUR, 2)
+
+
+def mean_difference(
+    minuends: Sequence[float], subtrahends: Sequence[float]
+) -> float | None:
+    """Return mean of differences between paired values, skipping missing ones."""
+    differences = [
+        difference
+        for difference in map(operator.sub, minuends, subtrahends)
+        if _is_valid(difference)
+    ]
+    if not differences:
+        return None
+    return round(math.fsum(differences) / len(differences), 1)
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return value
+    return None
+
+
+class FrapolEconet300DerivedMetrics:
+    """
+    Heat-recovery efficiency, temperature trends and fan balance over recent samples.
+
+    Efficiency is also reported for the latest sample alone. Trends are in degrees per
+    hour, fan balance is the mean difference between supply and extract fan speed in
+    percentage points.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DERIVED_BUFFER_CAPACITY,
+        window: float = DERIVED_WINDOW.total_seconds(),
+    ) -> None:
+        """Initialize."""
+        self.window = window
+        self.buffer = FrapolEconet300RingBuffer(len(DERIVED_INPUT_PARAMS), capacity)
+        self.values = FrapolEconet300DerivedValues()
+
+    def add(self, snapshot: FrapolEconet300Snapshot, now: float) -> bool:
+        """Add a sample of regParams values, return True if derived values changed."""
+        sample = [
+            _as_number(snapshot.get(param_name)) for param_name in DERIVED_INPUT_PARAMS
+        ]
+        self.buffer.append(now, sample)
+        times, columns = self.buffer.window(now - self.window)
+        latest = [column[-1:] for column in columns]
+        values = FrapolEconet300DerivedValues(
+            efficiency=efficiency(latest[_SUPPLY], latest[_INTAKE], latest[_EXTRACT]),
+            rolling_efficiency=efficiency(
+                columns[_SUPPLY], columns[_INTAKE], columns[_EXTRACT]
+            ),
+            supply_temperature_trend=trend(times, columns[_SUPPLY]),
+            intake_temperature_trend=trend(times, columns[_INTAKE]),
+            extract_temperature_trend=trend(times, columns[_EXTRACT]),
+            exhaust_temperature_trend=trend(times, columns[_EXHAUST]),
+            fan_balance=mean_difference(columns[_SUPPLY_FAN], columns[_EXTRACT_FAN]),
+        )
+        changed = values != self.values
+        self.values = values
+        return changed
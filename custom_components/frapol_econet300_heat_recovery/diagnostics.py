@@ -0,0 +1,66 @@
+"""Diagnostics support for frapol_econet300_heat_recovery."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+
+from .const import API_REG_PARAMS_ENDPOINT
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import FrapolEconet300ConfigEntry
+
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME, "uid", "key"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: FrapolEconet300ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    client = runtime_data.client
+    coordinator = runtime_data.coordinator
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "adaptive_interval": coordinator.adaptive_interval.interval.total_seconds(),
+            # Polling stops once a replayed recording ends
+            "next_poll_delay": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval is not None
+                else None
+            ),
+            "listened_keys": len(coordinator.listened_keys),
+        },
+        "client": {
+            "circuit_state": client.circuit_breaker.state,
+            "consecutive_failures": client.circuit_breaker.consecutive_failures,
+            "reg_params_latency_p50": client.latency_tracker.percentile(
+                API_REG_PARAMS_ENDPOINT, 0.5
+            ),
+            "reg_params_latency_p95": client.latency_tracker.percentile(
+                API_REG_PARAMS_ENDPOINT, 0.95
+            ),
+            "reg_params_timeout": client.latency_tracker.timeout(
+                API_REG_PARAMS_ENDPOINT
+            ),
+            "queued_requests": client.queued_requests,
+        },
+        "metrics": client.metrics.as_dict(),
+        "described_params": len(runtime_data.metadata)
+        if runtime_data.metadata is not None
+        else None,
+        "sys_params": async_redact_data(
+            coordinator.data.sys_params if coordinator.data else {}, TO_REDACT
+        ),
+    }
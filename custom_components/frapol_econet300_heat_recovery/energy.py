@@ -0,0 +1,160 @@
+"""
+Recovered heat energy for frapol_econet300_heat_recovery.
+
+Recovered thermal power is the heat the exchanger adds to the supply air, from the
+supply fan airflow and the temperature rise from intake to supply. Airflow is read off a
+configurable curve of fan speed, as units of different sizes move different volumes at
+the same speed.
+
+Power is integrated incrementally, held constant between coordinator updates like polled
+readings are, so every sample costs the same regardless of how long the sensor has been
+running. An interval longer than the gap limit means polls were missed (or Home
+Assistant was not running), it is left out rather than guessed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    AIR_VOLUMETRIC_HEAT_CAPACITY,
+    AIRFLOW_CURVE_MIN_POINTS,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+)
+
+ENERGY_INPUT_PARAMS: tuple[str, ...] = (
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+)
+
+_SECONDS_PER_HOUR = 3600
+_JOULES_PER_KWH = 3_600_000
+
+
+@dataclass(frozen=True)
+class FrapolEconet300AirflowCurve:
+    """Airflow in m³/h by fan speed in %, interpolated between points by speed."""
+
+    points: tuple[tuple[float, float], ...]
+
+    @classmethod
+    def parse(cls, text: str) -> FrapolEconet300AirflowCurve:
+        """Parse `speed:airflow` points separated by commas, raise ValueError."""
+        points = []
+        for point in text.split(","):
+            speed, separator, airflow = point.partition(":")
+            if not separator:
+                msg = f"Point {point.strip()!r} is not in speed:airflow form"
+                raise ValueError(msg)
+            points.append((float(speed), float(airflow)))
+        points.sort()
+        speeds = [speed for speed, _ in points]
+        if len(points) < AIRFLOW_CURVE_MIN_POINTS or len(set(speeds)) != len(speeds):
+            msg = "Airflow curve needs at least two points with different fan speeds"
+            raise ValueError(msg)
+        if any(airflow < 0 for _, airflow in points):
+            msg = "Airflow can not be negative"
+            raise ValueError(msg)
+        return cls(tuple(points))
+
+    def airflow(self, speed: float) -> float:
+        """Return airflow at given fan speed, the end points apply beyond the curve."""
+        previous_speed, previous_airflow = self.points[0]
+        if speed <= previous_speed:
+            return previous_airflow
+        for next_speed, next_airflow in self.points[1:]:
+            if speed <= next_speed:
+                fraction = (speed - previous_speed) / (next_speed - previous_speed)
+                return previous_airflow + fraction * (next_airflow - previous_airflow)
+            previous_speed, previous_airflow = next_speed, next_airflow
+        return previous_airflow
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def recovered_power(
+    supply: Any,
+    intake: Any,
+    extract: Any,
+    supply_fan_speed: Any,
+    curve: FrapolEconet300AirflowCurve,
+) -> float | None:
+    """
+    Return heat recovered into the supply air in W, None if a reading is missing.
+
+    Heat is only recovered while the extract air is warmer than the intake air.
+    Otherwise (e.g. on a summer night, or with the bypass open) a rise of the supply
+    temperature comes from the fan motor, not from the exchanger, and is not counted.
+    """
+    supply, intake, extract, supply_fan_speed = map(
+        _as_number, (supply, intake, extract, supply_fan_speed)
+    )
+    if supply is None or intake is None or extract is None or supply_fan_speed is None:
+        return None
+    if extract <= intake or supply <= intake:
+        return 0.0
+    airflow = curve.airflow(supply_fan_speed) / _SECONDS_PER_HOUR
+    return AIR_VOLUMETRIC_HEAT_CAPACITY * airflow * (supply - intake)
+
+
+class FrapolEconet300EnergyAccumulator:
+    """
+    Energy in kWh integrated from power samples, each held until the next one.
+
+    A None sample marks a gap, e.g. the device not responding, no energy is counted
+    until the next valid sample. So is an interval longer than `max_gap` seconds.
+    """
+
+    __slots__ = ("last_power", "last_time", "max_gap", "total")
+
+    def __init__(
+        self,
+        max_gap: float,
+        total: float = 0.0,
+        last_time: float | None = None,
+        last_power: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self.max_gap = max_gap
+        self.total = total
+        self.last_time = last_time
+        self.last_power = last_power
+
+    def add(self, now: float, power: float | None) -> None:
+        """Count energy of the held power up to now, then hold the new power."""
+        if self.last_time is not None and self.last_power is not None:
+            elapsed = now - self.last_time
+            if 0 < elapsed <= self.max_gap:
+                self.total += self.last_power * elapsed / _JOULES_PER_KWH
+        self.last_time = now
+        self.last_power = power
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return state to be persisted."""
+        return {
+            "total": self.total,
+            "last_time": self.last_time,
+            "last_power": self.last_power,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], max_gap: float
+    ) -> FrapolEconet300EnergyAccumulator:
+        """Restore persisted state, raise KeyError or TypeError if it is malformed."""
+        return cls(
+            max_gap,
+            total=float(data["total"]),
+            last_time=data["last_time"],
+            last_power=data["last_power"],
+        )
@@ -2,17 +2,27 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import API_REG_PARAMS_KEY
 from .coordinator import FrapolEconet300DataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
-class FrapolEconet300Entity(CoordinatorEntity[FrapolEconet300DataUpdateCoordinator]):
 
-    def __init__(self, coordinator: FrapolEconet300DataUpdateCoordinator) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+class FrapolEconet300Entity(CoordinatorEntity[FrapolEconet300DataUpdateCoordinator]):
+    def __init__(
+        self,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+        listened_keys: Iterable[str] = (API_REG_PARAMS_KEY,),
+    ) -> None:
+        """Initialize, subscribing only to changes of given params or API tiers."""
+        super().__init__(coordinator, context=frozenset(listened_keys))
         self._attr_unique_id = coordinator.config_entry.entry_id
         self._attr_device_info = DeviceInfo(
             identifiers={
@@ -22,3 +32,21 @@ class FrapolEconet300Entity(CoordinatorEntity[FrapolEconet300DataUpdateCoordinat
                 ),
             },
         )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark state restored from the snapshot, or kept while the device is down."""
+        if not self.coordinator.stale:
+            return None
+        attributes: dict[str, Any] = {"stale": True}
+        if self.coordinator.last_device_update is not None:
+            attributes["last_device_update"] = (
+                self.coordinator.last_device_update.isoformat()
+            )
+        return attributes
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counting writes for performance metrics."""
+        self.coordinator.metrics.pending_state_writes += 1
+        super().async_write_ha_state()
@@ -0,0 +1,175 @@
+"""
+Filtering of published sensor states for frapol_econet300_heat_recovery.
+
+Every published state becomes a recorder row, so sensors can hold back changes within a
+deadband, publish no more often than a minimum interval and smooth readings first. A
+held-back value is still published once the maximum interval passes.
+"""
+
+from __future__ import annotations
+
+import statistics
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    CONF_FILTER_DEADBAND,
+    CONF_FILTER_DEADBAND_MODE,
+    CONF_FILTER_MAX_INTERVAL,
+    CONF_FILTER_MIN_INTERVAL,
+    CONF_FILTER_SMOOTHING,
+    CONF_FILTER_SMOOTHING_WINDOW,
+    DEFAULT_FILTER_SMOOTHING_WINDOW,
+)
+
+
+class FrapolEconet300DeadbandMode(StrEnum):
+    """How the deadband is measured."""
+
+    ABSOLUTE = "absolute"
+    PERCENT = "percent"
+
+
+class FrapolEconet300Smoothing(StrEnum):
+    """Smoothing applied to readings before the deadband."""
+
+    NONE = "none"
+    MEDIAN = "median"
+    EMA = "ema"
+
+
+@dataclass(frozen=True)
+class FrapolEconet300FilterConfig:
+    """Filter settings of a single sensor, the defaults publish every change."""
+
+    deadband: float = 0.0
+    deadband_mode: FrapolEconet300DeadbandMode = FrapolEconet300DeadbandMode.ABSOLUTE
+    min_interval: float = 0.0
+    # 0 disables the maximum interval
+    max_interval: float = 0.0
+    smoothing: FrapolEconet300Smoothing = FrapolEconet300Smoothing.NONE
+    smoothing_window: int = DEFAULT_FILTER_SMOOTHING_WINDOW
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> FrapolEconet300FilterConfig:
+        """Create from options stored for a sensor."""
+        return cls(
+            deadband=float(options.get(CONF_FILTER_DEADBAND, 0.0)),
+            deadband_mode=FrapolEconet300DeadbandMode(
+                options.get(
+                    CONF_FILTER_DEADBAND_MODE, FrapolEconet300DeadbandMode.ABSOLUTE
+                ),
+            ),
+            min_interval=float(options.get(CONF_FILTER_MIN_INTERVAL, 0.0)),
+            max_interval=float(options.get(CONF_FILTER_MAX_INTERVAL, 0.0)),
+            smoothing=FrapolEconet300Smoothing(
+                options.get(CONF_FILTER_SMOOTHING, FrapolEconet300Smoothing.NONE)
+            ),
+            smoothing_window=int(
+                options.get(
+                    CONF_FILTER_SMOOTHING_WINDOW, DEFAULT_FILTER_SMOOTHING_WINDOW
+                )
+            ),
+        )
+
+    @property
+    def is_passthrough(self) -> bool:
+        """Return True if the filter would publish every change unaltered."""
+        return self == FrapolEconet300FilterConfig(
+            smoothing_window=self.smoothing_window
+        )
+
+
+class FrapolEconet300SensorFilter:
+    """
+    Decide which readings of a sensor get published.
+
+    Non-numeric readings, e.g. None while the param is missing, bypass smoothing and the
+    deadband and are published as soon as the minimum interval allows.
+    """
+
+    def __init__(self, config: FrapolEconet300FilterConfig) -> None:
+        """Initialize."""
+        self._config = config
+        self._window: deque[float] = deque(maxlen=max(1, config.smoothing_window))
+        self._ema: float | None = None
+        self._ema_alpha = 2 / (max(1, config.smoothing_window) + 1)
+        self._reading: Any = None
+        self._candidate: Any = None
+        self._published_at: float | None = None
+        self.value: Any = None
+
+    @property
+    def settling(self) -> bool:
+        """Return True if smoothing has not caught up with the latest reading yet."""
+        return _is_number(self._reading) and self._candidate != self._reading
+
+    def process(self, reading: Any, now: float) -> bool:
+        """Feed a new reading, return True if `value` should be published."""
+        self._reading = reading
+        self._candidate = self._smooth(reading)
+        return self.flush(now)
+
+    def resample(self, now: float) -> bool:
+        """Feed the latest reading again, e.g. for a poll that did not change it."""
+        return self.process(self._reading, now)
+
+    def flush(self, now: float) -> bool:
+        """Re-check the held-back value, e.g. once `deadline` passes."""
+        candidate = self._candidate
+        if self._published_at is not None:
+            if candidate == self.value:
+                return False
+            elapsed = now - self._published_at
+            if elapsed < self._config.min_interval:
+                return False
+            max_interval_passed = 0 < self._config.max_interval <= elapsed
+            if not max_interval_passed and not self._exceeds_deadband(candidate):
+                return False
+        self.value = candidate
+        self._published_at = now
+        return True
+
+    def deadline(self) -> float | None:
+        """Return when the held-back value should be re-checked, if there is one."""
+        if self._published_at is None or self._candidate == self.value:
+            return None
+        if self._exceeds_deadband(self._candidate):
+            return self._published_at + self._config.min_interval
+        if self._config.max_interval > 0:
+            return self._published_at + max(
+                self._config.min_interval, self._config.max_interval
+            )
+        return None
+
+    def _exceeds_deadband(self, candidate: Any) -> bool:
+        if not _is_number(candidate) or not _is_number(self.value):
+            return True
+        threshold = self._config.deadband
+        if self._config.deadband_mode is FrapolEconet300DeadbandMode.PERCENT:
+            threshold = abs(self.value) * self._config.deadband / 100
+        return abs(candidate - self.value) > threshold
+
+    def _smooth(self, reading: Any) -> Any:
+        if (
+            not _is_number(reading)
+            or self._config.smoothing is FrapolEconet300Smoothing.NONE
+        ):
+            self._window.clear()
+            self._ema = None
+            return reading
+        if self._config.smoothing is FrapolEconet300Smoothing.MEDIAN:
+            self._window.append(reading)
+            return statistics.median(self._window)
+        self._ema = (
+            reading
+            if self._ema is None
+            else self._ema + self._ema_alpha * (reading - self._ema)
+        )
+        return round(self._ema, 2)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
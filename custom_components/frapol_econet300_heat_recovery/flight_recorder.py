@@ -0,0 +1,277 @@
+"""
+Flight recorder of raw device responses for frapol_econet300_heat_recovery.
+
+Responses are appended as gzip-compressed NDJSON lines, one JSON object per response or
+failed request. Recording only queues the line, batches are compressed and written in
+the default executor, one at a time so lines stay in order. Once the file exceeds its
+size limit it is rotated like a log file, so at most `(backups + 1) * max_bytes` of disk
+is used.
+
+A recording is replayed by `FrapolEconet300ReplayTransport`, which serves recorded
+responses in place of the device, optionally keeping recorded gaps between them scaled
+by a speed factor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import FLIGHT_RECORDER_BACKUPS, FLIGHT_RECORDER_MAX_BYTES, LOGGER
+from .transport import FrapolEconet300RequestPriority, FrapolEconet300Response
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+
+class FrapolEconet300FlightRecorderMode(StrEnum):
+    """Whether responses are recorded, or a recording replayed instead of the device."""
+
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+# Errors are recorded by kind and raised as such on replay
+RECORDED_ERROR_TIMEOUT = "timeout"
+RECORDED_ERROR_CONNECTION = "connection"
+
+
+@dataclass(frozen=True)
+class FrapolEconet300RecordedResponse:
+    """Response (or failure, if `error` is set) recorded at given wall clock time."""
+
+    time: float
+    url: str
+    status: int | None = None
+    body: bytes = b""
+    latency: float | None = None
+    error: str | None = None
+
+    def to_line(self) -> str:
+        """Serialize as a single NDJSON line, bodies which are not UTF-8 as base64."""
+        record = {"t": self.time, "url": self.url}
+        if self.error is not None:
+            record["error"] = self.error
+        else:
+            record["status"] = self.status
+            record["latency"] = self.latency
+            try:
+                record["body"] = self.body.decode()
+            except UnicodeDecodeError:
+                record["body_b64"] = base64.b64encode(self.body).decode()
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> FrapolEconet300RecordedResponse:
+        """Parse a line written by `to_line`."""
+        record = json.loads(line)
+        body = (
+            record["body"].encode()
+            if "body" in record
+            else base64.b64decode(record.get("body_b64", ""))
+        )
+        return cls(
+            time=record["t"],
+            url=record["url"],
+            status=record.get("status"),
+            body=body,
+            latency=record.get("latency"),
+            error=record.get("error"),
+        )
+
+
+class FrapolEconet300FlightRecorder:
+    """Append responses to a bounded, rotated, compressed recording."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = FLIGHT_RECORDER_MAX_BYTES,
+        backups: int = FLIGHT_RECORDER_BACKUPS,
+    ) -> None:
+        """Initialize."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending: list[str] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def record(self, url: str, response: FrapolEconet300Response) -> None:
+        """Record a response received from the device."""
+        self._append(
+            FrapolEconet300RecordedResponse(
+                time=time.time(),
+                url=url,
+                status=response.status,
+                body=response.body,
+                latency=response.latency,
+            ),
+        )
+
+    def record_error(self, url: str, error: str) -> None:
+        """Record a request which got no response."""
+        self._append(
+            FrapolEconet300RecordedResponse(time=time.time(), url=url, error=error)
+        )
+
+    def _append(self, recorded: FrapolEconet300RecordedResponse) -> None:
+        self._pending.append(recorded.to_line())
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                await loop.run_in_executor(None, self._write, batch)
+            except OSError:
+                LOGGER.warning(
+                    "Unable to write flight recording to %s", self.path, exc_info=True
+                )
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines as a new gzip member, rotating the file first if it is full."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+            rotate_file(self.path, self.backups)
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    async def async_close(self) -> None:
+        """Write pending responses."""
+        if self._flush_task is not None:
+            await self._flush_task
+
+
+def _backup_path(path: Path, number: int) -> Path:
+    return path.with_name(f"{path.name}.{number}")
+
+
+def rotate_file(path: Path, backups: int) -> None:
+    """Shift a full file to `path.1`, older backups up by one, dropping the oldest."""
+    for number in range(backups, 0, -1):
+        source = path if number == 1 else _backup_path(path, number - 1)
+        if source.exists():
+            source.replace(_backup_path(path, number))
+    if backups == 0:
+        path.unlink()
+
+
+def read_recording(path: Path) -> Iterator[FrapolEconet300RecordedResponse]:
+    """Yield recorded responses oldest first, including rotated files."""
+    backups = sorted(
+        (
+            candidate
+            for candidate in path.parent.glob(f"{path.name}.*")
+            if candidate.suffix[1:].isdigit()
+        ),
+        key=lambda candidate: int(candidate.suffix[1:]),
+        reverse=True,
+    )
+    for file_path in (*backups, path):
+        if not file_path.exists():
+            continue
+        with gzip.open(file_path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield FrapolEconet300RecordedResponse.from_line(line)
+
+
+class FrapolEconet300ReplayTransport:
+    """
+    Serve a recording in place of the device, to reproduce incidents offline.
+
+    Requests get recorded responses for the same URL (path and query) in recorded order.
+    With a `speed` set, responses are held back until the recorded time since the first
+    response, divided by the speed, passes. Without it they are served right away.
+    """
+
+    def __init__(
+        self,
+        recording: Iterable[FrapolEconet300RecordedResponse],
+        speed: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self._responses: defaultdict[str, deque[FrapolEconet300RecordedResponse]] = (
+            defaultdict(deque)
+        )
+        for recorded in recording:
+            self._responses[recorded.url].append(recorded)
+        self._speed = speed
+        self._recorded_start = min(
+            (queue[0].time for queue in self._responses.values()), default=0.0
+        )
+        self._started_at: float | None = None
+
+    @property
+    def queued(self) -> int:
+        """Return number of requests waiting for their turn, always 0."""
+        return 0
+
+    @property
+    def remaining(self) -> int:
+        """Return number of recorded responses not served yet."""
+        return sum(len(queue) for queue in self._responses.values())
+
+    def remaining_for(self, relative_url: str) -> int:
+        """Return number of recorded responses for the URL not served yet."""
+        return len(self._responses.get(relative_url, ()))
+
+    async def request(
+        self,
+        method: str,  # noqa: ARG002 Unused method argument: `method`
+        url: str,
+        *,
+        priority: FrapolEconet300RequestPriority = FrapolEconet300RequestPriority.POLL,  # noqa: ARG002
+        request_timeout: float | None = None,  # noqa: ARG002 Unused method argument: `request_timeout`
+        **kwargs: object,  # noqa: ARG002 Unused method argument: `kwargs`
+    ) -> FrapolEconet300Response:
+        """Return the next recorded response for the URL, or raise its failure."""
+        parts = urlsplit(url)
+        relative_url = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        queue = self._responses.get(relative_url)
+        if not queue:
+            msg = f"No more recorded responses for {relative_url}"
+            raise aiohttp.ClientConnectionError(msg)
+        recorded = queue.popleft()
+        await self._wait_for(recorded.time)
+
+        if recorded.error == RECORDED_ERROR_TIMEOUT:
+            raise TimeoutError
+        if recorded.error is not None:
+            msg = f"Recorded {recorded.error} error"
+            raise aiohttp.ClientConnectionError(msg)
+        return FrapolEconet300Response(
+            status=recorded.status,
+            reason=None,
+            body=recorded.body,
+            latency=recorded.latency or 0.0,
+        )
+
+    async def _wait_for(self, recorded_time: float) -> None:
+        if not self._speed:
+            return
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+        delay = (recorded_time - self._recorded_start) / self._speed - (
+            now - self._started_at
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """Nothing to close."""
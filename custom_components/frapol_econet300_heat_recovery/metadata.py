@@ -0,0 +1,242 @@
+"""
+Parameter metadata (units, ranges, enums) for frapol_econet300_heat_recovery.
+
+editParams and the full regParams document are large and their descriptive parts only
+change with the firmware, so they are fetched once and persisted per device, keyed by
+uid and refetched when the firmware fingerprint changes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .api import FrapolEconet300ApiClientError
+from .const import (
+    API_PARAM_UNIT_MAPPING,
+    API_REG_PARAMS_CURRENT_KEY,
+    API_REG_PARAMS_SCHEMA_KEY,
+    API_REG_PARAMS_UNITS_KEY,
+    DOMAIN,
+    LOGGER,
+    METADATA_STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import FrapolEconet300ApiClient
+
+# editParams wraps parameters in one of these keys, depending on the controller
+_EDIT_PARAMS_CONTAINER_KEYS = ("data", "editableParams", "params")
+
+
+@dataclass(frozen=True)
+class FrapolEconet300ParamMetadata:
+    """Unit, allowed range and enum values of a single parameter."""
+
+    unit: str | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    options: tuple[int, ...] | None = None
+    # Only known for params reported in regParams
+    visible: bool | None = None
+    numeric: bool | None = None
+
+
+def firmware_fingerprint(sys_params: dict[str, Any]) -> str:
+    """Return a string identifying the controller and its software versions."""
+    versions = {
+        name: value
+        for name, value in sys_params.items()
+        if name.lower().endswith("softver") or name in ("controllerID", "moduleType")
+    }
+    return ";".join(f"{name}={versions[name]}" for name in sorted(versions))
+
+
+def _parse_unit(unit: Any) -> str | None:
+    if isinstance(unit, str) and not unit.isdigit():
+        return unit or None
+    try:
+        return API_PARAM_UNIT_MAPPING.get(int(unit)) or None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_options(enum: Any) -> tuple[int, ...] | None:
+    """Return enum values, given either explicitly or as labels indexed from `first`."""
+    if isinstance(enum, dict):
+        if "values" in enum:
+            first = int(enum.get("first", 0))
+            return tuple(range(first, first + len(enum["values"])))
+        return (
+            tuple(int(value) for value in enum if str(value).lstrip("-").isdigit())
+            or None
+        )
+    if isinstance(enum, list):
+        return tuple(range(len(enum))) or None
+    return None
+
+
+def parse_edit_params(document: Any) -> dict[str, FrapolEconet300ParamMetadata]:
+    """
+    Parse editParams into metadata by parameter name.
+
+    Parameters are accepted either as a mapping of name to description or as a list of
+    descriptions with a `name` field, optionally wrapped in a container key.
+    """
+    if isinstance(document, dict):
+        for key in _EDIT_PARAMS_CONTAINER_KEYS:
+            if isinstance(document.get(key), dict | list):
+                document = document[key]
+                break
+
+    if isinstance(document, list):
+        entries = {
+            entry["name"]: entry
+            for entry in document
+            if isinstance(entry, dict) and "name" in entry
+        }
+    elif isinstance(document, dict):
+        entries = {
+            name: entry for name, entry in document.items() if isinstance(entry, dict)
+        }
+    else:
+        entries = {}
+
+    return {
+        str(name): FrapolEconet300ParamMetadata(
+            unit=_parse_unit(entry.get("unit")),
+            min_value=_parse_number(entry.get("minv", entry.get("min"))),
+            max_value=_parse_number(entry.get("maxv", entry.get("max"))),
+            options=_parse_options(entry.get("enum")),
+        )
+        for name, entry in entries.items()
+    }
+
+
+def parse_reg_params_catalogue(
+    document: Any,
+) -> dict[str, FrapolEconet300ParamMetadata]:
+    """
+    Parse the full regParams document into metadata of every reported scalar param.
+
+    Units come from unit codes in `currUnits`, visibility from the device's own
+    `schemaParams`. Boolean flags are left out, they do not map to sensors.
+    """
+    if not isinstance(document, dict) or not isinstance(
+        document.get(API_REG_PARAMS_CURRENT_KEY), dict
+    ):
+        return {}
+    units = document.get(API_REG_PARAMS_UNITS_KEY) or {}
+    schema = document.get(API_REG_PARAMS_SCHEMA_KEY) or {}
+
+    params = {}
+    for name, value in document[API_REG_PARAMS_CURRENT_KEY].items():
+        if isinstance(value, bool) or not isinstance(value, int | float | str):
+            continue
+        entry = schema.get(name)
+        visible = entry.get("visible") if isinstance(entry, dict) else None
+        params[name] = FrapolEconet300ParamMetadata(
+            unit=_parse_unit(units.get(name)),
+            visible=bool(visible) if visible is not None else None,
+            numeric=not isinstance(value, str),
+        )
+    return params
+
+
+class FrapolEconet300MetadataStore:
+    """Parameter metadata of one device, persisted across restarts."""
+
+    def __init__(
+        self, hass: HomeAssistant, client: FrapolEconet300ApiClient, uid: str
+    ) -> None:
+        """Initialize."""
+        self._client = client
+        self._store: Store[dict[str, Any]] = Store(
+            hass, METADATA_STORAGE_VERSION, f"{DOMAIN}.metadata.{uid}"
+        )
+        self._params: dict[str, FrapolEconet300ParamMetadata] = {}
+
+    async def async_load(self, fingerprint: str) -> None:
+        """
+        Load stored metadata.
+
+        It is fetched from the device only if the firmware changed since it was stored.
+        """
+        stored = await self._store.async_load()
+        if stored is not None and stored.get("fingerprint") == fingerprint:
+            self._params = {
+                name: FrapolEconet300ParamMetadata(
+                    **{
+                        **param,
+                        "options": tuple(param["options"])
+                        if param["options"] is not None
+                        else None,
+                    },
+                )
+                for name, param in stored["params"].items()
+            }
+            return
+
+        LOGGER.info("Fetching parameter metadata for firmware: %s", fingerprint)
+        try:
+            params = parse_edit_params(await self._client.get_edit_params())
+            catalogue = parse_reg_params_catalogue(
+                await self._client.get_reg_params_catalogue()
+            )
+        except FrapolEconet300ApiClientError as exception:
+            # Entities fall back to their defaults, fetching is retried on next start
+            LOGGER.warning("Could not fetch parameter metadata - %s", exception)
+            return
+
+        for name, reported in catalogue.items():
+            edit = params.get(name)
+            params[name] = (
+                reported
+                if edit is None
+                else replace(
+                    edit,
+                    unit=edit.unit or reported.unit,
+                    visible=reported.visible,
+                    numeric=reported.numeric,
+                )
+            )
+        self._params = params
+
+        await self._store.async_save(
+            {
+                "fingerprint": fingerprint,
+                "params": {name: asdict(param) for name, param in self._params.items()},
+            },
+        )
+
+    def get(self, param_name: str) -> FrapolEconet300ParamMetadata | None:
+        """Return metadata of a parameter, None if the device did not describe it."""
+        return self._params.get(param_name)
+
+    def unit(self, param_name: str) -> str | None:
+        """Return unit of a parameter, None if unknown."""
+        param = self._params.get(param_name)
+        return param.unit if param is not None else None
+
+    def reported_params(self) -> dict[str, FrapolEconet300ParamMetadata]:
+        """Return metadata of params the device reports in regParams."""
+        return {
+            name: param
+            for name, param in self._params.items()
+            if param.numeric is not None
+        }
+
+    def __len__(self) -> int:
+        """Return number of described parameters."""
+        return len(self._params)
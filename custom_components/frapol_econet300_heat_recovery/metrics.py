@@ -0,0 +1,137 @@
+"""
+Performance counters for frapol_econet300_heat_recovery.
+
+Recording is a few integer increments, so it stays on in the hot path. Counters are only
+summarized when diagnostics are downloaded or diagnostic sensors are read.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Any
+
+from .const import METRICS_LATENCY_BUCKETS
+
+
+@dataclass
+class FrapolEconet300EndpointMetrics:
+    """Counters of requests to a single endpoint."""
+
+    latency_buckets: list[int]
+    latency_sum: float = 0.0
+    responses: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+
+@dataclass
+class FrapolEconet300UpdateMetrics:
+    """Counters of coordinator updates."""
+
+    count: int = 0
+    duration_sum: float = 0.0
+    last_duration: float | None = None
+    state_writes: int = 0
+    last_state_writes: int = 0
+
+
+class FrapolEconet300Metrics:
+    """
+    Latency histograms and counters per endpoint, plus coordinator update statistics.
+
+    Latency histogram bucket `i` counts responses not slower than `buckets[i]` seconds
+    (and slower than the previous bound), the last one counts all slower responses.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> None:
+        """Initialize."""
+        self.buckets = buckets
+        self.endpoints: dict[str, FrapolEconet300EndpointMetrics] = {}
+        self.updates = FrapolEconet300UpdateMetrics()
+        # Incremented by entities, collected into update statistics by the coordinator
+        self.pending_state_writes = 0
+
+    def endpoint(self, endpoint: str) -> FrapolEconet300EndpointMetrics:
+        """Return counters of an endpoint, creating them on first use."""
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = FrapolEconet300EndpointMetrics(
+                latency_buckets=[0] * (len(self.buckets) + 1),
+            )
+        return metrics
+
+    def record_response(self, endpoint: str, latency: float, size: int) -> None:
+        """Record a response received from the device."""
+        metrics = self.endpoint(endpoint)
+        metrics.latency_buckets[bisect.bisect_left(self.buckets, latency)] += 1
+        metrics.latency_sum += latency
+        metrics.responses += 1
+        metrics.bytes_received += size
+
+    def record_retry(self, endpoint: str) -> None:
+        """Record a retried request."""
+        self.endpoint(endpoint).retries += 1
+
+    def record_timeout(self, endpoint: str) -> None:
+        """Record a request which timed out."""
+        self.endpoint(endpoint).timeouts += 1
+
+    def record_error(self, endpoint: str) -> None:
+        """Record a request which failed for good, after retries."""
+        self.endpoint(endpoint).errors += 1
+
+    def record_update(self, duration: float) -> None:
+        """Record a finished coordinator update."""
+        self.updates.count += 1
+        self.updates.duration_sum += duration
+        self.updates.last_duration = duration
+
+    def collect_state_writes(self) -> None:
+        """Attribute state writes made since the last call to the latest update."""
+        self.updates.last_state_writes = self.pending_state_writes
+        self.updates.state_writes += self.pending_state_writes
+        self.pending_state_writes = 0
+
+    @property
+    def total_errors(self) -> int:
+        """Return number of failed requests to all endpoints."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def total_retries(self) -> int:
+        """Return number of retries of requests to all endpoints."""
+        return sum(metrics.retries for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all counters, with histogram buckets labelled by their upper bound."""
+        labels = [f"<={bound}s" for bound in self.buckets] + [f">{self.buckets[-1]}s"]
+        return {
+            "endpoints": {
+                endpoint: {
+                    "latency_histogram": dict(
+                        zip(labels, metrics.latency_buckets, strict=True)
+                    ),
+                    "latency_mean": metrics.latency_sum / metrics.responses
+                    if metrics.responses
+                    else None,
+                    "responses": metrics.responses,
+                    "bytes_received": metrics.bytes_received,
+                    "retries": metrics.retries,
+                    "timeouts": metrics.timeouts,
+                    "errors": metrics.errors,
+                }
+                for endpoint, metrics in self.endpoints.items()
+            },
+            "updates": {
+                "count": self.updates.count,
+                "duration_mean": self.updates.duration_sum / self.updates.count
+                if self.updates.count
+                else None,
+                "last_duration": self.updates.last_duration,
+                "state_writes": self.updates.state_writes,
+                "last_state_writes": self.updates.last_state_writes,
+            },
+        }
@@ -0,0 +1,171 @@
+"""
+Snapshot of device state for frapol_econet300_heat_recovery.
+
+Current regParams values are stored in a tuple, addressed through a name to slot index
+which is shared by consecutive snapshots as long as the device reports the same params.
+Accessors resolve their slot once per index, so reading a value is a tuple lookup. The
+client projects regParams to params entities depend on, so only those are kept.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .const import API_REG_PARAMS_CURRENT_KEY, API_REG_PARAMS_KEY, API_SYS_PARAMS_KEY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_MISSING = object()
+
+
+class FrapolEconet300ParamIndex:
+    """Slots of current regParams values by name."""
+
+    __slots__ = ("names", "slots")
+
+    def __init__(self, names: tuple[str, ...]) -> None:
+        """Initialize."""
+        self.names = names
+        self.slots = {name: slot for slot, name in enumerate(names)}
+
+
+class FrapolEconet300Snapshot:
+    """
+    Current regParams values and sysParams of a device, immutable once created.
+
+    Unchanged parts keep their identity between snapshots, so they can be compared
+    cheaply.
+    """
+
+    __slots__ = ("index", "sys_params", "uid", "values")
+
+    def __init__(
+        self,
+        index: FrapolEconet300ParamIndex,
+        values: tuple[Any, ...],
+        sys_params: dict[str, Any],
+    ) -> None:
+        """Initialize."""
+        self.index = index
+        self.values = values
+        self.sys_params = sys_params
+        self.uid: str | None = sys_params.get("uid")
+
+    @classmethod
+    def from_tiers(
+        cls,
+        tiers: dict[str, Any],
+        previous: FrapolEconet300Snapshot | None = None,
+    ) -> FrapolEconet300Snapshot:
+        """Create from API tiers, reusing unchanged parts of the previous snapshot."""
+        current = tiers[API_REG_PARAMS_KEY][API_REG_PARAMS_CURRENT_KEY]
+        sys_params = tiers[API_SYS_PARAMS_KEY]
+        names = tuple(current)
+        index = (
+            previous.index
+            if previous is not None and previous.index.names == names
+            else None
+        )
+        if previous is not None and previous.sys_params == sys_params:
+            sys_params = previous.sys_params
+        return cls(
+            index or FrapolEconet300ParamIndex(names),
+            tuple(current.values()),
+            sys_params,
+        )
+
+    def get(self, param_name: str) -> Any:
+        """Return a current regParams value, None if the device does not report it."""
+        slot = self.index.slots.get(param_name)
+        return None if slot is None else self.values[slot]
+
+    def with_values(self, values: dict[str, Any]) -> FrapolEconet300Snapshot:
+        """Return a copy with given regParams values set, e.g. ahead of the device."""
+        if values.keys() <= self.index.slots.keys():
+            merged = list(self.values)
+            for param_name, value in values.items():
+                merged[self.index.slots[param_name]] = value
+            return FrapolEconet300Snapshot(self.index, tuple(merged), self.sys_params)
+        current = {**self.current_params(), **values}
+        return FrapolEconet300Snapshot(
+            FrapolEconet300ParamIndex(tuple(current)),
+            tuple(current.values()),
+            self.sys_params,
+        )
+
+    def current_params(self) -> dict[str, Any]:
+        """Return current regParams values by name."""
+        return dict(zip(self.index.names, self.values, strict=True))
+
+    def diff(self, previous: FrapolEconet300Snapshot) -> dict[str, Any]:
+        """
+        Return regParams values which differ from the previous snapshot.
+
+        Params which were removed map to None.
+        """
+        if self.values is previous.values:
+            return {}
+        if self.index is previous.index:
+            names = self.index.names
+            return {
+                names[slot]: value
+                for slot, (old, value) in enumerate(
+                    zip(previous.values, self.values, strict=True)
+                )
+                if old != value
+            }
+        old = previous.current_params()
+        delta = {
+            name: value
+            for name, value in self.current_params().items()
+            if old.get(name, _MISSING) != value
+        }
+        delta.update(dict.fromkeys(old.keys() - self.index.slots.keys()))
+        return delta
+
+    def changed_tiers(self, previous: FrapolEconet300Snapshot) -> list[str]:
+        """Return names of API tiers which changed since the previous snapshot."""
+        changed = []
+        if self.values is not previous.values:
+            changed.append(API_REG_PARAMS_KEY)
+        if self.sys_params is not previous.sys_params:
+            changed.append(API_SYS_PARAMS_KEY)
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return in the shape of API tiers, e.g. to be persisted."""
+        return {
+            API_REG_PARAMS_KEY: {API_REG_PARAMS_CURRENT_KEY: self.current_params()},
+            API_SYS_PARAMS_KEY: self.sys_params,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        """Compare values, short-circuiting on shared parts."""
+        if not isinstance(other, FrapolEconet300Snapshot):
+            return NotImplemented
+        return (
+            (self.index is other.index or self.index.names == other.index.names)
+            and (self.values is other.values or self.values == other.values)
+            and (
+                self.sys_params is other.sys_params
+                or self.sys_params == other.sys_params
+            )
+        )
+
+    __hash__ = None
+
+
+def param_accessor(param_name: str) -> Callable[[FrapolEconet300Snapshot], Any]:
+    """Return accessor of a regParams value, resolving its slot once per index."""
+    index: FrapolEconet300ParamIndex | None = None
+    slot: int | None = None
+
+    def access(snapshot: FrapolEconet300Snapshot) -> Any:
+        nonlocal index, slot
+        if snapshot.index is not index:
+            index = snapshot.index
+            slot = index.slots.get(param_name)
+        return None if slot is None else snapshot.values[slot]
+
+    return access
@@ -0,0 +1,42 @@
+"""Named sets of param values for frapol_econet300_heat_recovery, e.g. for summer."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PROFILES_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from homeassistant.core import HomeAssistant
+
+
+class FrapolEconet300ProfileStore:
+    """Profiles of one device, persisted across restarts."""
+
+    def __init__(self, hass: HomeAssistant, uid: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, PROFILES_STORAGE_VERSION, f"{DOMAIN}.profiles.{uid}"
+        )
+        self._profiles: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load stored profiles."""
+        self._profiles = await self._store.async_load() or {}
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """Return param values of a profile, None if there is no such profile."""
+        return self._profiles.get(name)
+
+    async def async_save(self, name: str, params: dict[str, Any]) -> None:
+        """Store a profile, replacing one with the same name."""
+        self._profiles[name] = dict(params)
+        await self._store.async_save(self._profiles)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over profile names."""
+        return iter(self._profiles)
@@ -0,0 +1,192 @@
+"""
+Fan-out caching proxy for a single ecoNET300 device.
+
+The device is polled once, on the proxy's own schedule, however many clients there are.
+The regParams and sysParams bodies are served from memory with an ETag, so a client
+revalidating with If-None-Match gets an empty 304 while nothing changed. newParam writes
+are passed through one at a time, after each of them regParams is polled right away so
+clients see the new value.
+
+Clients authenticate with the same credentials as the device, like they would talking to
+it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from aiohttp import BasicAuth, hdrs, web
+
+from .api import FrapolEconet300ApiClientError
+from .const import (
+    API_REG_PARAMS_ENDPOINT,
+    API_REG_PARAMS_REFRESH_INTERVAL,
+    API_SET_PARAM_ENDPOINT,
+    API_SYS_PARAMS_ENDPOINT,
+    API_SYS_PARAMS_REFRESH_INTERVAL,
+    LOGGER,
+    PROXY_DEFAULT_BIND,
+    PROXY_DEFAULT_PORT,
+)
+from .transport import FrapolEconet300RequestPriority
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from .api import FrapolEconet300ApiClient
+
+_ETAG_ANY = "*"
+
+
+@dataclass
+class FrapolEconet300CachedEndpoint:
+    """Last body of an endpoint polled on its own interval, with its ETag."""
+
+    relative_url: str
+    interval: float
+    body: bytes | None = None
+    etag: str | None = None
+    fetched_at: float | None = None
+
+    def next_poll(self) -> float:
+        """Return monotonic time of the next poll."""
+        return 0.0 if self.fetched_at is None else self.fetched_at + self.interval
+
+    def update(self, body: bytes, now: float) -> bool:
+        """Cache a fetched body, return True if it changed."""
+        self.fetched_at = now
+        if body == self.body:
+            return False
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return True
+
+    def matches(self, request: web.Request) -> bool:
+        """Return True if the client already has the cached body."""
+        return any(
+            etag.value in (self.etag, _ETAG_ANY) for etag in request.if_none_match or ()
+        )
+
+
+class FrapolEconet300Proxy:
+    """Serve cached responses of one device to any number of local clients."""
+
+    def __init__(
+        self,
+        client: FrapolEconet300ApiClient,
+        username: str,
+        password: str,
+        reg_params_interval: timedelta = API_REG_PARAMS_REFRESH_INTERVAL,
+        sys_params_interval: timedelta = API_SYS_PARAMS_REFRESH_INTERVAL,
+    ) -> None:
+        """Initialize."""
+        self.client = client
+        self._auth = BasicAuth(username, password).encode()
+        self.endpoints = {
+            API_REG_PARAMS_ENDPOINT: FrapolEconet300CachedEndpoint(
+                API_REG_PARAMS_ENDPOINT, reg_params_interval.total_seconds()
+            ),
+            API_SYS_PARAMS_ENDPOINT: FrapolEconet300CachedEndpoint(
+                API_SYS_PARAMS_ENDPOINT, sys_params_interval.total_seconds()
+            ),
+        }
+        self._write_lock = asyncio.Lock()
+        self._poll_task: asyncio.Task[None] | None = None
+        self._runner: web.AppRunner | None = None
+
+    async def start(
+        self, host: str = PROXY_DEFAULT_BIND, port: int = PROXY_DEFAULT_PORT
+    ) -> str:
+        """
+        Poll the device once, then start serving and polling in the background.
+
+        Return the base URL.
+        """
+        await asyncio.gather(
+            *(self._refresh(endpoint) for endpoint in self.endpoints.values())
+        )
+
+        app = web.Application()
+        app.router.add_get(API_REG_PARAMS_ENDPOINT, self._serve)
+        app.router.add_get(API_SYS_PARAMS_ENDPOINT, self._serve)
+        app.router.add_get(API_SET_PARAM_ENDPOINT, self._write)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = site._server.sockets[0].getsockname()[:2]  # noqa: SLF001
+        self._poll_task = asyncio.get_running_loop().create_task(self._poll())
+        LOGGER.info("Proxy listening on %s:%s", bound_host, bound_port)
+        return f"http://{bound_host}:{bound_port}"
+
+    async def close(self) -> None:
+        """Stop polling and serving."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _poll(self) -> None:
+        while True:
+            next_poll = min(
+                endpoint.next_poll() for endpoint in self.endpoints.values()
+            )
+            await asyncio.sleep(max(0.0, next_poll - time.monotonic()))
+            now = time.monotonic()
+            due = [
+                endpoint
+                for endpoint in self.endpoints.values()
+                if endpoint.next_poll() <= now
+            ]
+            await asyncio.gather(*(self._refresh(endpoint) for endpoint in due))
+
+    async def _refresh(self, endpoint: FrapolEconet300CachedEndpoint) -> None:
+        """Poll an endpoint, keeping the cached body if the device does not respond."""
+        try:
+            body = await self.client.fetch_raw(endpoint.relative_url)
+        except FrapolEconet300ApiClientError as exception:
+            # Retried on the next interval, clients get the last known body meanwhile
+            endpoint.fetched_at = time.monotonic()
+            LOGGER.warning("Unable to poll %s - %s", endpoint.relative_url, exception)
+            return
+        if endpoint.update(body, time.monotonic()):
+            LOGGER.debug("%s changed", endpoint.relative_url)
+
+    def _verify_auth(self, request: web.Request) -> None:
+        if request.headers.get(hdrs.AUTHORIZATION) != self._auth:
+            raise web.HTTPUnauthorized(
+                headers={hdrs.WWW_AUTHENTICATE: 'Basic realm="ecoNET300"'}
+            )
+
+    async def _serve(self, request: web.Request) -> web.StreamResponse:
+        self._verify_auth(request)
+        endpoint = self.endpoints[request.path]
+        if endpoint.body is None:
+            raise web.HTTPServiceUnavailable(text="Device has not responded yet")
+
+        if endpoint.matches(request):
+            response = web.Response(status=web.HTTPNotModified.status_code)
+        else:
+            response = web.Response(body=endpoint.body, content_type="application/json")
+        response.etag = endpoint.etag
+        # Clients may keep the body, but have to revalidate it on every request
+        response.headers[hdrs.CACHE_CONTROL] = "no-cache"
+        return response
+
+    async def _write(self, request: web.Request) -> web.StreamResponse:
+        self._verify_auth(request)
+        async with self._write_lock:
+            try:
+                body = await self.client.fetch_raw(
+                    request.path_qs, priority=FrapolEconet300RequestPriority.WRITE
+                )
+            except FrapolEconet300ApiClientError as exception:
+                raise web.HTTPBadGateway(text=str(exception)) from exception
+            await self._refresh(self.endpoints[API_REG_PARAMS_ENDPOINT])
+        return web.Response(body=body, content_type="application/json")
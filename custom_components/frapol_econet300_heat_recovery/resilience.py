@@ -0,0 +1,161 @@
+"""Retry, adaptive timeout and circuit breaker primitives used by the API client."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .const import (
+    API_CIRCUIT_FAILURE_THRESHOLD,
+    API_CIRCUIT_RESET_TIMEOUT,
+    API_LATENCY_SAMPLES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_ATTEMPTS,
+    API_RETRY_MAX_DELAY,
+    API_TIMEOUT_LATENCY_MULTIPLIER,
+    API_TIMEOUT_LATENCY_PERCENTILE,
+    API_TIMEOUT_MAX,
+    API_TIMEOUT_MIN,
+    API_TIMEOUT_MIN_SAMPLES,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass
+class FrapolEconet300RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    max_attempts: int = API_RETRY_MAX_ATTEMPTS
+    base_delay: float = API_RETRY_BASE_DELAY
+    max_delay: float = API_RETRY_MAX_DELAY
+
+    def delay(self, attempt: int) -> float:
+        """Return seconds to wait before retrying given (0-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # noqa: S311
+
+
+class FrapolEconet300LatencyTracker:
+    """
+    Keep recent latencies per endpoint and derive request timeouts from them.
+
+    Until enough samples are collected the maximum timeout is used.
+    """
+
+    def __init__(
+        self,
+        samples: int = API_LATENCY_SAMPLES,
+        percentile: float = API_TIMEOUT_LATENCY_PERCENTILE,
+        multiplier: float = API_TIMEOUT_LATENCY_MULTIPLIER,
+        min_timeout: float = API_TIMEOUT_MIN,
+        max_timeout: float = API_TIMEOUT_MAX,
+    ) -> None:
+        """Initialize."""
+        self._samples = samples
+        self._percentile = percentile
+        self._multiplier = multiplier
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self._latencies: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, latency: float) -> None:
+        """Record latency (in seconds) of a successful request."""
+        if endpoint not in self._latencies:
+            self._latencies[endpoint] = deque(maxlen=self._samples)
+        self._latencies[endpoint].append(latency)
+
+    def percentile(self, endpoint: str, percentile: float) -> float | None:
+        """Return given percentile (0-1) of recorded latencies, None without samples."""
+        latencies = self._latencies.get(endpoint)
+        if not latencies:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(percentile * len(ordered)))]
+
+    def timeout(self, endpoint: str) -> float:
+        """Return timeout for the next request to the endpoint."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < API_TIMEOUT_MIN_SAMPLES:
+            return self._max_timeout
+        timeout = self.percentile(endpoint, self._percentile) * self._multiplier
+        return min(self._max_timeout, max(self._min_timeout, timeout))
+
+
+class FrapolEconet300CircuitState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class FrapolEconet300CircuitBreaker:
+    """
+    Stop sending requests to an unresponsive device.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests are
+    rejected until `reset_timeout` elapses. Then a single probe request is let through
+    (half-open) - its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = API_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = API_CIRCUIT_RESET_TIMEOUT.total_seconds(),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = FrapolEconet300CircuitState.CLOSED
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> FrapolEconet300CircuitState:
+        """Return current state, open turns half-open once the reset timeout elapsed."""
+        if (
+            self._state is FrapolEconet300CircuitState.OPEN
+            and self._clock() - self.opened_at >= self._reset_timeout
+        ):
+            self._state = FrapolEconet300CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now, reserving the half-open probe."""
+        state = self.state
+        if state is FrapolEconet300CircuitState.CLOSED:
+            return True
+        if state is FrapolEconet300CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Let another probe through once the current one ended without an outcome."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a request answered by the device."""
+        self._state = FrapolEconet300CircuitState.CLOSED
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Record a request the device failed to answer."""
+        self.consecutive_failures += 1
+        if (
+            self._state is FrapolEconet300CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self._failure_threshold
+        ):
+            self._state = FrapolEconet300CircuitState.OPEN
+            self.opened_at = self._clock()
+        self._probe_in_flight = False
@@ -0,0 +1,121 @@
+"""
+LAN discovery of ecoNET300 devices for frapol_econet300_heat_recovery.
+
+Devices do not announce themselves, so hosts of a subnet are probed for
+`/econet/sysParams`. Probes run concurrently with bounded parallelism and a short
+timeout each, so a /24 subnet with mostly silent addresses is scanned in a few seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import aiohttp
+import async_timeout
+
+from .const import (
+    API_SYS_PARAMS_ENDPOINT,
+    DISCOVERY_MAX_CONCURRENT,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_TIMEOUT,
+    LOGGER,
+)
+from .decoder import decode_json
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class FrapolEconet300DiscoveredDevice:
+    """Host answering like an ecoNET300 device, no uid if credentials were wrong."""
+
+    host: str
+    uid: str | None
+
+
+def subnet_hosts(subnet: str, port: int | None = None) -> list[str]:
+    """Return hosts of a subnet, raise ValueError if it is invalid or too large."""
+    network = ipaddress.IPv4Network(subnet, strict=False)
+    if network.num_addresses > DISCOVERY_MAX_HOSTS:
+        msg = f"Subnet {subnet} has more than {DISCOVERY_MAX_HOSTS} addresses"
+        raise ValueError(msg)
+    hosts = [str(address) for address in network.hosts()] or [
+        str(network.network_address)
+    ]
+    return [f"{host}:{port}" for host in hosts] if port is not None else hosts
+
+
+async def probe_host(
+    session: aiohttp.ClientSession,
+    host: str,
+    *,
+    auth: aiohttp.BasicAuth | None = None,
+    probe_timeout: float = DISCOVERY_TIMEOUT,
+) -> FrapolEconet300DiscoveredDevice | None:
+    """Return the device answering on a host, None if it is not an ecoNET300 device."""
+    try:
+        async with (
+            async_timeout.timeout(probe_timeout),
+            session.get(
+                f"http://{host}{API_SYS_PARAMS_ENDPOINT}", auth=auth
+            ) as response,
+        ):
+            if response.status == HTTPStatus.UNAUTHORIZED:
+                return FrapolEconet300DiscoveredDevice(host=host, uid=None)
+            if response.status != HTTPStatus.OK:
+                return None
+            sys_params = decode_json(await response.read())
+    except (TimeoutError, aiohttp.ClientError, OSError, ValueError):
+        return None
+    if not isinstance(sys_params, dict) or not sys_params.get("uid"):
+        return None
+    return FrapolEconet300DiscoveredDevice(host=host, uid=str(sys_params["uid"]))
+
+
+async def probe_hosts(
+    session: aiohttp.ClientSession,
+    hosts: Iterable[str],
+    *,
+    auth: aiohttp.BasicAuth | None = None,
+    max_concurrent: int = DISCOVERY_MAX_CONCURRENT,
+    probe_timeout: float = DISCOVERY_TIMEOUT,
+) -> list[FrapolEconet300DiscoveredDevice]:
+    """Probe at most `max_concurrent` hosts at once, return devices in host order."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def probe(host: str) -> FrapolEconet300DiscoveredDevice | None:
+        async with semaphore:
+            return await probe_host(
+                session, host, auth=auth, probe_timeout=probe_timeout
+            )
+
+    results = await asyncio.gather(*(probe(host) for host in hosts))
+    devices = [device for device in results if device is not None]
+    LOGGER.debug(
+        "Discovered %d device(s) out of %d probed hosts", len(devices), len(results)
+    )
+    return devices
+
+
+async def scan_subnet(  # noqa: PLR0913 Too many arguments in function definition
+    session: aiohttp.ClientSession,
+    subnet: str,
+    *,
+    auth: aiohttp.BasicAuth | None = None,
+    port: int | None = None,
+    max_concurrent: int = DISCOVERY_MAX_CONCURRENT,
+    probe_timeout: float = DISCOVERY_TIMEOUT,
+) -> list[FrapolEconet300DiscoveredDevice]:
+    """Probe every host of a subnet, raise ValueError if it is invalid or too large."""
+    return await probe_hosts(
+        session,
+        subnet_hosts(subnet, port),
+        auth=auth,
+        max_concurrent=max_concurrent,
+        probe_timeout=probe_timeout,
+    )
@@ -0,0 +1,127 @@
+"""Poll scheduling for frapol_econet300_heat_recovery."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .const import (
+    FLEET_MAX_CONCURRENT_REQUESTS,
+    FLEET_POLL_JITTER,
+    UPDATE_INTERVAL_BACKOFF_FACTOR,
+    UPDATE_INTERVAL_BURST_POLLS,
+    UPDATE_INTERVAL_LATENCY_FACTOR,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class FrapolEconet300AdaptiveInterval:
+    """
+    Pick the interval until the next poll from observed changes and device latency.
+
+    A write or a detected change starts a burst of polls at the minimum interval.
+    Afterwards, while values stay stable, the interval grows towards the maximum. It is
+    never shorter than a multiple of the device response time, so a busy device is
+    polled less often.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        burst_polls: int = UPDATE_INTERVAL_BURST_POLLS,
+        backoff_factor: float = UPDATE_INTERVAL_BACKOFF_FACTOR,
+        latency_factor: float = UPDATE_INTERVAL_LATENCY_FACTOR,
+    ) -> None:
+        """Initialize."""
+        self._min = min_interval.total_seconds()
+        self._max = max(self._min, max_interval.total_seconds())
+        self._burst_polls = burst_polls
+        self._backoff_factor = backoff_factor
+        self._latency_factor = latency_factor
+        self._burst_remaining = burst_polls
+        self._interval = self._min
+        self.interval = min_interval
+
+    def burst(self) -> None:
+        """Poll at the minimum interval for the next few polls."""
+        self._burst_remaining = self._burst_polls
+        self._interval = self._min
+        self.interval = timedelta(seconds=self._min)
+
+    def next_interval(self, *, changed: bool, latency: float | None) -> timedelta:
+        """Return interval until the next poll, given changes and latency."""
+        if changed:
+            self._burst_remaining = self._burst_polls
+        if self._burst_remaining:
+            self._burst_remaining -= 1
+            self._interval = self._min
+        else:
+            self._interval = min(self._max, self._interval * self._backoff_factor)
+
+        seconds = self._interval
+        if latency is not None:
+            seconds = min(self._max, max(seconds, latency * self._latency_factor))
+        self.interval = timedelta(seconds=round(seconds, 1))
+        return self.interval
+
+
+class FrapolEconet300FleetScheduler:
+    """
+    Stagger polls of all configured devices and cap concurrent requests across them.
+
+    Every registered device gets an evenly spaced phase. Its polls are delayed, never
+    advanced, to land within half the spacing after that phase, plus a little jitter, so
+    devices polled at the same interval never fire in lockstep and none is polled more
+    often than configured. Requests of all devices share a FIFO limiter, while each
+    device sends at most one request at a time - a slow device only ever holds its own
+    slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = FLEET_MAX_CONCURRENT_REQUESTS,
+        jitter: float = FLEET_POLL_JITTER,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize."""
+        self._jitter = jitter
+        self._clock = clock
+        self._rand = rand
+        self._phases: dict[str, float] = {}
+        self.limiter = asyncio.Semaphore(max_concurrent)
+
+    def register(self, member_id: str) -> None:
+        """Add a device, spacing phases of all devices evenly."""
+        self._phases[member_id] = 0.0
+        self._assign_phases()
+
+    def unregister(self, member_id: str) -> None:
+        """Remove a device."""
+        if self._phases.pop(member_id, None) is not None:
+            self._assign_phases()
+
+    def _assign_phases(self) -> None:
+        count = len(self._phases)
+        for index, member_id in enumerate(self._phases):
+            self._phases[member_id] = index / count
+
+    def align(self, member_id: str, interval: timedelta) -> timedelta:
+        """Return delay until the next poll slot, at least `interval` from now."""
+        phase = self._phases.get(member_id)
+        seconds = interval.total_seconds()
+        if phase is None or seconds <= 0:
+            return interval
+
+        spacing = seconds / len(self._phases)
+        # A poll slightly past its slot, e.g. by the last poll duration, keeps its place
+        late = (self._clock() + seconds - phase * seconds) % seconds
+        shift = 0.0 if late < spacing / 2 else seconds - late
+        jitter = self._rand() * self._jitter * spacing
+        return timedelta(seconds=seconds + shift + jitter)
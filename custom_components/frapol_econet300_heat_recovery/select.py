@@ -7,10 +7,18 @@ from typing import TYPE_CHECKING, Callable
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.core import callback
-
-from .const import API_REG_PARAM_CURRENT_MAIN_MODE, API_REG_PARAM_CURRENT_MAIN_MODE_MAPPING_VALUE_TO_NAME, API_REG_PARAM_CURRENT_TEMP_MODE_MAPPING_VALUE_TO_NAME, API_REG_PARAM_CURRENT_TEMPORARY_MODE, LOGGER
-
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    API_REG_PARAM_CURRENT_MAIN_MODE,
+    API_REG_PARAM_CURRENT_MAIN_MODE_MAPPING_VALUE_TO_NAME,
+    API_REG_PARAM_CURRENT_TEMP_MODE_MAPPING_VALUE_TO_NAME,
+    API_REG_PARAM_CURRENT_TEMPORARY_MODE,
+    LOGGER,
+    SIGNAL_METADATA_LOADED,
+)
 from .entity import FrapolEconet300Entity
+from .model import param_accessor
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -18,6 +26,7 @@ if TYPE_CHECKING:
 
     from .coordinator import FrapolEconet300DataUpdateCoordinator
     from .data import FrapolEconet300ConfigEntry
+    from .model import FrapolEconet300Snapshot
 
 
 @dataclass
@@ -25,7 +34,7 @@ class FrapolEconet300SelectData:
     name: str
     api_param_name: str
     value_to_name_mapping: dict[int, str]
-    value_extractor: Callable[[dict], str | None]
+    value_extractor: Callable[[FrapolEconet300Snapshot], int | None]
     id_suffix: str
 
 
@@ -34,14 +43,14 @@ SELECTS: list[FrapolEconet300SelectData] = (
         name="Main mode",
         api_param_name=API_REG_PARAM_CURRENT_MAIN_MODE,
         value_to_name_mapping=API_REG_PARAM_CURRENT_MAIN_MODE_MAPPING_VALUE_TO_NAME,
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_MAIN_MODE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_MAIN_MODE),
         id_suffix="main_mode"
     ),
     FrapolEconet300SelectData(
         name="Temporary mode",
         api_param_name=API_REG_PARAM_CURRENT_TEMPORARY_MODE,
         value_to_name_mapping=API_REG_PARAM_CURRENT_TEMP_MODE_MAPPING_VALUE_TO_NAME,
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_TEMPORARY_MODE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_TEMPORARY_MODE),
         id_suffix="temp_mode"
     )
 )
@@ -71,21 +80,62 @@ class FrapolEconet300Select(FrapolEconet300Entity, SelectEntity):
         select_data: FrapolEconet300SelectData,
     ) -> None:
         """Initialize the select class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, listened_keys=(select_data.api_param_name,))
         self._select_data = select_data
-        self._name_to_value_mapping: dict[str, int] = dict((v, k) for k, v in self._select_data.value_to_name_mapping.items())
+        self._name_to_value_mapping = self._allowed_options()
         self._attr_has_entity_name = True
         self._attr_name = select_data.name
         self._attr_options = list(self._name_to_value_mapping.keys())
         current_value = self._select_data.value_extractor(self.coordinator.data)
         self._attr_current_option = self._select_data.value_to_name_mapping.get(current_value, "Unknown")
         self._attr_translation_key = self._select_data.id_suffix
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-{select_data.id_suffix}"
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Narrow down options once metadata loads, if it did not before setup."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_METADATA_LOADED.format(self.coordinator.config_entry.entry_id),
+                self._async_metadata_loaded,
+            )
+        )
+
+    def _allowed_options(self) -> dict[str, int]:
+        """Return values by option name, only allowed ones if the device says so."""
+        name_to_value_mapping = {
+            name: value
+            for value, name in self._select_data.value_to_name_mapping.items()
+        }
+        metadata = self.coordinator.config_entry.runtime_data.metadata
+        param_metadata = (
+            metadata.get(self._select_data.api_param_name)
+            if metadata is not None
+            else None
+        )
+        if param_metadata is None or param_metadata.options is None:
+            return name_to_value_mapping
+        return {
+            name: value
+            for name, value in name_to_value_mapping.items()
+            if value in param_metadata.options
+        } or name_to_value_mapping
+
+    @callback
+    def _async_metadata_loaded(self) -> None:
+        self._name_to_value_mapping = self._allowed_options()
+        self._attr_options = list(self._name_to_value_mapping.keys())
+        self.async_write_ha_state()
 
     async def async_select_option(self, option: str) -> None:
-        self._attr_current_option = option
+        """Change the selected option, the snapshot is updated optimistically."""
         value = self._name_to_value_mapping[option]
-        await self.coordinator.config_entry.runtime_data.client.set_param(self._select_data.api_param_name, str(value))
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.config_entry.runtime_data.writer.async_write(
+            self._select_data.api_param_name, value
+        )
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -93,8 +143,3 @@ class FrapolEconet300Select(FrapolEconet300Entity, SelectEntity):
         value = self._select_data.value_extractor(self.coordinator.data)
         self._attr_current_option = self._select_data.value_to_name_mapping.get(value, "Unknown")
         self.async_write_ha_state()
-
-    @property
-    def unique_id(self) -> str:
-        uid = self.coordinator.data.get("sysParams").get("uid")
-        return f"frapol-econet300-{uid}-{self._select_data.id_suffix}"
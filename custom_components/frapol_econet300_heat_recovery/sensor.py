@@ -2,32 +2,95 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable
+import functools
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorDeviceClass, SensorStateClass
-
-from .const import API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE, API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED, API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE, API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE, API_REG_PARAM_CURRENT_LEADING_TEMPERATURE, API_REG_PARAM_CURRENT_SET_TEMPERATURE, API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED, API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE, LOGGER
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfTemperature,
+)
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later, async_track_point_in_utc_time
+from homeassistant.helpers.restore_state import ExtraStoredData
+from homeassistant.util import dt as dt_util
 
+from .aggregation import (
+    FrapolEconet300TimeWeightedWindow,
+    FrapolEconet300WindowResult,
+    window_end,
+)
+from .catalogue import discover_sensors, unit_is_valid
+from .const import (
+    API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_LEADING_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SET_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+    API_REG_PARAMS_ENDPOINT,
+    CONF_AGGREGATION_WINDOWS,
+    CONF_AIRFLOW_CURVE,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_SENSOR_FILTERS,
+    COORDINATOR_DERIVED_KEY,
+    COORDINATOR_DIAGNOSTICS_KEY,
+    COORDINATOR_METRICS_KEY,
+    DEFAULT_AGGREGATION_WINDOWS,
+    DEFAULT_AIRFLOW_CURVE,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    ENERGY_MAX_GAP_POLLS,
+    LOGGER,
+    SIGNAL_METADATA_LOADED,
+)
+from .energy import (
+    ENERGY_INPUT_PARAMS,
+    FrapolEconet300AirflowCurve,
+    FrapolEconet300EnergyAccumulator,
+    recovered_power,
+)
 from .entity import FrapolEconet300Entity
+from .filters import FrapolEconet300FilterConfig, FrapolEconet300SensorFilter
+from .model import param_accessor
+from .select import SELECTS
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import FrapolEconet300DataUpdateCoordinator
     from .data import FrapolEconet300ConfigEntry
+    from .derived import FrapolEconet300DerivedValues
+    from .model import FrapolEconet300Snapshot
 
 
 @dataclass
 class FrapolEconet300SensorData:
+    api_param_name: str
     description: SensorEntityDescription
-    value_extractor: Callable[[dict], str | None]
+    value_extractor: Callable[[FrapolEconet300Snapshot], Any]
     id_suffix: str
 
 
 SENSORS: list[FrapolEconet300SensorData] = (
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_supply_fan_speed",
             translation_key="supply_fan_speed",
@@ -35,10 +98,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             native_unit_of_measurement="%",
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED),
         id_suffix="supply_fan_speed"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_extract_fan_speed",
             translation_key="extract_fan_speed",
@@ -46,10 +110,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             native_unit_of_measurement="%",
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED),
         id_suffix="extract_fan_speed"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_LEADING_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_leading_temperature",
             translation_key="leading_temperature",
@@ -58,10 +123,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_LEADING_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_LEADING_TEMPERATURE),
         id_suffix="leading_temperature"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_SET_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_set_temperature",
             translation_key="set_temperature",
@@ -70,10 +136,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_SET_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_SET_TEMPERATURE),
         id_suffix="set_temperature"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_supply_temperature",
             translation_key="supply_temperature",
@@ -82,10 +149,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE),
         id_suffix="supply_temperature"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_intake_temperature",
             translation_key="intake_temperature",
@@ -94,10 +162,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE),
         id_suffix="intake_temperature"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_extract_temperature",
             translation_key="extract_emperature",
@@ -106,10 +175,11 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE),
         id_suffix="extract_temperature"
     ),
     FrapolEconet300SensorData(
+        api_param_name=API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE,
         description=SensorEntityDescription(
             key="frapol_econet300_heat_exhaust_temperature",
             translation_key="exhaust_temperature",
@@ -118,24 +188,351 @@ SENSORS: list[FrapolEconet300SensorData] = (
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT
         ),
-        value_extractor=lambda data: data.get("regParams").get("curr").get(API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE),
+        value_extractor=param_accessor(API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE),
         id_suffix="exhaust_temperature"
     )
 )
 
 
+@dataclass
+class FrapolEconet300DiagnosticSensorData:
+    """Sensor of the integration's own state, read off the coordinator."""
+
+    description: SensorEntityDescription
+    value_extractor: Callable[[FrapolEconet300DataUpdateCoordinator], Any]
+    id_suffix: str
+    listened_key: str = COORDINATOR_DIAGNOSTICS_KEY
+
+
+DIAGNOSTIC_SENSORS: list[FrapolEconet300DiagnosticSensorData] = (
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_update_interval",
+            translation_key="update_interval",
+            icon="mdi:timer-sync-outline",
+            native_unit_of_measurement="s",
+            device_class=SensorDeviceClass.DURATION,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        ),
+        value_extractor=lambda coordinator: (
+            coordinator.adaptive_interval.interval.total_seconds()
+        ),
+        id_suffix="update_interval",
+    ),
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_request_latency",
+            translation_key="request_latency",
+            icon="mdi:timer-outline",
+            native_unit_of_measurement="s",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda coordinator: (
+            coordinator.config_entry.runtime_data.client.latency_tracker.percentile(
+                API_REG_PARAMS_ENDPOINT, 0.95
+            )
+        ),
+        id_suffix="request_latency",
+        listened_key=COORDINATOR_METRICS_KEY,
+    ),
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_update_duration",
+            translation_key="update_duration",
+            icon="mdi:timer-cog-outline",
+            native_unit_of_measurement="s",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda coordinator: coordinator.metrics.updates.last_duration,
+        id_suffix="update_duration",
+        listened_key=COORDINATOR_METRICS_KEY,
+    ),
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_request_errors",
+            translation_key="request_errors",
+            icon="mdi:alert-circle-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda coordinator: coordinator.metrics.total_errors,
+        id_suffix="request_errors",
+        listened_key=COORDINATOR_METRICS_KEY,
+    ),
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_request_retries",
+            translation_key="request_retries",
+            icon="mdi:refresh",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda coordinator: coordinator.metrics.total_retries,
+        id_suffix="request_retries",
+        listened_key=COORDINATOR_METRICS_KEY,
+    ),
+    FrapolEconet300DiagnosticSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_state_writes",
+            translation_key="state_writes",
+            icon="mdi:database-edit-outline",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda coordinator: (
+            coordinator.metrics.updates.last_state_writes
+        ),
+        id_suffix="state_writes",
+        listened_key=COORDINATOR_METRICS_KEY,
+    ),
+)
+
+
+@dataclass
+class FrapolEconet300DerivedSensorData:
+    """Sensor of a value derived from recent regParams values."""
+
+    description: SensorEntityDescription
+    value_extractor: Callable[[FrapolEconet300DerivedValues], Any]
+    id_suffix: str
+
+
+DERIVED_SENSORS: list[FrapolEconet300DerivedSensorData] = (
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_recovery_efficiency",
+            translation_key="recovery_efficiency",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=PERCENTAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        value_extractor=lambda values: values.efficiency,
+        id_suffix="recovery_efficiency",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_rolling_recovery_efficiency",
+            translation_key="rolling_recovery_efficiency",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=PERCENTAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        value_extractor=lambda values: values.rolling_efficiency,
+        id_suffix="rolling_recovery_efficiency",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_supply_temperature_trend",
+            translation_key="supply_temperature_trend",
+            icon="mdi:thermometer-chevron-down",
+            native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda values: values.supply_temperature_trend,
+        id_suffix="supply_temperature_trend",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_intake_temperature_trend",
+            translation_key="intake_temperature_trend",
+            icon="mdi:thermometer-chevron-down",
+            native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda values: values.intake_temperature_trend,
+        id_suffix="intake_temperature_trend",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_extract_temperature_trend",
+            translation_key="extract_temperature_trend",
+            icon="mdi:thermometer-chevron-up",
+            native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda values: values.extract_temperature_trend,
+        id_suffix="extract_temperature_trend",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_exhaust_temperature_trend",
+            translation_key="exhaust_temperature_trend",
+            icon="mdi:thermometer-chevron-up",
+            native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+        ),
+        value_extractor=lambda values: values.exhaust_temperature_trend,
+        id_suffix="exhaust_temperature_trend",
+    ),
+    FrapolEconet300DerivedSensorData(
+        description=SensorEntityDescription(
+            key="frapol_econet300_heat_fan_balance",
+            translation_key="fan_balance",
+            icon="mdi:scale-balance",
+            native_unit_of_measurement=PERCENTAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        value_extractor=lambda values: values.fan_balance,
+        id_suffix="fan_balance",
+    ),
+)
+
+
+def reg_params_sensors(
+    entry: FrapolEconet300ConfigEntry,
+) -> list[FrapolEconet300SensorData]:
+    """Return hand-written sensors followed by those discovered from the device."""
+    return [*SENSORS, *discovered_sensors(entry)]
+
+
+def discovered_sensors(
+    entry: FrapolEconet300ConfigEntry,
+) -> list[FrapolEconet300SensorData]:
+    """Return sensors of params described by the device, without hand-written ones."""
+    known_params = {sensor_data.api_param_name for sensor_data in SENSORS}
+    known_params.update(select_data.api_param_name for select_data in SELECTS)
+    metadata = (
+        entry.runtime_data.metadata
+        if getattr(entry, "runtime_data", None) is not None
+        else None
+    )
+    return [
+        FrapolEconet300SensorData(
+            api_param_name=discovered.api_param_name,
+            description=discovered.description,
+            value_extractor=param_accessor(discovered.api_param_name),
+            id_suffix=discovered.id_suffix,
+        )
+        for discovered in discover_sensors(metadata, exclude=known_params)
+    ]
+
+
+def reported_unit(
+    coordinator: FrapolEconet300DataUpdateCoordinator,
+    param_name: str,
+    device_class: SensorDeviceClass | None,
+) -> str | None:
+    """
+    Return unit of a param from editParams metadata.
+
+    None if it is unknown or not valid for the device class.
+    """
+    metadata = coordinator.config_entry.runtime_data.metadata
+    unit = metadata.unit(param_name) if metadata is not None else None
+    if not unit:
+        return None
+    if not unit_is_valid(unit, device_class):
+        _log_invalid_unit(param_name, unit, device_class)
+        return None
+    return unit
+
+
+@functools.cache
+def _log_invalid_unit(
+    param_name: str, unit: str, device_class: SensorDeviceClass
+) -> None:
+    """Log a unit ignored for a param, once per param and unit."""
+    LOGGER.debug(
+        "Ignoring unit %s reported for %s, not valid for device class %s",
+        unit,
+        param_name,
+        device_class,
+    )
+
+
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: FrapolEconet300ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    filters = entry.options.get(CONF_SENSOR_FILTERS, {})
+
+    aggregation_windows = entry.options.get(
+        CONF_AGGREGATION_WINDOWS, DEFAULT_AGGREGATION_WINDOWS
+    )
+
+    @callback
+    def async_add_sensors(sensors: list[FrapolEconet300SensorData]) -> None:
+        async_add_entities(
+            FrapolEconet300Sensor(
+                coordinator=entry.runtime_data.coordinator,
+                sensor_data=sensor_data,
+                filter_config=(
+                    FrapolEconet300FilterConfig.from_options(
+                        filters[sensor_data.id_suffix]
+                    )
+                    if sensor_data.id_suffix in filters
+                    else None
+                ),
+            )
+            for sensor_data in sensors
+        )
+        # A mean is of no use for totals, e.g. energy counters, or for text
+        async_add_entities(
+            FrapolEconet300AggregateSensor(
+                coordinator=entry.runtime_data.coordinator,
+                sensor_data=sensor_data,
+                window_minutes=window_minutes,
+            )
+            for sensor_data in sensors
+            if sensor_data.description.state_class is SensorStateClass.MEASUREMENT
+            for window_minutes in aggregation_windows
+        )
+
+    @callback
+    def async_add_discovered_sensors() -> None:
+        async_add_sensors(discovered_sensors(entry))
+
+    async_add_sensors(reg_params_sensors(entry))
+    # Started from the snapshot, discovered params are known once metadata loads
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_METADATA_LOADED.format(entry.entry_id),
+            async_add_discovered_sensors,
+        )
+    )
     async_add_entities(
-        FrapolEconet300Sensor(
+        FrapolEconet300DerivedSensor(
             coordinator=entry.runtime_data.coordinator,
             sensor_data=sensor_data,
         )
-        for sensor_data in SENSORS
+        for sensor_data in DERIVED_SENSORS
+    )
+    async_add_entities(
+        FrapolEconet300DiagnosticSensor(
+            coordinator=entry.runtime_data.coordinator,
+            sensor_data=sensor_data,
+        )
+        for sensor_data in DIAGNOSTIC_SENSORS
+    )
+    async_add_entities(
+        [
+            FrapolEconet300RecoveredEnergySensor(
+                coordinator=entry.runtime_data.coordinator,
+                airflow_curve=FrapolEconet300AirflowCurve.parse(
+                    entry.options.get(CONF_AIRFLOW_CURVE, DEFAULT_AIRFLOW_CURVE),
+                ),
+                max_gap=ENERGY_MAX_GAP_POLLS
+                * entry.options.get(
+                    CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                ),
+            ),
+        ],
     )
 
 
@@ -146,19 +543,373 @@ class FrapolEconet300Sensor(FrapolEconet300Entity, SensorEntity):
         self,
         coordinator: FrapolEconet300DataUpdateCoordinator,
         sensor_data: FrapolEconet300SensorData,
+        filter_config: FrapolEconet300FilterConfig | None = None,
     ) -> None:
-        """Initialize the sensor class."""
-        super().__init__(coordinator)
+        """Initialize the sensor class, filtering published states if configured."""
+        super().__init__(coordinator, listened_keys=(sensor_data.api_param_name,))
         self.entity_description = sensor_data.description
         self._sensor_data = sensor_data
         self._attr_translation_key = self._sensor_data.id_suffix
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-{sensor_data.id_suffix}"
+        )
+        self._filter = (
+            FrapolEconet300SensorFilter(filter_config)
+            if filter_config is not None and not filter_config.is_passthrough
+            else None
+        )
+        self._published_available: bool | None = None
+        self._cancel_flush: CALLBACK_TYPE | None = None
+        self._resample_at: float | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start filtering from the current value."""
+        if self._filter is not None:
+            self._filter.process(
+                self._sensor_data.value_extractor(self.coordinator.data),
+                time.monotonic(),
+            )
+            self._published_available = self.available
+            self.async_on_remove(self._async_cancel_flush)
+        await super().async_added_to_hass()
 
     @property
     def native_value(self) -> str | None:
-        """Return the native value of the sensor."""
+        """Return the native value of the sensor, the last published one if filtered."""
+        if self._filter is not None:
+            return self._filter.value
         return self._sensor_data.value_extractor(self.coordinator.data)
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data, writing state only if the filter lets it through."""
+        if self._filter is None:
+            super()._handle_coordinator_update()
+            return
+
+        published = self._filter.process(
+            self._sensor_data.value_extractor(self.coordinator.data), time.monotonic()
+        )
+        if published or self.available != self._published_available:
+            self._published_available = self.available
+            self.async_write_ha_state()
+        self._resample_at = None
+        self._async_schedule_flush()
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Re-check a held-back value once the filter allows publishing it."""
+        self._async_cancel_flush()
+        interval = self.coordinator.update_interval
+        if not self._filter.settling or interval is None:
+            self._resample_at = None
+        elif self._resample_at is None:
+            # Polls which do not change the value notify no listeners, smoothing
+            # would never catch up with it if not fed the value again meanwhile
+            self._resample_at = time.monotonic() + interval.total_seconds()
+
+        deadline = self._filter.deadline()
+        resample = self._resample_at is not None and (
+            deadline is None or self._resample_at <= deadline
+        )
+        if resample:
+            deadline = self._resample_at
+        if deadline is not None:
+            self._cancel_flush = async_call_later(
+                self.hass,
+                max(0.0, deadline - time.monotonic()),
+                functools.partial(self._async_flush, resample=resample),
+            )
+
+    @callback
+    def _async_flush(self, _now: datetime, *, resample: bool) -> None:
+        self._cancel_flush = None
+        if resample:
+            self._resample_at = None
+            published = self._filter.resample(time.monotonic())
+        else:
+            published = self._filter.flush(time.monotonic())
+        if published:
+            self.async_write_ha_state()
+        self._async_schedule_flush()
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit reported by the device, or the one from the description."""
+        unit = reported_unit(
+            self.coordinator, self._sensor_data.api_param_name, self.device_class
+        )
+        return unit or super().native_unit_of_measurement
+
+
+class FrapolEconet300AggregateSensor(FrapolEconet300Entity, SensorEntity):
+    """
+    frapol_econet300_heat_recovery Sensor class publishing a windowed mean of a value.
+
+    The time-weighted mean is published once per window. Min, max and number of samples
+    of the window are exposed as attributes. The raw sensor can then be excluded from
+    the recorder, while the history keeps a cheap summary.
+    """
+
+    def __init__(
+        self,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+        sensor_data: FrapolEconet300SensorData,
+        window_minutes: int,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, listened_keys=(sensor_data.api_param_name,))
+        self._sensor_data = sensor_data
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-"
+            f"{sensor_data.id_suffix}_mean_{window_minutes}m"
+        )
+        # Discovered params have no translated name, theirs is passed as a placeholder
+        if sensor_data.description.translation_key is None:
+            translation_key = "param_mean"
+            self._attr_translation_placeholders = {
+                "param": str(sensor_data.description.name),
+                "window": str(window_minutes),
+            }
+        else:
+            translation_key = f"{sensor_data.id_suffix}_mean"
+            self._attr_translation_placeholders = {"window": str(window_minutes)}
+        self.entity_description = replace(
+            sensor_data.description,
+            key=f"{sensor_data.description.key}_mean_{window_minutes}m",
+            translation_key=translation_key,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+        )
+        self._attr_has_entity_name = True
+        self._window_seconds = window_minutes * 60
+        self._window = FrapolEconet300TimeWeightedWindow()
+        self._result: FrapolEconet300WindowResult | None = None
+        self._published_available: bool | None = None
+        self._cancel_window_end: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start aggregating from the current value."""
+        await super().async_added_to_hass()
+        self._published_available = self.available
+        self._window.add(self._current_value(), time.time())
+        self.async_on_remove(self._async_cancel_window_end)
+        self._async_schedule_window_end()
+
+    def _current_value(self) -> float | None:
+        if not self.coordinator.last_update_success:
+            return None
+        value = self._sensor_data.value_extractor(self.coordinator.data)
+        return (
+            value
+            if isinstance(value, int | float) and not isinstance(value, bool)
+            else None
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Feed the changed value into the window, state is written once it ends."""
+        self._window.add(self._current_value(), time.time())
+        if self.available != self._published_available:
+            self._published_available = self.available
+            self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_window_end(self) -> None:
+        self._async_cancel_window_end()
+        end = dt_util.utc_from_timestamp(window_end(time.time(), self._window_seconds))
+        self._cancel_window_end = async_track_point_in_utc_time(
+            self.hass, self._async_window_ended, end
+        )
+
+    @callback
+    def _async_window_ended(self, now: datetime) -> None:
+        self._cancel_window_end = None
+        self._result = self._window.close(now.timestamp())
+        self.async_write_ha_state()
+        self._async_schedule_window_end()
+
+    @callback
+    def _async_cancel_window_end(self) -> None:
+        if self._cancel_window_end is not None:
+            self._cancel_window_end()
+            self._cancel_window_end = None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return time-weighted mean of the last closed window."""
+        return round(self._result.mean, 2) if self._result is not None else None
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return unit of the aggregated value."""
+        unit = reported_unit(
+            self.coordinator, self._sensor_data.api_param_name, self.device_class
+        )
+        return unit or super().native_unit_of_measurement
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return min, max and number of samples of the last closed window."""
+        attributes = super().extra_state_attributes or {}
+        if self._result is not None:
+            attributes = {
+                **attributes,
+                "min": self._result.min,
+                "max": self._result.max,
+                "samples": self._result.samples,
+            }
+        return attributes or None
+
+
+class FrapolEconet300DiagnosticSensor(FrapolEconet300Entity, SensorEntity):
+    """frapol_econet300_heat_recovery Sensor class about the integration itself."""
+
+    def __init__(
+        self,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+        sensor_data: FrapolEconet300DiagnosticSensorData,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, listened_keys=(sensor_data.listened_key,))
+        self.entity_description = sensor_data.description
+        self._sensor_data = sensor_data
+        self._attr_translation_key = self._sensor_data.id_suffix
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-{sensor_data.id_suffix}"
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the native value of the sensor."""
+        return self._sensor_data.value_extractor(self.coordinator)
+
+
+class FrapolEconet300DerivedSensor(FrapolEconet300Entity, SensorEntity):
+    """frapol_econet300_heat_recovery Sensor class showing derived values."""
+
+    def __init__(
+        self,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+        sensor_data: FrapolEconet300DerivedSensorData,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, listened_keys=(COORDINATOR_DERIVED_KEY,))
+        self.entity_description = sensor_data.description
+        self._sensor_data = sensor_data
+        self._attr_translation_key = self._sensor_data.id_suffix
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-{sensor_data.id_suffix}"
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the native value of the sensor."""
+        return self._sensor_data.value_extractor(self.coordinator.derived.values)
+
+
+@dataclass
+class FrapolEconet300EnergyStoredData(ExtraStoredData):
+    """Accumulated energy persisted across restarts."""
+
+    accumulator: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        return self.accumulator
+
+
+class FrapolEconet300RecoveredEnergySensor(FrapolEconet300Entity, RestoreSensor):
+    """
+    frapol_econet300_heat_recovery Sensor class counting recovered heat.
+
+    Recovered power is integrated at each coordinator update, so the total is kept up to
+    date at a constant cost per update and survives restarts. The state is only written
+    when the published kWh value changes, current power is exposed as an attribute.
+    """
+
+    _attr_translation_key = "recovered_energy"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 2
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+        airflow_curve: FrapolEconet300AirflowCurve,
+        max_gap: float,
+    ) -> None:
+        """Initialize the sensor class."""
+        # Listening to metrics, called after every update, also when no input changed
+        super().__init__(
+            coordinator, listened_keys=(*ENERGY_INPUT_PARAMS, COORDINATOR_METRICS_KEY)
+        )
+        self._attr_unique_id = (
+            f"frapol-econet300-{coordinator.data.uid}-recovered_energy"
+        )
+        self._airflow_curve = airflow_curve
+        self._accumulator = FrapolEconet300EnergyAccumulator(max_gap)
+        self._published: tuple[float, bool] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Continue from the restored total."""
+        await super().async_added_to_hass()
+        if (stored := await self.async_get_last_extra_data()) is not None:
+            try:
+                self._accumulator = FrapolEconet300EnergyAccumulator.from_dict(
+                    stored.as_dict(),
+                    self._accumulator.max_gap,
+                )
+            except (KeyError, TypeError, ValueError):
+                LOGGER.warning(
+                    "Ignoring malformed stored recovered energy: %s", stored.as_dict()
+                )
+        self._accumulator.add(time.time(), self._current_power())
+        self._published = (self.native_value, self.available)
+
+    def _current_power(self) -> float | None:
+        if not self.coordinator.last_update_success or self.coordinator.stale:
+            return None
+        data = self.coordinator.data
+        return recovered_power(
+            data.get(API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE),
+            data.get(API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE),
+            data.get(API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE),
+            data.get(API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED),
+            self._airflow_curve,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Count energy since the previous update, writing state only if it changed."""
+        self._accumulator.add(time.time(), self._current_power())
+        published = (self.native_value, self.available)
+        if published != self._published:
+            self._published = published
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float:
+        """Return recovered energy in kWh."""
+        return round(self._accumulator.total, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return recovered power in W, as of the last update."""
+        attributes = super().extra_state_attributes or {}
+        if self._accumulator.last_power is not None:
+            attributes = {**attributes, "power": round(self._accumulator.last_power)}
+        return attributes or None
+
     @property
-    def unique_id(self) -> str:
-        uid = self.coordinator.data.get("sysParams").get("uid")
-        return f"frapol-econet300-{uid}-{self._sensor_data.id_suffix}"
+    def extra_restore_state_data(self) -> FrapolEconet300EnergyStoredData:
+        """Return accumulated energy to be restored after a restart."""
+        return FrapolEconet300EnergyStoredData(self._accumulator.as_dict())
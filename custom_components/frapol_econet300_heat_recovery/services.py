@@ -0,0 +1,121 @@
+"""Services of frapol_econet300_heat_recovery."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_PARAMS,
+    ATTR_PROFILE,
+    DOMAIN,
+    LOGGER,
+    SERVICE_APPLY_PROFILE,
+    SERVICE_SAVE_PROFILE,
+)
+
+if TYPE_CHECKING:
+    from .data import FrapolEconet300ConfigEntry
+
+_PARAMS_SCHEMA = vol.Schema({cv.string: vol.Any(bool, int, float, cv.string)})
+
+APPLY_PROFILE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_PROFILE): cv.string,
+            vol.Optional(ATTR_PARAMS): _PARAMS_SCHEMA,
+        },
+    ),
+    cv.has_at_least_one_key(ATTR_PROFILE, ATTR_PARAMS),
+)
+
+SAVE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PROFILE): cv.string,
+        vol.Required(ATTR_PARAMS): vol.All(_PARAMS_SCHEMA, vol.Length(min=1)),
+    },
+)
+
+
+def _get_entry(hass: HomeAssistant, call: ServiceCall) -> FrapolEconet300ConfigEntry:
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": call.data[ATTR_CONFIG_ENTRY_ID]},
+        )
+    return entry
+
+
+async def _async_apply_profile(call: ServiceCall) -> ServiceResponse:
+    """
+    Write params of a stored profile, overridden by params given in the call.
+
+    Report status of each param.
+    """
+    entry = _get_entry(call.hass, call)
+    runtime_data = entry.runtime_data
+    params: dict[str, Any] = {}
+    if ATTR_PROFILE in call.data:
+        profile = runtime_data.profiles.get(call.data[ATTR_PROFILE])
+        if profile is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unknown_profile",
+                translation_placeholders={"profile": call.data[ATTR_PROFILE]},
+            )
+        params.update(profile)
+    params.update(call.data.get(ATTR_PARAMS, {}))
+
+    statuses = await runtime_data.writer.async_write_many(params, runtime_data.metadata)
+    LOGGER.info(
+        "Profile %s applied - %s", call.data.get(ATTR_PROFILE, "(inline)"), statuses
+    )
+    return {
+        "params": {param_name: str(status) for param_name, status in statuses.items()}
+    }
+
+
+async def _async_save_profile(call: ServiceCall) -> None:
+    """Store a profile of the device, replacing one with the same name."""
+    entry = _get_entry(call.hass, call)
+    await entry.runtime_data.profiles.async_save(
+        call.data[ATTR_PROFILE], call.data[ATTR_PARAMS]
+    )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        _async_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_PROFILE,
+        _async_save_profile,
+        schema=SAVE_PROFILE_SCHEMA,
+    )
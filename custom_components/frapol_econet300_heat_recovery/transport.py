@@ -0,0 +1,166 @@
+"""
+Serialized HTTP transport for a single ecoNET300 device.
+
+The embedded web server copes badly with concurrent connections, so every request to a
+device goes through one keep-alive connection, waiting in a priority queue for its turn.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+import aiohttp
+import async_timeout
+
+from .const import (
+    TRANSPORT_DNS_CACHE_TTL,
+    TRANSPORT_KEEPALIVE_TIMEOUT,
+    TRANSPORT_MAX_IN_FLIGHT,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class FrapolEconet300RequestPriority(IntEnum):
+    """Order in which queued requests are sent, lower goes first."""
+
+    WRITE = 0
+    POLL = 1
+    DIAGNOSTIC = 2
+
+
+@dataclass(frozen=True)
+class FrapolEconet300Response:
+    """Fully read response, detached from the connection it came from."""
+
+    status: int
+    reason: str | None
+    body: bytes
+    latency: float
+
+
+class FrapolEconet300Transport:
+    """
+    Send requests to one device over a dedicated, reused connection.
+
+    At most `max_in_flight` requests are sent at once, others wait ordered by priority
+    and then by arrival. A request holding its slot may additionally wait for a
+    `limiter` shared with transports of other devices.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = TRANSPORT_MAX_IN_FLIGHT,
+        dns_cache_ttl: int = TRANSPORT_DNS_CACHE_TTL,
+        keepalive_timeout: float = TRANSPORT_KEEPALIVE_TIMEOUT,
+        limiter: asyncio.Semaphore | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Initialize, using given session instead of a dedicated one if set."""
+        self._limiter = limiter
+        self._shared_session = session
+        self._max_in_flight = max_in_flight
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Return number of requests waiting for their turn."""
+        return len(self._waiters)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._shared_session is not None:
+            return self._shared_session
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._max_in_flight,
+                limit_per_host=self._max_in_flight,
+                use_dns_cache=True,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @asynccontextmanager
+    async def _slot(
+        self, priority: FrapolEconet300RequestPriority
+    ) -> AsyncIterator[None]:
+        if self._in_flight < self._max_in_flight and not self._waiters:
+            self._in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            entry = (priority, next(self._sequence), waiter)
+            heapq.heappush(self._waiters, entry)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                elif not waiter.cancelled():
+                    # The slot was handed over right before cancellation
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Hand the slot over to the next waiting request, or free it."""
+        if self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            waiter.set_result(None)
+        else:
+            self._in_flight -= 1
+
+    async def request(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        *,
+        priority: FrapolEconet300RequestPriority = FrapolEconet300RequestPriority.POLL,
+        request_timeout: float | None = None,
+        auth: aiohttp.BasicAuth | None = None,
+        headers: dict | None = None,
+        json_data: dict | None = None,
+    ) -> FrapolEconet300Response:
+        """Send a request once its turn comes, the timeout only covers the request."""
+        async with self._slot(priority), self._limiter or nullcontext():
+            started_at = time.monotonic()
+            async with (
+                async_timeout.timeout(request_timeout),
+                self._get_session().request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=json_data,
+                    auth=auth,
+                ) as response,
+            ):
+                body = await response.read()
+            return FrapolEconet300Response(
+                status=response.status,
+                reason=response.reason,
+                body=body,
+                latency=time.monotonic() - started_at,
+            )
+
+    async def close(self) -> None:
+        """Close the connection, a shared session is left open for its owner."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
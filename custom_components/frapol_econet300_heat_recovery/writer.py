@@ -0,0 +1,264 @@
+"""Coalescing, optimistic parameter writes for frapol_econet300_heat_recovery."""
+
+from __future__ import annotations
+
+import asyncio
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .api import FrapolEconet300ApiClientError
+from .const import LOGGER, WRITE_DEBOUNCE_COOLDOWN, WRITE_PACING_INTERVAL
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import FrapolEconet300DataUpdateCoordinator
+    from .metadata import FrapolEconet300MetadataStore
+
+
+class FrapolEconet300WriteStatus(StrEnum):
+    """Outcome of writing a single param as part of a batch."""
+
+    UNCHANGED = "unchanged"
+    CONFIRMED = "confirmed"
+    NOT_CONFIRMED = "not_confirmed"
+    FAILED = "failed"
+    UNKNOWN_PARAM = "unknown_param"
+    INVALID_VALUE = "invalid_value"
+
+
+def coerce_value(
+    current: Any,
+    value: Any,
+    metadata: FrapolEconet300MetadataStore | None = None,
+    param_name: str | None = None,
+) -> Any:
+    """Convert a value to the type of the current one, raise ValueError if invalid."""
+    if isinstance(current, bool):
+        if isinstance(value, str):
+            value = value.strip().lower() in ("1", "true", "on")
+        return bool(value)
+    if isinstance(current, int | float) and not isinstance(value, bool):
+        number = float(value)
+        if isinstance(current, int):
+            if not number.is_integer():
+                msg = f"{value} is not an integer"
+                raise ValueError(msg)
+            number = int(number)
+        param = (
+            metadata.get(param_name)
+            if metadata is not None and param_name is not None
+            else None
+        )
+        if param is not None:
+            if (param.min_value is not None and number < param.min_value) or (
+                param.max_value is not None and number > param.max_value
+            ):
+                msg = f"{value} is out of range {param.min_value} - {param.max_value}"
+                raise ValueError(msg)
+            if param.options is not None and number not in param.options:
+                msg = f"{value} is not one of {param.options}"
+                raise ValueError(msg)
+        return number
+    if current is not None and not isinstance(value, type(current)):
+        msg = f"{value!r} is not a {type(current).__name__}"
+        raise ValueError(msg)
+    return value
+
+
+class FrapolEconet300WritePipeline:
+    """
+    Send parameter changes to the device in debounced batches.
+
+    Pending writes are coalesced per parameter (the last value wins) and applied to the
+    coordinator snapshot right away. Once sent, they are confirmed with a single
+    regParams poll - whatever the device reports then replaces the optimistic values.
+
+    Writes are paced, so a batch of them does not overwhelm the device, and batches
+    never interleave - a batch written with `async_write_many` first sends pending
+    debounced writes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: FrapolEconet300DataUpdateCoordinator,
+    ) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._pending: dict[str, Any] = {}
+        # Values confirmed by the device before the first pending write of a param
+        self._confirmed: dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=WRITE_DEBOUNCE_COOLDOWN,
+            immediate=False,
+            function=self._async_flush,
+        )
+
+    async def async_write(self, param_name: str, value: Any) -> None:
+        """Queue a parameter write and apply it to the snapshot optimistically."""
+        current = self._coordinator.get_current_param(param_name)
+        if current == value:
+            LOGGER.debug(
+                "Param: %s already has value: %s, write skipped", param_name, value
+            )
+            return
+
+        self._confirmed.setdefault(param_name, current)
+        self._pending[param_name] = value
+        self._coordinator.async_apply_params({param_name: value})
+        await self._debouncer.async_call()
+
+    async def async_write_many(
+        self,
+        values: dict[str, Any],
+        metadata: FrapolEconet300MetadataStore | None = None,
+    ) -> dict[str, FrapolEconet300WriteStatus]:
+        """
+        Write params which differ from their current values, confirm them with one poll.
+
+        Return status of each param.
+        """
+        async with self._lock:
+            if self._pending:
+                self._debouncer.async_cancel()
+                await self._async_send_pending()
+
+            self._coordinator.written_params = frozenset(values)
+            try:
+                return await self._async_write_batch(values, metadata)
+            finally:
+                self._coordinator.written_params = frozenset()
+
+    async def _async_write_batch(
+        self,
+        values: dict[str, Any],
+        metadata: FrapolEconet300MetadataStore | None,
+    ) -> dict[str, FrapolEconet300WriteStatus]:
+        statuses: dict[str, FrapolEconet300WriteStatus] = {}
+        # Polls only keep params entities listen to, others are read from the device
+        if any(
+            self._coordinator.get_current_param(param_name) is None
+            for param_name in values
+        ):
+            try:
+                await self._coordinator.async_refresh_params()
+            except FrapolEconet300ApiClientError as exception:
+                LOGGER.warning(
+                    "Could not read params before writing them - %s", exception
+                )
+                return dict.fromkeys(values, FrapolEconet300WriteStatus.FAILED)
+
+        writes: dict[str, Any] = {}
+        confirmed: dict[str, Any] = {}
+        for param_name, value in values.items():
+            current = self._coordinator.get_current_param(param_name)
+            if current is None:
+                statuses[param_name] = FrapolEconet300WriteStatus.UNKNOWN_PARAM
+                continue
+            try:
+                coerced = coerce_value(current, value, metadata, param_name)
+            except (TypeError, ValueError) as exception:
+                LOGGER.warning("Param: %s not written - %s", param_name, exception)
+                statuses[param_name] = FrapolEconet300WriteStatus.INVALID_VALUE
+                continue
+            if coerced == current:
+                statuses[param_name] = FrapolEconet300WriteStatus.UNCHANGED
+                continue
+            writes[param_name] = coerced
+            confirmed[param_name] = current
+        if not writes:
+            return statuses
+
+        self._coordinator.async_apply_params(writes)
+        failed = await self._async_send(writes)
+        statuses.update(dict.fromkeys(failed, FrapolEconet300WriteStatus.FAILED))
+        verified = await self._async_verify(
+            writes, {name: confirmed[name] for name in failed}
+        )
+        for param_name in writes.keys() - failed:
+            statuses[param_name] = (
+                FrapolEconet300WriteStatus.CONFIRMED
+                if verified
+                and self._coordinator.get_current_param(param_name)
+                == writes[param_name]
+                else FrapolEconet300WriteStatus.NOT_CONFIRMED
+            )
+        return statuses
+
+    async def _async_flush(self) -> None:
+        async with self._lock:
+            await self._async_send_pending()
+
+    async def _async_send_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        confirmed, self._confirmed = self._confirmed, {}
+        writes = {
+            name: value for name, value in pending.items() if value != confirmed[name]
+        }
+
+        failed = await self._async_send(writes)
+        await self._async_verify(writes, {name: confirmed[name] for name in failed})
+
+    async def _async_send(self, writes: dict[str, Any]) -> set[str]:
+        """Send writes one at a time, pausing between them, return failed ones."""
+        failed: set[str] = set()
+        client = self._coordinator.config_entry.runtime_data.client
+        for number, (param_name, value) in enumerate(writes.items()):
+            if number:
+                await asyncio.sleep(WRITE_PACING_INTERVAL)
+            try:
+                await client.set_param(param_name, str(value))
+            except FrapolEconet300ApiClientError as exception:
+                LOGGER.error(
+                    "Failed to update param: %s to value: %s - %s",
+                    param_name,
+                    value,
+                    exception,
+                )
+                failed.add(param_name)
+        return failed
+
+    async def _async_verify(
+        self, writes: dict[str, Any], roll_back: dict[str, Any]
+    ) -> bool:
+        """Poll the device once to confirm writes, return False if that failed."""
+        try:
+            await self._coordinator.async_refresh_params()
+        except FrapolEconet300ApiClientError as exception:
+            LOGGER.warning("Could not confirm written params - %s", exception)
+            self._async_roll_back(roll_back)
+            return False
+
+        for param_name, value in writes.items():
+            device_value = self._coordinator.get_current_param(param_name)
+            if param_name not in roll_back and device_value != value:
+                LOGGER.warning(
+                    "Param: %s reported as %s by the device after writing %s, "
+                    "value rolled back",
+                    param_name,
+                    device_value,
+                    value,
+                )
+        return True
+
+    @callback
+    def _async_roll_back(self, values: dict[str, Any]) -> None:
+        # Params written again in the meantime are left to the next flush
+        values = {
+            name: value for name, value in values.items() if name not in self._pending
+        }
+        if values:
+            self._coordinator.async_apply_params(values)
+
+    async def async_shutdown(self) -> None:
+        """Send writes which are still pending."""
+        self._debouncer.async_cancel()
+        if self._pending:
+            await self._async_flush()
@@ -0,0 +1 @@
+"""Benchmarks for frapol_econet300_heat_recovery, compared with a stored baseline."""
@@ -0,0 +1,29 @@
+"""Fixtures for benchmarks, which only run with --benchmark or --benchmark-save."""
+
+from collections.abc import Generator
+
+import pytest
+
+from .harness import BenchmarkBaseline
+
+
+@pytest.fixture(autouse=True)
+def _skip_unless_enabled(request) -> None:
+    """Skip benchmarks in regular test runs, they are slow and machine-dependent."""
+    if not (
+        request.config.getoption("--benchmark")
+        or request.config.getoption("--benchmark-save")
+    ):
+        pytest.skip("Benchmarks run with --benchmark")
+
+
+@pytest.fixture(name="benchmark_baseline", scope="session")
+def _benchmark_baseline_fixture(request) -> Generator[BenchmarkBaseline]:
+    """Compare results with the stored baseline, or replace it with --benchmark-save."""
+    save = request.config.getoption("--benchmark-save")
+    baseline = BenchmarkBaseline(
+        threshold=request.config.getoption("--benchmark-threshold"), save=save
+    )
+    yield baseline
+    if save:
+        baseline.write()
@@ -0,0 +1,119 @@
+"""Measure benchmarks and compare them with the stored baseline."""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Results may be this much worse than the baseline, unless a benchmark sets its own
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Measured value, lower is better unless `higher_is_better` is set."""
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    threshold: float | None = None
+
+
+class BenchmarkBaseline:
+    """Record results, failing those which regressed beyond the threshold."""
+
+    def __init__(
+        self,
+        path: Path = BASELINE_PATH,
+        threshold: float = DEFAULT_THRESHOLD,
+        *,
+        save: bool = False,
+    ) -> None:
+        """Load the baseline, if there is one."""
+        self.path = path
+        self.threshold = threshold
+        self.save = save
+        self.baseline: dict[str, dict] = (
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+        self.results: dict[str, BenchmarkResult] = {}
+
+    def record(self, name: str, result: BenchmarkResult) -> None:
+        """
+        Record a result, fail if it has no baseline or regressed.
+
+        Nothing fails while the baseline is being replaced.
+        """
+        self.results[name] = result
+        if self.save:
+            return
+        baseline = self.baseline.get(name)
+        if baseline is None:
+            pytest.fail(f"{name} has no baseline, store one with --benchmark-save")
+
+        # Noisier benchmarks set their own threshold, it may be edited in the baseline
+        threshold = baseline.get("threshold") or result.threshold or self.threshold
+        if result.higher_is_better:
+            limit = baseline["value"] * (1 - threshold)
+            regressed = result.value < limit
+        else:
+            limit = baseline["value"] * (1 + threshold)
+            regressed = result.value > limit
+        if regressed:
+            pytest.fail(
+                f"{name} regressed to {result.value:.4g} {result.unit}, "
+                f"baseline is {baseline['value']:.4g} {result.unit} "
+                f"(threshold {threshold:.0%})",
+            )
+
+    def write(self) -> None:
+        """Store results as the new baseline, keeping entries which did not run."""
+        baseline = dict(self.baseline)
+        for name, result in self.results.items():
+            entry = {
+                key: value for key, value in asdict(result).items() if value is not None
+            }
+            entry["value"] = round(result.value, 3)
+            if threshold := self.baseline.get(name, {}).get("threshold"):
+                entry["threshold"] = threshold
+            baseline[name] = entry
+        self.path.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+
+def median_time(function: Callable[[], object], rounds: int, warmup: int = 3) -> float:
+    """Return median duration of a call in seconds."""
+    for _ in range(warmup):
+        function()
+    durations = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started_at)
+    return statistics.median(durations)
+
+
+async def async_median_time(
+    function: Callable[[], Awaitable[object]], rounds: int, warmup: int = 3
+) -> float:
+    """Return median duration of an awaited call in seconds."""
+    for _ in range(warmup):
+        await function()
+    durations = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await function()
+        durations.append(time.perf_counter() - started_at)
+    return statistics.median(durations)
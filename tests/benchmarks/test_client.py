@@ -0,0 +1,96 @@
+"""Benchmark the API client and snapshots, against the simulated controller."""
+
+import asyncio
+import time
+import tracemalloc
+
+from custom_components.frapol_econet300_heat_recovery.api import (
+    FrapolEconet300ApiClient,
+)
+from custom_components.frapol_econet300_heat_recovery.model import (
+    FrapolEconet300Snapshot,
+)
+from custom_components.frapol_econet300_heat_recovery.transport import (
+    FrapolEconet300Transport,
+)
+from tests.benchmarks.harness import BenchmarkResult, async_median_time
+from tests.simulator import DEFAULT_PASSWORD, DEFAULT_USERNAME, synthetic_reg_params
+
+CONCURRENT_CLIENTS = 10
+REFRESHES_PER_CLIENT = 20
+SYNTHETIC_PARAMS = 500
+SNAPSHOTS = 1000
+
+
+async def test_refresh_state_latency(simulator_client, benchmark_baseline):
+    """Median end-to-end time of a forced regParams refresh, including decoding."""
+    latency = await async_median_time(
+        lambda: simulator_client.refresh_state(force_tiers=("regParams",)), rounds=50
+    )
+
+    benchmark_baseline.record(
+        "refresh_state_latency", BenchmarkResult(latency * 1000, "ms", threshold=1.0)
+    )
+
+
+async def test_refresh_state_throughput(simulator, benchmark_baseline):
+    """Refreshes per second with several clients, each on its own connection."""
+    clients = [
+        FrapolEconet300ApiClient(
+            host=simulator.url,
+            username=DEFAULT_USERNAME,
+            password=DEFAULT_PASSWORD,
+            transport=FrapolEconet300Transport(),
+        )
+        for _ in range(CONCURRENT_CLIENTS)
+    ]
+
+    async def refresh(client) -> None:
+        for _ in range(REFRESHES_PER_CLIENT):
+            await client.refresh_state(force_tiers=("regParams",))
+
+    try:
+        await asyncio.gather(*(client.refresh_state() for client in clients))
+        started_at = time.perf_counter()
+        await asyncio.gather(*(refresh(client) for client in clients))
+        duration = time.perf_counter() - started_at
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+
+    throughput = CONCURRENT_CLIENTS * REFRESHES_PER_CLIENT / duration
+    benchmark_baseline.record(
+        "refresh_state_throughput",
+        BenchmarkResult(
+            throughput, "refreshes/s", higher_is_better=True, threshold=0.5
+        ),
+    )
+
+
+def test_memory_per_snapshot(benchmark_baseline):
+    """Memory held by each snapshot of hundreds of params, one changing per poll."""
+    reg_params = synthetic_reg_params(SYNTHETIC_PARAMS)
+    current = reg_params["curr"]
+    sys_params = {"uid": "UID", "softVer": "1.0"}
+    previous = FrapolEconet300Snapshot.from_tiers(
+        {"regParams": {"curr": dict(current)}, "sysParams": sys_params}
+    )
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        snapshots = []
+        for number in range(SNAPSHOTS):
+            polled = dict(current)
+            polled["SYNTemp0000"] = number
+            previous = FrapolEconet300Snapshot.from_tiers(
+                {"regParams": {"curr": polled}, "sysParams": sys_params}, previous
+            )
+            snapshots.append(previous)
+        # Polled dictionaries are garbage once snapshots are built, not measured
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    benchmark_baseline.record(
+        "snapshot_memory", BenchmarkResult(held / len(snapshots), "bytes")
+    )
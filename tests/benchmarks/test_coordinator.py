@@ -0,0 +1,146 @@
+"""Benchmark the coordinator and entity updates against simulated controllers."""
+
+import asyncio
+import statistics
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    DOMAIN,
+)
+from tests.benchmarks.harness import BenchmarkResult, async_median_time, median_time
+from tests.simulator import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    FrapolEconet300Simulator,
+    load_fixture,
+    synthetic_reg_params,
+)
+
+SYNTHETIC_PARAMS = 500
+CONFIG_ENTRIES = 20
+LAG_PROBE_INTERVAL = 0.01
+LAG_DURATION = 5.0
+
+
+async def _setup_entry(hass, simulator, options=None) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: simulator.url,
+            CONF_USERNAME: DEFAULT_USERNAME,
+            CONF_PASSWORD: DEFAULT_PASSWORD,
+        },
+        options=options or {},
+        unique_id=simulator.sys_params["uid"],
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _fan_out_time(coordinator) -> float:
+    """Return median time of notifying entities of every numeric value changing."""
+    snapshot = coordinator.data
+    changed = snapshot.with_values(
+        {
+            name: value + 1
+            for name, value in snapshot.current_params().items()
+            if isinstance(value, int | float) and not isinstance(value, bool)
+        },
+    )
+    snapshots = [changed, snapshot]
+
+    def update() -> None:
+        coordinator.async_set_updated_data(snapshots[0])
+        snapshots.reverse()
+
+    return median_time(update, rounds=50)
+
+
+async def test_update_data(hass, simulator, benchmark_baseline):
+    """Median cost of a coordinator update, from the request to the new snapshot."""
+    entry = await _setup_entry(hass, simulator)
+    coordinator = entry.runtime_data.coordinator
+
+    duration = await async_median_time(coordinator._async_update_data, rounds=50)
+
+    benchmark_baseline.record("update_data", BenchmarkResult(duration * 1000, "ms"))
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_fan_out_catalogue_entities(hass, simulator, benchmark_baseline):
+    """Time to update entities of hand-written and discovered sensors and selects."""
+    entry = await _setup_entry(hass, simulator)
+
+    duration = _fan_out_time(entry.runtime_data.coordinator)
+
+    benchmark_baseline.record(
+        "fan_out_catalogue", BenchmarkResult(duration * 1000, "ms")
+    )
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_fan_out_synthetic_entities(hass, socket_enabled, benchmark_baseline):
+    """Time to update entities of a device reporting hundreds of visible params."""
+    simulator = FrapolEconet300Simulator(
+        reg_params=synthetic_reg_params(SYNTHETIC_PARAMS)
+    )
+    await simulator.start()
+    try:
+        entry = await _setup_entry(hass, simulator)
+        assert len(hass.states.async_entity_ids("sensor")) > SYNTHETIC_PARAMS
+
+        duration = _fan_out_time(entry.runtime_data.coordinator)
+
+        benchmark_baseline.record(
+            "fan_out_synthetic", BenchmarkResult(duration * 1000, "ms")
+        )
+        await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await simulator.close()
+
+
+async def test_event_loop_lag_with_many_entries(
+    hass, socket_enabled, benchmark_baseline
+):
+    """99th percentile of event loop lag while many config entries poll every second."""
+    simulators = []
+    for number in range(CONFIG_ENTRIES):
+        sys_params = load_fixture("sys_params.json")
+        sys_params["uid"] = f"{sys_params['uid']}{number:02d}"
+        simulators.append(FrapolEconet300Simulator(sys_params=sys_params))
+    await asyncio.gather(*(simulator.start() for simulator in simulators))
+    try:
+        entries = [
+            await _setup_entry(
+                hass,
+                simulator,
+                {CONF_MIN_UPDATE_INTERVAL: 1, CONF_MAX_UPDATE_INTERVAL: 1},
+            )
+            for simulator in simulators
+        ]
+
+        loop = asyncio.get_running_loop()
+        lags = []
+        deadline = loop.time() + LAG_DURATION
+        while loop.time() < deadline:
+            started_at = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            lags.append(loop.time() - started_at - LAG_PROBE_INTERVAL)
+        assert all(
+            simulator.requests["/econet/regParams"] > 1 for simulator in simulators
+        )
+
+        lag = statistics.quantiles(lags, n=100)[98]
+        benchmark_baseline.record(
+            "event_loop_lag_p99", BenchmarkResult(lag * 1000, "ms", threshold=1.0)
+        )
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await asyncio.gather(*(simulator.close() for simulator in simulators))
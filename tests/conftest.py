@@ -16,15 +16,52 @@
 #
 # See here for more info: https://docs.pytest.org/en/latest/fixture.html (note that
 # pytest includes fixtures OOB which you can use as defined on this page)
-from unittest.mock import Mock, patch
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
 
 import pytest
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.frapol_econet300_heat_recovery import IntegrationBlueprintApiClient
+from custom_components.frapol_econet300_heat_recovery.api import (
+    FrapolEconet300ApiClient,
+)
+from custom_components.frapol_econet300_heat_recovery.const import DOMAIN
+from custom_components.frapol_econet300_heat_recovery.resilience import (
+    FrapolEconet300LatencyTracker,
+    FrapolEconet300RetryPolicy,
+)
+from custom_components.frapol_econet300_heat_recovery.transport import (
+    FrapolEconet300Transport,
+)
+
+from .benchmarks.harness import DEFAULT_THRESHOLD as DEFAULT_BENCHMARK_THRESHOLD
+from .simulator import DEFAULT_PASSWORD, DEFAULT_USERNAME, FrapolEconet300Simulator
 
 pytest_plugins = "pytest_homeassistant_custom_component"  # pylint: disable=invalid-name
 
 
+def pytest_addoption(parser) -> None:
+    """Add options of benchmarks in tests/benchmarks."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="run benchmarks, comparing them with the baseline",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="run benchmarks, storing results as the baseline",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=DEFAULT_BENCHMARK_THRESHOLD,
+        help="fraction by which a result may be worse than the baseline, e.g. 0.25",
+    )
+
+
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
 @pytest.fixture(autouse=True)
@@ -46,24 +83,62 @@ def _skip_notifications_fixture() -> None:
         yield
 
 
-# This fixture, when used, will result in calls to async_get_data to return None. To
-# have the call return a value, we would add the `return_value=<VALUE_TO_RETURN>`
-# parameter to the patch call.
-@pytest.fixture(name="bypass_get_data")
-def _bypass_get_data_fixture() -> None:
-    """Skip calls to get data from API."""
-    with patch.object(
-        IntegrationBlueprintApiClient, "async_get_data", side_effect=Mock()
-    ):
-        yield
+# Local stand-in for the controller, tests can inject latency and faults into it.
+# The Home Assistant test plugin only allows sockets to 127.0.0.1 with `socket_enabled`
+@pytest.fixture(name="simulator")
+async def _simulator_fixture(
+    socket_enabled,
+) -> AsyncGenerator[FrapolEconet300Simulator]:
+    """Run a simulated ecoNET300 controller on 127.0.0.1."""
+    simulator = FrapolEconet300Simulator()
+    await simulator.start()
+    yield simulator
+    await simulator.close()
 
 
-# In this fixture, we are forcing calls to async_get_data to raise an Exception. This
-# is useful for exception handling.
-@pytest.fixture(name="error_on_get_data")
-def _error_get_data_fixture() -> None:
-    """Simulate error when retrieving data from API."""
-    with patch.object(
-        IntegrationBlueprintApiClient, "async_get_data", side_effect=Exception
-    ):
-        yield
+# Client of the simulator, with short timeouts and retry delays to keep tests fast
+@pytest.fixture(name="simulator_client")
+async def _simulator_client_fixture(
+    simulator,
+) -> AsyncGenerator[FrapolEconet300ApiClient]:
+    """Create an API client connected to the simulator."""
+    client = FrapolEconet300ApiClient(
+        host=simulator.url,
+        username=DEFAULT_USERNAME,
+        password=DEFAULT_PASSWORD,
+        transport=FrapolEconet300Transport(),
+        retry_policy=FrapolEconet300RetryPolicy(base_delay=0.01, max_delay=0.05),
+        latency_tracker=FrapolEconet300LatencyTracker(min_timeout=0.2, max_timeout=0.5),
+    )
+    yield client
+    await client.close()
+
+
+# Config entry of the simulator, added to Home Assistant but not set up yet
+@pytest.fixture(name="mock_config_entry")
+def _mock_config_entry_fixture(hass, simulator) -> MockConfigEntry:
+    """Add a config entry of the simulated controller."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: simulator.url,
+            CONF_USERNAME: DEFAULT_USERNAME,
+            CONF_PASSWORD: DEFAULT_PASSWORD,
+        },
+        unique_id=simulator.sys_params["uid"],
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+# Config entry set up against the simulator, with all its platforms
+@pytest.fixture(name="config_entry")
+async def _config_entry_fixture(
+    hass, mock_config_entry
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up a config entry of the simulated controller."""
+    entry = mock_config_entry
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,177 @@
+"""Local stand-in for an ecoNET300 controller, with latency and fault injection."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter, deque
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import BasicAuth, web
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "admin"
+
+
+def load_fixture(name: str) -> Any:
+    """Load a JSON fixture."""
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def synthetic_reg_params(count: int) -> dict[str, Any]:
+    """Return the regParams fixture extended with `count` visible temperature params."""
+    reg_params = load_fixture("reg_params.json")
+    for number in range(count):
+        name = f"SYNTemp{number:04d}"
+        reg_params["curr"][name] = 20.0 + number % 10
+        reg_params["currUnits"][name] = reg_params["currUnits"]["REKcurExtTemp"]
+        reg_params["schemaParams"][name] = {
+            "visible": True,
+            "index": len(reg_params["schemaParams"]),
+        }
+    return reg_params
+
+
+class FrapolEconet300Fault(StrEnum):
+    """Faults which can be injected into the next responses."""
+
+    TIMEOUT = "timeout"
+    UNAUTHORIZED = "unauthorized"
+    MALFORMED = "malformed"
+    RESET = "reset"
+
+
+class FrapolEconet300Simulator:
+    """
+    Serve regParams, sysParams, editParams and newParam like a real controller.
+
+    Writes change the served state. Injected faults apply to the next requests in order,
+    recorded regParams payloads are replayed before the live state is served again.
+    """
+
+    def __init__(
+        self,
+        reg_params: dict[str, Any] | None = None,
+        sys_params: dict[str, Any] | None = None,
+        edit_params: dict[str, Any] | None = None,
+        username: str = DEFAULT_USERNAME,
+        password: str = DEFAULT_PASSWORD,
+    ) -> None:
+        """Initialize with fixture payloads unless given."""
+        self.reg_params = (
+            reg_params if reg_params is not None else load_fixture("reg_params.json")
+        )
+        self.sys_params = (
+            sys_params if sys_params is not None else load_fixture("sys_params.json")
+        )
+        self.edit_params = (
+            edit_params if edit_params is not None else load_fixture("edit_params.json")
+        )
+        self.latency = 0.0
+        self.timeout_delay = 30.0
+        self.requests: Counter[str] = Counter()
+        # Set on every request, tests clear it to wait for the next one
+        self.request_received = asyncio.Event()
+        self.writes: list[tuple[str, str]] = []
+        self._auth = BasicAuth(username, password)
+        self._faults: deque[FrapolEconet300Fault] = deque()
+        self._replay: deque[bytes] = deque()
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def inject(self, fault: FrapolEconet300Fault, count: int = 1) -> None:
+        """Make the next `count` requests fail with given fault."""
+        self._faults.extend([fault] * count)
+
+    def replay(self, payloads: Iterable[bytes]) -> None:
+        """Serve recorded regParams bodies, one per request, before the live state."""
+        self._replay.extend(payloads)
+
+    async def start(self) -> str:
+        """Start listening on a free local port, return base URL."""
+        app = web.Application()
+        app.router.add_get("/econet/regParams", self._reg_params)
+        app.router.add_get("/econet/sysParams", self._sys_params)
+        app.router.add_get("/econet/editParams", self._edit_params)
+        app.router.add_get("/econet/newParam", self._new_param)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _respond(self, request: web.Request, body: bytes) -> web.StreamResponse:
+        self.requests[request.path] += 1
+        self.request_received.set()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        fault = self._faults.popleft() if self._faults else None
+        if fault is FrapolEconet300Fault.TIMEOUT:
+            await asyncio.sleep(self.timeout_delay)
+        elif fault is FrapolEconet300Fault.UNAUTHORIZED:
+            return web.Response(status=401, reason="Unauthorized")
+        elif fault is FrapolEconet300Fault.MALFORMED:
+            return web.Response(
+                body=body[: len(body) // 2], content_type="application/json"
+            )
+        elif fault is FrapolEconet300Fault.RESET:
+            request.transport.abort()
+            return web.Response()
+
+        if request.headers.get("Authorization") != self._auth.encode():
+            return web.Response(status=401, reason="Unauthorized")
+        return web.Response(body=body, content_type="application/json")
+
+    async def _reg_params(self, request: web.Request) -> web.StreamResponse:
+        body = (
+            self._replay.popleft()
+            if self._replay
+            else json.dumps(self.reg_params).encode()
+        )
+        return await self._respond(request, body)
+
+    async def _sys_params(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, json.dumps(self.sys_params).encode())
+
+    async def _edit_params(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, json.dumps(self.edit_params).encode())
+
+    async def _new_param(self, request: web.Request) -> web.StreamResponse:
+        name = request.query.get("newParamName", "")
+        value = request.query.get("newParamValue", "")
+        current = self.reg_params["curr"]
+        if name not in current:
+            return await self._respond(
+                request, json.dumps({"result": "Param not found"}).encode()
+            )
+
+        self.writes.append((name, value))
+        if isinstance(current[name], bool):
+            current[name] = value.lower() in ("1", "true")
+        elif isinstance(current[name], int):
+            current[name] = int(value)
+        elif isinstance(current[name], float):
+            current[name] = float(value)
+        else:
+            current[name] = value
+        return await self._respond(
+            request,
+            json.dumps(
+                {"paramName": name, "paramValue": value, "result": "OK"}
+            ).encode(),
+        )
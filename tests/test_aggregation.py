@@ -0,0 +1,56 @@
+"""Test time-bucket aggregation of regParams values."""
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.aggregation import (
+    FrapolEconet300TimeWeightedWindow,
+    window_end,
+)
+
+
+def test_mean_is_weighted_by_how_long_value_was_held():
+    """A value held for most of the window dominates the mean, min and max do not."""
+    window = FrapolEconet300TimeWeightedWindow()
+    window.add(20.0, now=0)
+    window.add(30.0, now=45)
+
+    result = window.close(now=60)
+
+    assert result.mean == pytest.approx(22.5)
+    assert result.min == 20.0
+    assert result.max == 30.0
+    assert result.samples == 2
+
+
+def test_held_value_carries_over_into_next_window():
+    """Unchanged values are not fed again, the next window still accounts for them."""
+    window = FrapolEconet300TimeWeightedWindow()
+    window.add(18.0, now=0)
+    window.close(now=60)
+
+    result = window.close(now=120)
+
+    assert result.mean == 18.0
+    assert result.min == result.max == 18.0
+    assert result.samples == 0
+
+
+def test_gaps_are_left_out_of_the_mean():
+    """Time without a value does not count, a window of only a gap has no result."""
+    window = FrapolEconet300TimeWeightedWindow()
+    window.add(10.0, now=0)
+    window.add(None, now=30)
+    window.add(40.0, now=50)
+
+    assert window.close(now=60).mean == pytest.approx(17.5)
+
+    window.add(None, now=60)
+    assert window.close(now=120) is None
+
+
+def test_windows_are_aligned_to_their_length():
+    """Window ends are multiples of its length, one ending exactly now is over."""
+    assert window_end(0, 60) == 60
+    assert window_end(59.9, 60) == 60
+    assert window_end(60, 60) == 120
+    assert window_end(1_700_000_123, 900) == 1_700_001_000
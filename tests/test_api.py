@@ -0,0 +1,141 @@
+"""Test the API client against the simulated controller."""
+
+import asyncio
+import json
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.api import (
+    FrapolEconet300ApiClientAuthenticationError,
+    FrapolEconet300ApiClientCommunicationError,
+)
+from custom_components.frapol_econet300_heat_recovery.const import (
+    API_REG_PARAM_CURRENT_MAIN_MODE,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+)
+from custom_components.frapol_econet300_heat_recovery.resilience import (
+    FrapolEconet300CircuitBreaker,
+    FrapolEconet300CircuitState,
+)
+
+from .simulator import FrapolEconet300Fault
+
+
+async def test_refresh_state_fetches_projected_tiers(simulator, simulator_client):
+    """Both tiers are fetched at first, regParams limited to the projection."""
+    simulator_client.reg_params_projection = frozenset(
+        {API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE}
+    )
+
+    assert await simulator_client.refresh_state() == {"regParams", "sysParams"}
+
+    data = await simulator_client.get_all_data()
+    assert data["regParams"] == {
+        "curr": {API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE: 19.8}
+    }
+    assert data["sysParams"]["uid"] == simulator.sys_params["uid"]
+    # sysParams is not due again yet, unchanged regParams keeps its identity
+    assert await simulator_client.refresh_state(force_tiers=("regParams",)) == set()
+    assert simulator.requests["/econet/sysParams"] == 1
+
+
+async def test_set_param_changes_device_state(simulator, simulator_client):
+    """Written values are reported by the next poll."""
+    await simulator_client.set_param(API_REG_PARAM_CURRENT_MAIN_MODE, "5")
+    await simulator_client.refresh_state(force_tiers=("regParams",))
+
+    assert (
+        await simulator_client.get_current_reg_param(API_REG_PARAM_CURRENT_MAIN_MODE)
+        == 5
+    )
+    assert simulator.writes == [(API_REG_PARAM_CURRENT_MAIN_MODE, "5")]
+
+
+@pytest.mark.parametrize(
+    "fault",
+    [
+        FrapolEconet300Fault.RESET,
+        FrapolEconet300Fault.MALFORMED,
+        FrapolEconet300Fault.TIMEOUT,
+    ],
+)
+async def test_transient_faults_are_retried(simulator, simulator_client, fault):
+    """A single communication fault is absorbed by a retry of the client or aiohttp."""
+    simulator.timeout_delay = 1.0
+    simulator.inject(fault)
+
+    assert await simulator_client.refresh_state() == {"regParams", "sysParams"}
+    assert (
+        simulator.requests["/econet/regParams"]
+        + simulator.requests["/econet/sysParams"]
+        == 3
+    )
+
+
+async def test_persistent_faults_raise(simulator, simulator_client):
+    """Faults outlasting the retries surface as communication errors."""
+    simulator.inject(FrapolEconet300Fault.MALFORMED, count=3)
+
+    with pytest.raises(FrapolEconet300ApiClientCommunicationError):
+        await simulator_client.get_edit_params()
+
+
+async def test_unauthorized_is_not_retried(simulator, simulator_client):
+    """Authentication errors are raised right away."""
+    simulator.inject(FrapolEconet300Fault.UNAUTHORIZED)
+
+    with pytest.raises(FrapolEconet300ApiClientAuthenticationError):
+        await simulator_client.get_edit_params()
+    assert simulator.requests["/econet/editParams"] == 1
+
+
+async def test_recorded_payloads_are_replayed(simulator, simulator_client):
+    """Recorded regParams bodies are served before the live state."""
+    simulator.replay(
+        [json.dumps({"curr": {API_REG_PARAM_CURRENT_MAIN_MODE: 0}}).encode()]
+    )
+
+    await simulator_client.refresh_state()
+    assert (
+        await simulator_client.get_current_reg_param(API_REG_PARAM_CURRENT_MAIN_MODE)
+        == 0
+    )
+    await simulator_client.refresh_state(force_tiers=("regParams",))
+    assert (
+        await simulator_client.get_current_reg_param(API_REG_PARAM_CURRENT_MAIN_MODE)
+        == 4
+    )
+
+
+async def test_probe_fetches_only_sys_params(simulator, simulator_client):
+    """Validating a device reads uid without downloading regParams."""
+    sys_params = await simulator_client.probe()
+
+    assert sys_params["uid"] == simulator.sys_params["uid"]
+    assert simulator.requests["/econet/sysParams"] == 1
+    assert simulator.requests["/econet/regParams"] == 0
+
+
+async def test_cancelled_probe_does_not_block_circuit(simulator, simulator_client):
+    """A probe cancelled while in flight lets the next request probe again."""
+    simulator_client.circuit_breaker = FrapolEconet300CircuitBreaker(
+        failure_threshold=1, reset_timeout=0
+    )
+    simulator.inject(FrapolEconet300Fault.MALFORMED, count=3)
+    with pytest.raises(FrapolEconet300ApiClientCommunicationError):
+        await simulator_client.get_edit_params()
+    assert (
+        simulator_client.circuit_breaker.state is FrapolEconet300CircuitState.HALF_OPEN
+    )
+
+    simulator.latency = 1.0
+    simulator.request_received.clear()
+    probe = asyncio.create_task(simulator_client.get_edit_params())
+    await simulator.request_received.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    simulator.latency = 0.0
+    assert await simulator_client.get_edit_params() == simulator.edit_params
+    assert simulator_client.circuit_breaker.state is FrapolEconet300CircuitState.CLOSED
@@ -0,0 +1,74 @@
+"""Test discovery of entities from the param catalogue."""
+
+from types import SimpleNamespace
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from custom_components.frapol_econet300_heat_recovery.catalogue import (
+    discover_sensors,
+    unit_is_valid,
+)
+from custom_components.frapol_econet300_heat_recovery.metadata import (
+    FrapolEconet300ParamMetadata,
+)
+from custom_components.frapol_econet300_heat_recovery.sensor import reported_unit
+
+
+class _Metadata:
+    def __init__(self, params) -> None:
+        self._params = params
+
+    def reported_params(self) -> dict[str, FrapolEconet300ParamMetadata]:
+        return self._params
+
+    def unit(self, param_name) -> str | None:
+        return self._params[param_name].unit
+
+
+def test_discover_sensors_infers_device_class_and_default_state():
+    """Units map to device classes, params hidden by the device are disabled."""
+    metadata = _Metadata(
+        {
+            "REKBypassTemp": FrapolEconet300ParamMetadata(
+                unit="°C", visible=True, numeric=True
+            ),
+            "REKCounter": FrapolEconet300ParamMetadata(
+                unit="kWh", visible=False, numeric=True
+            ),
+            "REKcurSupTemp": FrapolEconet300ParamMetadata(
+                unit="°C", visible=True, numeric=True
+            ),
+        },
+    )
+    sensors = {
+        sensor.api_param_name: sensor.description
+        for sensor in discover_sensors(metadata, {"REKcurSupTemp"})
+    }
+
+    assert sensors.keys() == {"REKBypassTemp", "REKCounter"}
+    assert sensors["REKBypassTemp"].device_class is SensorDeviceClass.TEMPERATURE
+    assert sensors["REKBypassTemp"].entity_registry_enabled_default
+    assert sensors["REKCounter"].state_class is SensorStateClass.TOTAL
+    assert not sensors["REKCounter"].entity_registry_enabled_default
+
+
+def test_units_invalid_for_device_class_are_ignored():
+    """A unit reported by the device is used only if the device class accepts it."""
+    assert unit_is_valid("°C", SensorDeviceClass.TEMPERATURE)
+    assert not unit_is_valid("RPM", SensorDeviceClass.TEMPERATURE)
+    assert unit_is_valid("RPM", None)
+
+    metadata = _Metadata(
+        {
+            "REKcurSupTemp": FrapolEconet300ParamMetadata(unit="RPM", numeric=True),
+            "REKcurSupFanSpeed": FrapolEconet300ParamMetadata(unit="RPM", numeric=True),
+        },
+    )
+    coordinator = SimpleNamespace(
+        config_entry=SimpleNamespace(runtime_data=SimpleNamespace(metadata=metadata))
+    )
+    assert (
+        reported_unit(coordinator, "REKcurSupTemp", SensorDeviceClass.TEMPERATURE)
+        is None
+    )
+    assert reported_unit(coordinator, "REKcurSupFanSpeed", None) == "RPM"
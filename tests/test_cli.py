@@ -0,0 +1,102 @@
+"""Test the headless poller of the command line tools."""
+
+import json
+from datetime import timedelta
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.cli import (
+    FrapolEconet300PolledDevice,
+    FrapolEconet300SnapshotStream,
+    load_devices,
+    poll_device,
+)
+from custom_components.frapol_econet300_heat_recovery.scheduler import (
+    FrapolEconet300FleetScheduler,
+)
+
+from .simulator import FrapolEconet300Fault
+
+
+def test_load_devices_with_defaults(tmp_path):
+    """Missing names, passwords and intervals fall back to host and defaults."""
+    path = tmp_path / "devices.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"host": "192.168.1.50", "username": "admin"},
+                {
+                    "name": "attic",
+                    "host": "192.168.1.51",
+                    "username": "admin",
+                    "password": "secret",
+                    "interval": 5,
+                },
+            ],
+        ),
+    )
+
+    first, second = load_devices(path, default_password="default", default_interval=60)
+
+    assert (first.name, first.password, first.interval.total_seconds()) == (
+        "192.168.1.50",
+        "default",
+        60,
+    )
+    assert (second.name, second.password, second.interval.total_seconds()) == (
+        "attic",
+        "secret",
+        5,
+    )
+
+    path.write_text(json.dumps([{"host": "192.168.1.50"}]))
+    with pytest.raises(ValueError, match="#1"):
+        load_devices(path, default_password="", default_interval=60)
+
+
+async def test_poll_streams_changed_values_and_errors(
+    tmp_path, simulator, simulator_client
+):
+    """The first line has all values, later ones only changes, failures errors."""
+    device = FrapolEconet300PolledDevice(
+        name="attic",
+        host=simulator.url,
+        username="admin",
+        password="admin",
+        interval=timedelta(seconds=0.01),
+    )
+    fleet = FrapolEconet300FleetScheduler()
+    fleet.register(device.name)
+    stream = FrapolEconet300SnapshotStream(tmp_path / "snapshots.ndjson")
+    unchanged = json.dumps(simulator.reg_params).encode()
+    simulator.reg_params["curr"]["REKcurSupTemp"] = 21.0
+    simulator.replay([unchanged, unchanged])
+
+    await poll_device(
+        device, simulator_client, fleet, stream, changed_only=True, polls=3
+    )
+    simulator.inject(FrapolEconet300Fault.UNAUTHORIZED)
+    await poll_device(device, simulator_client, fleet, stream, polls=1)
+    stream.close()
+
+    first, changed, error = (
+        json.loads(line) for line in stream.path.read_text().splitlines()
+    )
+    assert first["device"] == "attic"
+    assert first["uid"] == simulator.sys_params["uid"]
+    assert first["values"] == json.loads(unchanged)["curr"]
+    assert changed["changed"] == {"REKcurSupTemp": 21.0}
+    assert error["error"] == "Invalid credentials"
+
+
+def test_stream_rotates_full_file(tmp_path):
+    """Once the file exceeds its size limit, it is rotated before the next line."""
+    stream = FrapolEconet300SnapshotStream(
+        tmp_path / "snapshots.ndjson", max_bytes=1, backups=1
+    )
+    for number in range(3):
+        stream.write({"n": number})
+    stream.close()
+
+    assert json.loads((tmp_path / "snapshots.ndjson").read_text()) == {"n": 2}
+    assert json.loads((tmp_path / "snapshots.ndjson.1").read_text()) == {"n": 1}
@@ -0,0 +1,197 @@
+"""Test the coordinator against the simulated controller."""
+
+from datetime import timedelta
+
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    API_REG_PARAMS_CURRENT_KEY,
+    API_REG_PARAMS_KEY,
+    API_SYS_PARAMS_KEY,
+    API_SYS_PARAMS_REFRESH_INTERVAL,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DOMAIN,
+    EVENT_PARAMS_CHANGED,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from custom_components.frapol_econet300_heat_recovery.resilience import (
+    FrapolEconet300RetryPolicy,
+)
+
+from .simulator import FrapolEconet300Fault
+
+REG_PARAMS = "/econet/regParams"
+SYS_PARAMS = "/econet/sysParams"
+
+
+async def test_poll_fetches_tiers_on_their_own_intervals(
+    freezer, config_entry, simulator
+):
+    """Every poll fetches regParams, sysParams only once their interval elapsed."""
+    coordinator = config_entry.runtime_data.coordinator
+
+    polls = []
+    for _ in range(3):
+        simulator.requests.clear()
+        await coordinator.async_refresh()
+        polls.append(dict(simulator.requests))
+    freezer.tick(API_SYS_PARAMS_REFRESH_INTERVAL)
+    simulator.requests.clear()
+    await coordinator.async_refresh()
+    polls.append(dict(simulator.requests))
+
+    assert polls == [
+        {REG_PARAMS: 1},
+        {REG_PARAMS: 1},
+        {REG_PARAMS: 1},
+        {REG_PARAMS: 1, SYS_PARAMS: 1},
+    ]
+    assert coordinator.last_update_success
+
+
+async def test_only_listeners_of_changed_params_are_notified(
+    hass, config_entry, simulator
+):
+    """Only listeners of changed params are notified, changes fire one event."""
+    coordinator = config_entry.runtime_data.coordinator
+    events = async_capture_events(hass, EVENT_PARAMS_CHANGED)
+    notified = []
+    for param_name in ("REKcurSupTemp", "REKcurExtTemp"):
+        coordinator.async_add_listener(
+            lambda name=param_name: notified.append(name), frozenset({param_name})
+        )
+
+    await coordinator.async_refresh()
+    assert notified == []
+    assert events == []
+
+    simulator.reg_params["curr"]["REKcurSupTemp"] = 20.5
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert notified == ["REKcurSupTemp"]
+    assert [event.data for event in events] == [
+        {"entry_id": config_entry.entry_id, "changed": {"REKcurSupTemp": 20.5}},
+    ]
+
+
+def _store_snapshot(hass_storage, config_entry, simulator, **values: float) -> str:
+    """Persist a snapshot of the simulator state with given values changed."""
+    storage_key = f"{DOMAIN}.snapshot.{config_entry.entry_id}"
+    current = {**simulator.reg_params[API_REG_PARAMS_CURRENT_KEY], **values}
+    hass_storage[storage_key] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "key": storage_key,
+        "data": {
+            API_REG_PARAMS_KEY: {API_REG_PARAMS_CURRENT_KEY: current},
+            API_SYS_PARAMS_KEY: simulator.sys_params,
+        },
+    }
+    return storage_key
+
+
+async def test_entities_start_from_persisted_snapshot(
+    hass, hass_storage, mock_config_entry, simulator
+):
+    """Entities start stale from the persisted snapshot, the first poll replaces it."""
+    storage_key = _store_snapshot(
+        hass_storage, mock_config_entry, simulator, REKcurSupTemp=18.0
+    )
+    # Keeps the first poll running in the background while entities are set up
+    simulator.latency = 0.2
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"frapol-econet300-{simulator.sys_params['uid']}-supply_temperature",
+    )
+    state = hass.states.get(entity_id)
+    assert state.state == "18.0"
+    assert state.attributes["stale"]
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(entity_id)
+    assert state.state == "19.8"
+    assert "stale" not in state.attributes
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert (
+        hass_storage[storage_key]["data"][API_REG_PARAMS_KEY][
+            API_REG_PARAMS_CURRENT_KEY
+        ]["REKcurSupTemp"]
+        == 19.8
+    )
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_discovered_entities_added_once_metadata_loads(
+    hass, hass_storage, mock_config_entry, simulator
+):
+    """Started from the snapshot, metadata is fetched after platforms are set up."""
+    _store_snapshot(hass_storage, mock_config_entry, simulator)
+    # Keeps metadata fetching running in the background while entities are set up
+    simulator.latency = 0.2
+    entity_registry = er.async_get(hass)
+    unique_id = f"frapol-econet300-{simulator.sys_params['uid']}-param_rekalarmtemp"
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    assert entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id) is None
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+    assert hass.states.get(entity_id).state == "15.9"
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_stale_data_served_until_grace_period_expires(
+    freezer, hass, config_entry, simulator
+):
+    """
+    Failed polls keep the last snapshot marked stale, until the grace period expires.
+
+    Entities are then unavailable until the device responds again.
+    """
+    coordinator = config_entry.runtime_data.coordinator
+    # Failed polls are not retried, so they do not wait for backoff delays
+    config_entry.runtime_data.client.retry_policy = FrapolEconet300RetryPolicy(
+        max_attempts=1
+    )
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor",
+        DOMAIN,
+        f"frapol-econet300-{simulator.sys_params['uid']}-supply_temperature",
+    )
+
+    simulator.inject(FrapolEconet300Fault.RESET)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert coordinator.last_update_success
+    assert state.state == "19.8"
+    assert state.attributes["stale"]
+
+    freezer.tick(timedelta(seconds=DEFAULT_STALE_GRACE_PERIOD))
+    simulator.inject(FrapolEconet300Fault.RESET)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not coordinator.last_update_success
+    assert hass.states.get(entity_id).state == "unavailable"
+
+    simulator.reg_params[API_REG_PARAMS_CURRENT_KEY]["REKcurSupTemp"] = 20.5
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert coordinator.last_update_success
+    assert not coordinator.stale
+    assert state.state == "20.5"
+    assert "stale" not in state.attributes
@@ -0,0 +1,64 @@
+"""Test decoding of API responses."""
+
+import json
+import timeit
+from pathlib import Path
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    API_REG_PARAM_CURRENT_MAIN_MODE,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+)
+from custom_components.frapol_econet300_heat_recovery.decoder import decode_reg_params
+from custom_components.frapol_econet300_heat_recovery.sensor import SENSORS
+
+REG_PARAMS = (Path(__file__).parent / "fixtures" / "reg_params.json").read_bytes()
+PROJECTION = frozenset(sensor_data.api_param_name for sensor_data in SENSORS)
+
+
+def test_decode_projects_current_values():
+    """Only current values of projected params are kept."""
+    decoded = decode_reg_params(
+        REG_PARAMS, frozenset({API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE, "missing"})
+    )
+    assert decoded == {"curr": {API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE: 19.8}}
+
+
+def test_decode_without_projection_keeps_all_scalars():
+    """Without projection all current values of supported types are kept."""
+    body = json.dumps(
+        {"curr": {API_REG_PARAM_CURRENT_MAIN_MODE: 4, "nested": {"a": 1}, "list": [1]}}
+    ).encode()
+    assert decode_reg_params(body) == {"curr": {API_REG_PARAM_CURRENT_MAIN_MODE: 4}}
+
+
+@pytest.mark.parametrize("body", [b"[]", b'{"curr": 1}'])
+def test_decode_rejects_body_without_current_values(body):
+    """Documents without current values raise ValueError."""
+    with pytest.raises(ValueError, match="Missing 'curr'"):
+        decode_reg_params(body)
+
+
+def test_decode_rejects_invalid_json():
+    """Invalid documents raise JSONDecodeError, which is a ValueError."""
+    with pytest.raises(json.JSONDecodeError):
+        decode_reg_params(b"{")
+
+
+def test_projected_decode_is_faster_than_full_decode():
+    """Micro-benchmark - projected decoding beats json.loads followed by lookups."""
+    pytest.importorskip("orjson")
+
+    def full_decode() -> list:
+        data = json.loads(REG_PARAMS)
+        return [data.get("curr").get(name) for name in PROJECTION]
+
+    def projected_decode() -> list:
+        current = decode_reg_params(REG_PARAMS, PROJECTION)["curr"]
+        return [current.get(name) for name in PROJECTION]
+
+    assert full_decode() == projected_decode()
+    full = min(timeit.repeat(full_decode, number=200, repeat=5))
+    projected = min(timeit.repeat(projected_decode, number=200, repeat=5))
+    assert projected < full
@@ -0,0 +1,101 @@
+"""Test metrics derived from recent regParams values."""
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE,
+    API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED,
+    API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE,
+    API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE,
+    API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED,
+    API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE,
+)
+from custom_components.frapol_econet300_heat_recovery.derived import (
+    FrapolEconet300DerivedMetrics,
+    FrapolEconet300RingBuffer,
+)
+from custom_components.frapol_econet300_heat_recovery.model import (
+    FrapolEconet300Snapshot,
+)
+
+
+def _params(  # noqa: PLR0913 Too many arguments in function definition
+    *,
+    supply=18.0,
+    intake=0.0,
+    extract=22.0,
+    exhaust=4.0,
+    supply_fan=50,
+    extract_fan=45,
+) -> FrapolEconet300Snapshot:
+    current = {
+        API_REG_PARAM_CURRENT_SUPPLY_TEMPERATURE: supply,
+        API_REG_PARAM_CURRENT_INTAKE_TEMPERATURE: intake,
+        API_REG_PARAM_CURRENT_EXTRACT_TEMPERATURE: extract,
+        API_REG_PARAM_CURRENT_EXHAUST_TEMPERATURE: exhaust,
+        API_REG_PARAM_CURRENT_SUPPLY_FAN_SPEED: supply_fan,
+        API_REG_PARAM_CURRENT_EXTRACT_FAN_SPEED: extract_fan,
+    }
+    return FrapolEconet300Snapshot.from_tiers(
+        {"regParams": {"curr": current}, "sysParams": {"uid": "UID"}}
+    )
+
+
+def test_ring_buffer_keeps_latest_samples_in_order():
+    """Once full, the oldest samples are overwritten and windows stay chronological."""
+    buffer = FrapolEconet300RingBuffer(columns=1, capacity=3)
+    for now in range(5):
+        buffer.append(now, [now * 10 if now != 3 else None])
+
+    times, (values,) = buffer.window(since=0)
+    assert list(times) == [2, 3, 4]
+    assert values[0] == 20
+    assert values[1] != values[1]
+    assert values[2] == 40
+
+    times, _ = buffer.window(since=3.5)
+    assert list(times) == [4]
+
+
+def test_efficiency_latest_and_rolling():
+    """Efficiency is of the latest sample, rolling efficiency is weighted by span."""
+    metrics = FrapolEconet300DerivedMetrics(capacity=10, window=60)
+
+    assert metrics.add(_params(supply=16.0, intake=0.0, extract=20.0), now=0)
+    assert metrics.values.efficiency == 80.0
+
+    metrics.add(_params(supply=19.0, intake=10.0, extract=20.0), now=30)
+    assert metrics.values.efficiency == 90.0
+    assert metrics.values.rolling_efficiency == pytest.approx(100 * 25 / 30, abs=0.1)
+
+
+def test_efficiency_skipped_when_temperatures_are_close():
+    """A small extract and intake temperature span gives no efficiency."""
+    metrics = FrapolEconet300DerivedMetrics(capacity=10, window=60)
+
+    metrics.add(_params(supply=20.5, intake=20.0, extract=21.0), now=0)
+
+    assert metrics.values.efficiency is None
+    assert metrics.values.rolling_efficiency is None
+
+
+def test_trends_and_fan_balance_over_window():
+    """Trends are slopes per hour over the window, skipping old and missing values."""
+    metrics = FrapolEconet300DerivedMetrics(capacity=10, window=600)
+    metrics.add(_params(intake=-20.0), now=-3600)
+    metrics.add(_params(intake=0.0, extract_fan=40), now=0)
+    metrics.add(_params(intake=None), now=150)
+    metrics.add(_params(intake=0.5, extract_fan=50), now=300)
+
+    assert metrics.values.intake_temperature_trend == 6.0
+    assert metrics.values.extract_temperature_trend == 0.0
+    assert metrics.values.fan_balance == pytest.approx(5.0)
+
+
+def test_unchanged_values_are_not_reported_as_change():
+    """Adding a sample which does not move any derived value returns False."""
+    metrics = FrapolEconet300DerivedMetrics(capacity=10, window=60)
+    metrics.add(_params(), now=0)
+    metrics.add(_params(), now=10)
+
+    assert not metrics.add(_params(), now=20)
@@ -0,0 +1,89 @@
+"""Test recovered heat power and its integration into energy."""
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.energy import (
+    FrapolEconet300AirflowCurve,
+    FrapolEconet300EnergyAccumulator,
+    recovered_power,
+)
+
+
+def test_airflow_curve_interpolates_and_clamps():
+    """Airflow is interpolated between points, the end points apply beyond the curve."""
+    curve = FrapolEconet300AirflowCurve.parse("100:300, 20:60 ,50:160")
+
+    assert curve.points == ((20, 60), (50, 160), (100, 300))
+    assert curve.airflow(10) == 60
+    assert curve.airflow(35) == pytest.approx(110)
+    assert curve.airflow(75) == pytest.approx(230)
+    assert curve.airflow(120) == 300
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        ("", "not in speed:airflow form"),
+        ("100:300", "at least two points"),
+        ("0:0, 0:10", "at least two points"),
+        ("0:0; 100:300", "could not convert"),
+        ("0:0, 100:fast", "could not convert"),
+        ("0:-10, 100:300", "can not be negative"),
+    ],
+)
+def test_airflow_curve_rejects_malformed_text(text, error):
+    """Curves without two distinct speeds, or with malformed points, are rejected."""
+    with pytest.raises(ValueError, match=error):
+        FrapolEconet300AirflowCurve.parse(text)
+
+
+def test_recovered_power():
+    """Power follows airflow and temperature rise, while the extract air is warmer."""
+    curve = FrapolEconet300AirflowCurve.parse("0:0, 100:360")
+
+    # 1206 J/(m³·K) * 0.05 m³/s * 15 K
+    assert recovered_power(15.0, 0.0, 21.0, 50, curve) == pytest.approx(904.5)
+    assert recovered_power(26.0, 25.0, 22.0, 50, curve) == 0
+    assert recovered_power(15.0, 0.0, 21.0, 0, curve) == 0
+    assert recovered_power(15.0, None, 21.0, 50, curve) is None
+    assert recovered_power(15.0, 0.0, 21.0, True, curve) is None  # noqa: FBT003 Boolean positional value in function call
+
+
+def test_accumulator_holds_power_until_next_sample():
+    """Energy of each interval comes from the power sampled at its start."""
+    accumulator = FrapolEconet300EnergyAccumulator(max_gap=180)
+
+    accumulator.add(0, 1000)
+    accumulator.add(60, 2000)
+    accumulator.add(120, 0)
+    accumulator.add(180, 0)
+
+    assert accumulator.total == pytest.approx((1000 * 60 + 2000 * 60) / 3_600_000)
+
+
+def test_accumulator_skips_gaps():
+    """Nothing is counted after a missing sample, nor over a too long interval."""
+    accumulator = FrapolEconet300EnergyAccumulator(max_gap=180)
+
+    accumulator.add(0, 1000)
+    accumulator.add(60, None)
+    accumulator.add(120, 1000)
+    accumulator.add(1000, 1000)
+    accumulator.add(1060, 1000)
+
+    assert accumulator.total == pytest.approx(2 * 1000 * 60 / 3_600_000)
+
+
+def test_accumulator_restored_continues_total():
+    """Persisted state continues counting, a short restart is integrated as usual."""
+    accumulator = FrapolEconet300EnergyAccumulator(max_gap=180, total=1.5)
+    accumulator.add(0, 3600)
+
+    restored = FrapolEconet300EnergyAccumulator.from_dict(
+        accumulator.as_dict(), max_gap=180
+    )
+    restored.add(100, 3600)
+
+    assert restored.total == pytest.approx(1.6)
+    with pytest.raises(KeyError):
+        FrapolEconet300EnergyAccumulator.from_dict({"total": 1.0}, max_gap=180)
@@ -0,0 +1,96 @@
+"""Test filtering of published sensor states."""
+
+from custom_components.frapol_econet300_heat_recovery.filters import (
+    FrapolEconet300DeadbandMode,
+    FrapolEconet300FilterConfig,
+    FrapolEconet300SensorFilter,
+    FrapolEconet300Smoothing,
+)
+
+
+def test_deadband_holds_back_jitter_until_max_interval():
+    """Changes within the deadband are published once the maximum interval passes."""
+    sensor_filter = FrapolEconet300SensorFilter(
+        FrapolEconet300FilterConfig(deadband=0.2, max_interval=60)
+    )
+
+    assert sensor_filter.process(21.0, now=0)
+    assert not sensor_filter.process(21.1, now=5)
+    assert not sensor_filter.process(20.9, now=10)
+    assert sensor_filter.deadline() == 60
+    assert sensor_filter.flush(now=60)
+    assert sensor_filter.value == 20.9
+    assert sensor_filter.process(21.2, now=65)
+
+
+def test_min_interval_delays_real_changes():
+    """Changes beyond the deadband wait for the minimum interval, the latest wins."""
+    sensor_filter = FrapolEconet300SensorFilter(
+        FrapolEconet300FilterConfig(min_interval=30)
+    )
+
+    assert sensor_filter.process(40, now=0)
+    assert not sensor_filter.process(45, now=10)
+    assert not sensor_filter.process(50, now=20)
+    assert sensor_filter.deadline() == 30
+    assert sensor_filter.flush(now=30)
+    assert sensor_filter.value == 50
+
+
+def test_percent_deadband_and_non_numeric_values():
+    """Percent deadband scales with the last state, None is always let through."""
+    config = FrapolEconet300FilterConfig(
+        deadband=10, deadband_mode=FrapolEconet300DeadbandMode.PERCENT
+    )
+    sensor_filter = FrapolEconet300SensorFilter(config)
+
+    assert sensor_filter.process(50, now=0)
+    assert not sensor_filter.process(54, now=1)
+    assert sensor_filter.process(56, now=2)
+    assert sensor_filter.process(None, now=3)
+
+
+def test_median_smoothing_drops_spikes():
+    """A single outlier does not reach the published state."""
+    config = FrapolEconet300FilterConfig(
+        smoothing=FrapolEconet300Smoothing.MEDIAN, smoothing_window=3
+    )
+    sensor_filter = FrapolEconet300SensorFilter(config)
+
+    published = [
+        sensor_filter.value
+        for now, reading in enumerate([20.0, 20.0, 35.0, 20.0])
+        if sensor_filter.process(reading, now)
+    ]
+
+    assert published == [20.0]
+
+
+def test_ema_smoothing_settles_on_resampled_reading():
+    """Feeding the latest reading again moves the average onto it."""
+    config = FrapolEconet300FilterConfig(
+        smoothing=FrapolEconet300Smoothing.EMA, smoothing_window=3
+    )
+    sensor_filter = FrapolEconet300SensorFilter(config)
+    sensor_filter.process(20.0, now=0)
+    sensor_filter.process(25.0, now=1)
+    assert sensor_filter.value == 22.5
+    assert sensor_filter.settling
+
+    now = 1
+    while sensor_filter.settling:
+        now += 1
+        sensor_filter.resample(now)
+
+    assert sensor_filter.value == 25.0
+    assert sensor_filter.deadline() is None
+
+
+def test_default_config_is_passthrough():
+    """Options equal to the defaults disable filtering."""
+    assert FrapolEconet300FilterConfig.from_options(
+        {"deadband": 0, "smoothing_window": 7}
+    ).is_passthrough
+    assert not FrapolEconet300FilterConfig.from_options(
+        {"max_interval": 60}
+    ).is_passthrough
@@ -0,0 +1,169 @@
+"""Test recording raw responses and replaying them in place of the device."""
+
+import gzip
+import json
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.frapol_econet300_heat_recovery.api import (
+    FrapolEconet300ApiClient,
+    FrapolEconet300ApiClientCommunicationError,
+)
+from custom_components.frapol_econet300_heat_recovery.const import (
+    CONF_FLIGHT_RECORDER,
+    CONF_REPLAY_SPEED,
+    DOMAIN,
+)
+from custom_components.frapol_econet300_heat_recovery.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.frapol_econet300_heat_recovery.flight_recorder import (
+    FrapolEconet300FlightRecorder,
+    FrapolEconet300FlightRecorderMode,
+    FrapolEconet300RecordedResponse,
+    FrapolEconet300ReplayTransport,
+    read_recording,
+)
+from custom_components.frapol_econet300_heat_recovery.resilience import (
+    FrapolEconet300LatencyTracker,
+    FrapolEconet300RetryPolicy,
+)
+
+from .simulator import FrapolEconet300Fault
+
+
+def _replay_client(transport) -> FrapolEconet300ApiClient:
+    return FrapolEconet300ApiClient(
+        host="http://recorded",
+        username="",
+        password="",
+        transport=transport,
+        retry_policy=FrapolEconet300RetryPolicy(base_delay=0.01, max_delay=0.05),
+        latency_tracker=FrapolEconet300LatencyTracker(min_timeout=0.2, max_timeout=0.5),
+    )
+
+
+async def test_recording_replays_same_data_and_failures(
+    tmp_path, simulator, simulator_client
+):
+    """A replayed session sees the same responses and failures, in the same order."""
+    recorder = FrapolEconet300FlightRecorder(tmp_path / "recording.ndjson.gz")
+    simulator_client.flight_recorder = recorder
+    simulator.timeout_delay = 1
+    simulator.inject(FrapolEconet300Fault.TIMEOUT)
+
+    recorded_data = []
+    for supply_temperature in (19.5, 20.0):
+        simulator.reg_params["curr"]["REKcurSupTemp"] = supply_temperature
+        await simulator_client.refresh_state(force_tiers=("regParams",))
+        recorded_data.append(await simulator_client.get_all_data())
+    await recorder.async_close()
+
+    recording = list(read_recording(recorder.path))
+    assert [recorded.error for recorded in recording].count("timeout") == 1
+
+    client = _replay_client(FrapolEconet300ReplayTransport(recording))
+    for expected in recorded_data:
+        await client.refresh_state(force_tiers=("regParams",))
+        assert await client.get_all_data() == expected
+    assert client.metrics.total_retries == simulator_client.metrics.total_retries
+
+    with pytest.raises(FrapolEconet300ApiClientCommunicationError):
+        await client.refresh_state(force_tiers=("regParams",))
+
+
+async def test_recording_is_rotated(tmp_path):
+    """Full files are rotated, the oldest ones dropped, reading stays in order."""
+    recorder = FrapolEconet300FlightRecorder(
+        tmp_path / "recording.ndjson.gz", max_bytes=1, backups=2
+    )
+    for number in range(5):
+        recorder.record_error(f"/econet/regParams?n={number}", "connection")
+        await recorder.async_close()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "recording.ndjson.gz",
+        "recording.ndjson.gz.1",
+        "recording.ndjson.gz.2",
+    ]
+    assert [recorded.url[-1] for recorded in read_recording(recorder.path)] == [
+        "2",
+        "3",
+        "4",
+    ]
+
+
+async def test_replay_speed_scales_recorded_gaps():
+    """Responses are held back by recorded gaps divided by the speed."""
+    recording = [
+        FrapolEconet300RecordedResponse(
+            time=100.0 + second, url="/econet/sysParams", status=200, body=b"{}"
+        )
+        for second in range(3)
+    ]
+    transport = FrapolEconet300ReplayTransport(recording, speed=20)
+
+    started_at = time.monotonic()
+    for _ in recording:
+        await transport.request("get", "http://recorded/econet/sysParams")
+
+    assert 0.09 <= time.monotonic() - started_at < 0.5
+    assert transport.remaining == 0
+
+
+async def test_replay_ends_with_recorded_polls(
+    hass, tmp_path, mock_config_entry, simulator
+):
+    """Polling stops once regParams run out, even if other responses are left."""
+    hass.config.config_dir = str(tmp_path)
+    recording_path = Path(
+        hass.config.path(
+            DOMAIN, f"flight_recorder_{mock_config_entry.entry_id}.ndjson.gz"
+        )
+    )
+    recording_path.parent.mkdir()
+    bodies = {
+        "/econet/regParams": json.dumps(simulator.reg_params).encode(),
+        "/econet/sysParams": json.dumps(simulator.sys_params).encode(),
+        "/econet/editParams": json.dumps(simulator.edit_params).encode(),
+    }
+    urls = [
+        "/econet/regParams",
+        "/econet/sysParams",
+        "/econet/editParams",
+        *["/econet/regParams"] * 3,
+        *["/econet/sysParams"] * 3,
+    ]
+    with gzip.open(recording_path, "wt", encoding="utf-8") as file:
+        for second, url in enumerate(urls):
+            file.write(
+                FrapolEconet300RecordedResponse(
+                    time=float(second), url=url, status=200, body=bodies[url]
+                ).to_line()
+            )
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_FLIGHT_RECORDER: FrapolEconet300FlightRecorderMode.REPLAY,
+            CONF_REPLAY_SPEED: 0,
+        },
+    )
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    for _ in range(len(urls)):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+    replay = mock_config_entry.runtime_data.replay
+    assert replay.remaining_for("/econet/regParams") == 0
+    assert replay.remaining_for("/econet/sysParams") > 0
+    assert mock_config_entry.runtime_data.coordinator.update_interval is None
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert diagnostics["coordinator"]["next_poll_delay"] is None
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
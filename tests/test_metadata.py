@@ -0,0 +1,81 @@
+"""Test parsing of parameter metadata."""
+
+from custom_components.frapol_econet300_heat_recovery.metadata import (
+    FrapolEconet300ParamMetadata,
+    firmware_fingerprint,
+    parse_edit_params,
+    parse_reg_params_catalogue,
+)
+
+
+def test_parse_edit_params_mapping():
+    """Units are resolved from unit codes, ranges and enum values are parsed."""
+    document = {
+        "data": {
+            "REKcurSetPoint": {"value": 21, "unit": 1, "minv": 10, "maxv": 30},
+            "REKWS1": {
+                "value": 4,
+                "unit": 0,
+                "enum": {"first": 3, "values": ["mode1", "mode2", "mode3"]},
+            },
+        },
+    }
+    assert parse_edit_params(document) == {
+        "REKcurSetPoint": FrapolEconet300ParamMetadata(
+            unit="°C", min_value=10, max_value=30
+        ),
+        "REKWS1": FrapolEconet300ParamMetadata(options=(3, 4, 5)),
+    }
+
+
+def test_parse_edit_params_list():
+    """Parameters given as a list of named descriptions are accepted."""
+    document = {
+        "editableParams": [
+            {"name": "REKcurSupFanSpeed", "unit": "6", "min": 0, "max": 100},
+            {"value": 1},
+        ]
+    }
+    assert parse_edit_params(document) == {
+        "REKcurSupFanSpeed": FrapolEconet300ParamMetadata(
+            unit="%", min_value=0, max_value=100
+        ),
+    }
+
+
+def test_firmware_fingerprint_ignores_unrelated_params():
+    """Only software versions and controller type identify the firmware."""
+    sys_params = {
+        "uid": "X",
+        "softVer": "3.2",
+        "modulePanelSoftVer": "1.1",
+        "controllerID": "REK",
+        "wifiStrength": 40,
+    }
+    assert (
+        firmware_fingerprint(sys_params)
+        == "controllerID=REK;modulePanelSoftVer=1.1;softVer=3.2"
+    )
+    assert firmware_fingerprint(
+        {**sys_params, "wifiStrength": 80}
+    ) == firmware_fingerprint(sys_params)
+
+
+def test_parse_reg_params_catalogue():
+    """Scalar params get units from unit codes and visibility from the schema."""
+    document = {
+        "curr": {
+            "REKcurSupTemp": 19.8,
+            "REKBypassFlag": True,
+            "REKName": "x",
+            "REKList": [1],
+        },
+        "currUnits": {"REKcurSupTemp": 1, "REKName": 0},
+        "schemaParams": {"REKcurSupTemp": {"visible": True, "index": 0}},
+    }
+    assert parse_reg_params_catalogue(document) == {
+        "REKcurSupTemp": FrapolEconet300ParamMetadata(
+            unit="°C", visible=True, numeric=True
+        ),
+        "REKName": FrapolEconet300ParamMetadata(numeric=False),
+    }
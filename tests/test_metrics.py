@@ -0,0 +1,39 @@
+"""Test performance counters."""
+
+from custom_components.frapol_econet300_heat_recovery.metrics import (
+    FrapolEconet300Metrics,
+)
+
+
+def test_latency_histogram_and_counters():
+    """Responses land in buckets by upper bound, counters are kept per endpoint."""
+    metrics = FrapolEconet300Metrics(buckets=(0.1, 1.0))
+    metrics.record_response("/econet/regParams", 0.05, 100)
+    metrics.record_response("/econet/regParams", 0.1, 100)
+    metrics.record_response("/econet/regParams", 3.0, 50)
+    metrics.record_retry("/econet/regParams")
+    metrics.record_timeout("/econet/sysParams")
+    metrics.record_error("/econet/sysParams")
+
+    summary = metrics.as_dict()["endpoints"]
+    assert summary["/econet/regParams"]["latency_histogram"] == {
+        "<=0.1s": 2,
+        "<=1.0s": 0,
+        ">1.0s": 1,
+    }
+    assert summary["/econet/regParams"]["bytes_received"] == 250
+    assert summary["/econet/sysParams"]["timeouts"] == 1
+    assert (metrics.total_retries, metrics.total_errors) == (1, 1)
+
+
+def test_state_writes_are_attributed_to_latest_update():
+    """State writes made while notifying listeners are counted per update."""
+    metrics = FrapolEconet300Metrics()
+    metrics.record_update(0.2)
+    metrics.pending_state_writes += 3
+    metrics.collect_state_writes()
+    metrics.collect_state_writes()
+
+    assert metrics.updates.last_state_writes == 0
+    assert metrics.updates.state_writes == 3
+    assert metrics.as_dict()["updates"]["duration_mean"] == 0.2
@@ -0,0 +1,62 @@
+"""Test the compact snapshot of device state."""
+
+from custom_components.frapol_econet300_heat_recovery.model import (
+    FrapolEconet300Snapshot,
+    param_accessor,
+)
+
+
+def _snapshot(current, previous=None, sys_params=None) -> FrapolEconet300Snapshot:
+    return FrapolEconet300Snapshot.from_tiers(
+        {
+            "regParams": {"curr": current},
+            "sysParams": sys_params or {"uid": "UID", "softVer": "1.0"},
+        },
+        previous,
+    )
+
+
+def test_accessor_reads_values_and_follows_index_changes():
+    """Accessors read current values by slot, missing params are None."""
+    snapshot = _snapshot({"REKWS1": 4, "REKcurSupTemp": 19.5})
+    mode = param_accessor("REKWS1")
+
+    assert snapshot.uid == "UID"
+    assert mode(snapshot) == 4
+    assert param_accessor("missing")(snapshot) is None
+    assert mode(_snapshot({"REKcurSupTemp": 19.5, "REKWS1": 2})) == 2
+
+
+def test_consecutive_snapshots_share_unchanged_parts():
+    """The index and sysParams are reused, so diffing compares values slot by slot."""
+    first = _snapshot({"REKWS1": 4, "REKcurSupTemp": 19.5})
+    second = _snapshot({"REKWS1": 4, "REKcurSupTemp": 20.0}, first)
+
+    assert second.index is first.index
+    assert second.sys_params is first.sys_params
+    assert second.diff(first) == {"REKcurSupTemp": 20.0}
+    assert second.changed_tiers(first) == ["regParams"]
+    assert second != first
+    assert _snapshot({"REKWS1": 4, "REKcurSupTemp": 20.0}) == second
+
+
+def test_diff_across_different_params():
+    """Added params are reported with their value, removed ones as None."""
+    first = _snapshot({"REKWS1": 4, "REKcurSupTemp": 19.5})
+    second = _snapshot({"REKWS1": 4, "REKcurIntTemp": 1.0}, first)
+
+    assert second.diff(first) == {"REKcurIntTemp": 1.0, "REKcurSupTemp": None}
+
+
+def test_with_values_and_round_trip():
+    """Optimistic values replace slots or extend the index, as_dict matches tiers."""
+    snapshot = _snapshot({"REKWS1": 4})
+
+    updated = snapshot.with_values({"REKWS1": 2})
+    assert updated.index is snapshot.index
+    assert updated.get("REKWS1") == 2
+    assert snapshot.get("REKWS1") == 4
+
+    extended = updated.with_values({"REKWS4": 1})
+    assert extended.current_params() == {"REKWS1": 2, "REKWS4": 1}
+    assert FrapolEconet300Snapshot.from_tiers(extended.as_dict()) == extended
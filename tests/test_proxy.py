@@ -0,0 +1,125 @@
+"""Test the fan-out caching proxy against the simulated controller."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+
+import aiohttp
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    API_REG_PARAM_CURRENT_MAIN_MODE,
+)
+from custom_components.frapol_econet300_heat_recovery.proxy import FrapolEconet300Proxy
+
+from .simulator import DEFAULT_PASSWORD, DEFAULT_USERNAME
+
+POLL_INTERVAL = 0.1
+
+
+@pytest.fixture(name="proxy")
+async def _proxy_fixture(simulator_client) -> AsyncGenerator[aiohttp.ClientSession]:
+    """Run a proxy in front of the simulator, polling regParams every POLL_INTERVAL."""
+    proxy = FrapolEconet300Proxy(
+        simulator_client,
+        DEFAULT_USERNAME,
+        DEFAULT_PASSWORD,
+        reg_params_interval=timedelta(seconds=POLL_INTERVAL),
+    )
+    url = await proxy.start("127.0.0.1", 0)
+    async with aiohttp.ClientSession(
+        base_url=url,
+        auth=aiohttp.BasicAuth(DEFAULT_USERNAME, DEFAULT_PASSWORD),
+        connector=aiohttp.TCPConnector(limit=0),
+    ) as session:
+        yield session
+    await proxy.close()
+
+
+async def test_clients_revalidate_with_etag(simulator, proxy):
+    """Unchanged bodies are answered with 304, a change with the new body and ETag."""
+    async with proxy.get("/econet/regParams") as response:
+        assert response.status == 200
+        assert (await response.json())["curr"] == simulator.reg_params["curr"]
+        etag = response.headers["ETag"]
+
+    async with proxy.get(
+        "/econet/regParams", headers={"If-None-Match": etag}
+    ) as response:
+        assert response.status == 304
+
+    simulator.reg_params["curr"]["REKcurSupTemp"] = 21.0
+    await asyncio.sleep(POLL_INTERVAL * 3)
+    async with proxy.get(
+        "/econet/regParams", headers={"If-None-Match": etag}
+    ) as response:
+        assert response.status == 200
+        assert response.headers["ETag"] != etag
+        assert (await response.json())["curr"]["REKcurSupTemp"] == 21.0
+
+
+async def test_clients_need_device_credentials(proxy):
+    """Clients without the device credentials are rejected."""
+    async with proxy.get(
+        "/econet/sysParams", auth=aiohttp.BasicAuth(DEFAULT_USERNAME, "wrong")
+    ) as response:
+        assert response.status == 401
+
+
+async def test_writes_pass_through_and_refresh_cache(simulator, proxy):
+    """Writes reach the device one at a time, the cache reflects them right away."""
+    writes = [
+        proxy.get(
+            "/econet/newParam",
+            params={
+                "newParamName": API_REG_PARAM_CURRENT_MAIN_MODE,
+                "newParamValue": value,
+            },
+        )
+        for value in ("1", "2")
+    ]
+    for response in await asyncio.gather(*writes):
+        assert response.status == 200
+        assert (await response.json())["result"] == "OK"
+        response.release()
+
+    assert simulator.writes == [
+        (API_REG_PARAM_CURRENT_MAIN_MODE, "1"),
+        (API_REG_PARAM_CURRENT_MAIN_MODE, "2"),
+    ]
+    async with proxy.get("/econet/regParams") as response:
+        assert (await response.json())["curr"][API_REG_PARAM_CURRENT_MAIN_MODE] == 2
+
+
+async def _poll_for(session, seconds) -> int:
+    """Poll regParams as fast as possible for given time, return number of requests."""
+    requests = 0
+    etag = ""
+    deadline = asyncio.get_running_loop().time() + seconds
+    while asyncio.get_running_loop().time() < deadline:
+        async with session.get(
+            "/econet/regParams", headers={"If-None-Match": etag}
+        ) as response:
+            assert response.status in (200, 304)
+            etag = response.headers["ETag"]
+        requests += 1
+    return requests
+
+
+async def test_device_request_rate_does_not_grow_with_clients(simulator, proxy):
+    """However many clients poll the proxy, the device is polled on its schedule."""
+    duration = POLL_INTERVAL * 5
+    device_requests = {}
+    for clients in (1, 10, 50):
+        simulator.requests.clear()
+        served = await asyncio.gather(
+            *(_poll_for(proxy, duration) for _ in range(clients))
+        )
+        assert sum(served) >= clients
+        device_requests[clients] = simulator.requests["/econet/regParams"]
+
+    assert all(
+        requests <= duration / POLL_INTERVAL + 1
+        for requests in device_requests.values()
+    )
+    assert max(device_requests.values()) - min(device_requests.values()) <= 2
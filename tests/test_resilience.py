@@ -0,0 +1,85 @@
+"""Test retry, timeout and circuit breaker primitives."""
+
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.resilience import (
+    FrapolEconet300CircuitBreaker,
+    FrapolEconet300CircuitState,
+    FrapolEconet300LatencyTracker,
+    FrapolEconet300RetryPolicy,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return current time."""
+        return self.now
+
+
+def test_retry_delay_is_bounded():
+    """Backoff grows exponentially but never exceeds the maximum delay."""
+    policy = FrapolEconet300RetryPolicy(max_attempts=5, base_delay=0.1, max_delay=0.5)
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= min(0.5, 0.1 * 2**attempt)
+
+
+def test_timeout_follows_latency():
+    """Timeout is the maximum until there are enough samples, then the percentile."""
+    tracker = FrapolEconet300LatencyTracker(
+        percentile=0.95, multiplier=3, min_timeout=0.5, max_timeout=10
+    )
+    assert tracker.timeout("/econet/regParams") == 10
+    for _ in range(20):
+        tracker.record("/econet/regParams", 0.2)
+    assert tracker.timeout("/econet/regParams") == pytest.approx(0.6)
+    assert tracker.timeout("/econet/sysParams") == 10
+
+
+def test_circuit_breaker_opens_and_probes():
+    """Circuit opens after consecutive failures, then lets a single probe through."""
+    clock = FakeClock()
+    breaker = FrapolEconet300CircuitBreaker(
+        failure_threshold=2, reset_timeout=30, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is FrapolEconet300CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 30
+    assert breaker.state is FrapolEconet300CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state is FrapolEconet300CircuitState.OPEN
+
+    clock.now = 60
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state is FrapolEconet300CircuitState.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_released_probe_lets_next_probe_through():
+    """A probe ending without an outcome frees the slot, the circuit stays half-open."""
+    clock = FakeClock()
+    breaker = FrapolEconet300CircuitBreaker(
+        failure_threshold=1, reset_timeout=30, clock=clock
+    )
+    breaker.record_failure()
+    clock.now = 30
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state is FrapolEconet300CircuitState.HALF_OPEN
+    assert breaker.allow_request()
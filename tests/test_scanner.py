@@ -0,0 +1,91 @@
+"""Test LAN discovery against simulated controllers on loopback ports."""
+
+import ipaddress
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.frapol_econet300_heat_recovery.scanner import (
+    probe_hosts,
+    scan_subnet,
+    subnet_hosts,
+)
+
+from .simulator import DEFAULT_PASSWORD, DEFAULT_USERNAME, FrapolEconet300Simulator
+
+AUTH = aiohttp.BasicAuth(DEFAULT_USERNAME, DEFAULT_PASSWORD)
+
+
+async def test_probe_hosts_finds_devices_among_silent_hosts(simulator):
+    """Only hosts answering sysParams are discovered, each with its uid."""
+    other = FrapolEconet300Simulator(
+        sys_params={**simulator.sys_params, "uid": "OTHER"}
+    )
+    await other.start()
+    silent = FrapolEconet300Simulator()
+    silent_host = (await silent.start()).removeprefix("http://")
+    await silent.close()
+    try:
+        async with aiohttp.ClientSession() as session:
+            devices = await probe_hosts(
+                session,
+                [
+                    simulator.url.removeprefix("http://"),
+                    silent_host,
+                    other.url.removeprefix("http://"),
+                ],
+                auth=AUTH,
+                max_concurrent=2,
+                probe_timeout=0.5,
+            )
+    finally:
+        await other.close()
+
+    assert [device.uid for device in devices] == [simulator.sys_params["uid"], "OTHER"]
+
+
+async def test_rejected_credentials_still_discover_device(simulator):
+    """A device rejecting credentials is listed without uid, to correct them."""
+    async with aiohttp.ClientSession() as session:
+        devices = await probe_hosts(
+            session,
+            [simulator.url.removeprefix("http://")],
+            auth=aiohttp.BasicAuth(DEFAULT_USERNAME, "wrong"),
+        )
+
+    assert len(devices) == 1
+    assert devices[0].uid is None
+
+
+async def test_scan_subnet_probes_hosts_of_subnet(simulator):
+    """
+    Every host of the subnet is probed on given port.
+
+    Only 127.0.0.1 is reachable in tests, so hosts of the subnet are replaced by the
+    simulator and a closed port, `subnet_hosts` itself is tested below.
+    """
+    port = int(simulator.url.rsplit(":", 1)[1])
+    closed = FrapolEconet300Simulator()
+    closed_host = (await closed.start()).removeprefix("http://")
+    await closed.close()
+    with patch(
+        "custom_components.frapol_econet300_heat_recovery.scanner.subnet_hosts",
+        return_value=[closed_host, f"127.0.0.1:{port}"],
+    ) as hosts:
+        async with aiohttp.ClientSession() as session:
+            devices = await scan_subnet(
+                session, "192.168.1.0/30", auth=AUTH, port=port, probe_timeout=0.5
+            )
+
+    hosts.assert_called_once_with("192.168.1.0/30", port)
+    assert [device.host for device in devices] == [f"127.0.0.1:{port}"]
+
+
+def test_subnet_hosts_rejects_large_or_invalid_subnets():
+    """Scanning is limited to small subnets."""
+    assert subnet_hosts("192.168.1.7/30") == ["192.168.1.5", "192.168.1.6"]
+    with pytest.raises(ValueError, match="has more than"):
+        subnet_hosts("10.0.0.0/16")
+    with pytest.raises(ipaddress.AddressValueError):
+        subnet_hosts("not a subnet")
@@ -0,0 +1,162 @@
+"""Test poll scheduling across a fleet of devices."""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from custom_components.frapol_econet300_heat_recovery.decoder import decode_reg_params
+from custom_components.frapol_econet300_heat_recovery.scheduler import (
+    FrapolEconet300AdaptiveInterval,
+    FrapolEconet300FleetScheduler,
+)
+
+REG_PARAMS = (Path(__file__).parent / "fixtures" / "reg_params.json").read_bytes()
+
+
+def test_adaptive_interval_bursts_then_backs_off():
+    """Changes keep the minimum interval for a burst, stable values back off."""
+    interval = FrapolEconet300AdaptiveInterval(
+        min_interval=timedelta(seconds=5),
+        max_interval=timedelta(seconds=20),
+        burst_polls=2,
+        backoff_factor=1.5,
+    )
+
+    seconds = [
+        interval.next_interval(changed=changed, latency=None).total_seconds()
+        for changed in (True, False, False, False)
+    ]
+    seconds += [
+        interval.next_interval(changed=False, latency=None).total_seconds()
+        for _ in range(4)
+    ]
+    assert seconds == [5.0, 5.0, 7.5, 11.2, 16.9, 20.0, 20.0, 20.0]
+
+    interval.burst()
+    assert interval.interval == timedelta(seconds=5)
+    assert interval.next_interval(changed=False, latency=None) == timedelta(seconds=5)
+
+
+def test_adaptive_interval_is_floored_by_latency():
+    """A slow device is polled no sooner than a multiple of its latency."""
+    interval = FrapolEconet300AdaptiveInterval(
+        min_interval=timedelta(seconds=5),
+        max_interval=timedelta(seconds=60),
+        latency_factor=20,
+    )
+
+    assert interval.next_interval(changed=True, latency=0.1) == timedelta(seconds=5)
+    assert interval.next_interval(changed=True, latency=0.5) == timedelta(seconds=10)
+    assert interval.next_interval(changed=True, latency=5.0) == timedelta(seconds=60)
+
+
+def test_align_spreads_devices_across_interval():
+    """Devices polled at the same interval land within their evenly spaced slots."""
+    scheduler = FrapolEconet300FleetScheduler(jitter=0, clock=lambda: 103.0)
+    for member_id in ("a", "b", "c", "d"):
+        scheduler.register(member_id)
+
+    polls = {
+        member_id: 103.0
+        + scheduler.align(member_id, timedelta(seconds=10)).total_seconds()
+        for member_id in "abcd"
+    }
+
+    assert {member_id: round(poll % 10, 6) for member_id, poll in polls.items()} == {
+        "a": 0.0,
+        "b": 3.0,
+        "c": 5.0,
+        "d": 7.5,
+    }
+    assert all(113.0 <= poll < 123.0 for poll in polls.values())
+
+
+def test_align_never_polls_sooner_than_interval():
+    """Polls are only delayed to reach their slot, whatever the clock and jitter."""
+    now = 0.0
+    scheduler = FrapolEconet300FleetScheduler(clock=lambda: now, rand=lambda: 0.0)
+    scheduler.register("a")
+
+    for step in range(100):
+        now = step * 1.37
+        assert scheduler.align("a", timedelta(seconds=5)) >= timedelta(seconds=5)
+
+
+def test_unregister_respaces_remaining_devices():
+    """Phases are recomputed when a device leaves."""
+    scheduler = FrapolEconet300FleetScheduler(jitter=0, clock=lambda: 0.0)
+    for member_id in ("a", "b", "c", "d"):
+        scheduler.register(member_id)
+    scheduler.unregister("b")
+    scheduler.unregister("unknown")
+
+    delays = sorted(
+        scheduler.align(member_id, timedelta(seconds=3)).total_seconds()
+        for member_id in "acd"
+    )
+    assert delays == [3.0, 4.0, 5.0]
+
+
+def test_simulated_fleet_keeps_event_loop_lag_flat():
+    """Benchmark - dozens of devices, some slow, polled through the scheduler."""
+    devices = 40
+    slow_devices = 8
+    max_concurrent = 4
+    interval = timedelta(seconds=0.4)
+    duration = 2.0
+
+    async def run() -> tuple[Counter, list[float], int, list[float]]:
+        scheduler = FrapolEconet300FleetScheduler(max_concurrent=max_concurrent)
+        poll_counts = Counter()
+        poll_starts = []
+        in_flight = 0
+        peak_in_flight = 0
+
+        async def device(index) -> None:
+            nonlocal in_flight, peak_in_flight
+            member_id = f"device-{index}"
+            latency = 0.15 if index < slow_devices else 0.005
+            while True:
+                await asyncio.sleep(
+                    scheduler.align(member_id, interval).total_seconds()
+                )
+                poll_starts.append(time.monotonic())
+                async with scheduler.limiter:
+                    in_flight += 1
+                    peak_in_flight = max(peak_in_flight, in_flight)
+                    await asyncio.sleep(latency)
+                    in_flight -= 1
+                decode_reg_params(REG_PARAMS)
+                poll_counts[member_id] += 1
+
+        lags = []
+
+        async def probe() -> None:
+            while True:
+                started_at = time.monotonic()
+                await asyncio.sleep(0.005)
+                lags.append(time.monotonic() - started_at - 0.005)
+
+        for index in range(devices):
+            scheduler.register(f"device-{index}")
+        tasks = [asyncio.create_task(device(index)) for index in range(devices)]
+        tasks.append(asyncio.create_task(probe()))
+        await asyncio.sleep(duration)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return poll_counts, poll_starts, peak_in_flight, lags
+
+    poll_counts, poll_starts, peak_in_flight, lags = asyncio.run(run())
+
+    assert peak_in_flight <= max_concurrent
+    # Polls are spread - never more than a handful start within the same 20 ms window
+    assert max(Counter(int(start / 0.02) for start in poll_starts).values()) <= 8
+    # Slow devices do not starve fast ones
+    fast_counts = [
+        poll_counts[f"device-{index}"] for index in range(slow_devices, devices)
+    ]
+    assert min(fast_counts) >= 2
+    assert sorted(lags)[int(len(lags) * 0.99)] < 0.05
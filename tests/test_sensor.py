@@ -0,0 +1,122 @@
+"""Test sensors of the integration set up against the simulated controller."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.config_entries import RELOAD_AFTER_UPDATE_DELAY
+from homeassistant.const import STATE_UNAVAILABLE, EntityCategory
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    CONF_FILTER_SMOOTHING,
+    CONF_FILTER_SMOOTHING_WINDOW,
+    CONF_SENSOR_FILTERS,
+    DOMAIN,
+)
+from custom_components.frapol_econet300_heat_recovery.filters import (
+    FrapolEconet300Smoothing,
+)
+
+
+async def test_aggregate_sensor_keeps_one_window_timer(hass, config_entry, freezer):
+    """Each window end replaces the timer of the previous one."""
+    entity_registry = er.async_get(hass)
+    uid = config_entry.runtime_data.coordinator.data.uid
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"frapol-econet300-{uid}-supply_temperature_mean_1m"
+    )
+    # Enabling the entity reloads the entry after a delay
+    entity_registry.async_update_entity(entity_id, disabled_by=None)
+    freezer.tick(timedelta(seconds=RELOAD_AFTER_UPDATE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    entity = hass.data["sensor"].get_entity(entity_id)
+    on_remove = len(entity._on_remove)
+
+    for _ in range(3):
+        freezer.tick(timedelta(minutes=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == "19.8"
+    assert len(entity._on_remove) == on_remove
+
+
+async def test_aggregate_sensors_of_hand_written_and_discovered_params(
+    hass, config_entry, freezer
+):
+    """Aggregates are named by translations, discovered params by their own name."""
+    entity_registry = er.async_get(hass)
+    uid = config_entry.runtime_data.coordinator.data.uid
+    entity_ids = {
+        name: entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"frapol-econet300-{uid}-{id_suffix}"
+        )
+        for name, id_suffix in (
+            ("Supply temperature mean 15 min", "supply_temperature_mean_15m"),
+            ("REKAlarmTemp mean 15 min", "param_rekalarmtemp_mean_15m"),
+        )
+    }
+    for entity_id in entity_ids.values():
+        entity_registry.async_update_entity(entity_id, disabled_by=None)
+    freezer.tick(timedelta(seconds=RELOAD_AFTER_UPDATE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    for name, entity_id in entity_ids.items():
+        assert hass.states.get(entity_id).attributes["friendly_name"] == name
+
+
+async def test_derived_sensors_are_not_diagnostic(hass, config_entry):
+    """Values derived from readings are regular sensors, unlike integration state."""
+    entity_registry = er.async_get(hass)
+    uid = config_entry.runtime_data.coordinator.data.uid
+    for id_suffix, entity_category in (
+        ("recovery_efficiency", None),
+        ("update_interval", EntityCategory.DIAGNOSTIC),
+    ):
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"frapol-econet300-{uid}-{id_suffix}"
+        )
+        assert entity_registry.async_get(entity_id).entity_category is entity_category
+        assert hass.states.get(entity_id).state != STATE_UNAVAILABLE
+
+
+@pytest.mark.parametrize(
+    "smoothing", [FrapolEconet300Smoothing.MEDIAN, FrapolEconet300Smoothing.EMA]
+)
+async def test_smoothed_sensor_converges_to_steady_value(
+    freezer, hass, mock_config_entry, simulator, smoothing
+):
+    """Smoothing keeps being fed while polls do not change the value."""
+    # Polls started by the ticks below would time out in frozen time
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        pref_disable_polling=True,
+        options={
+            CONF_SENSOR_FILTERS: {
+                "supply_temperature": {
+                    CONF_FILTER_SMOOTHING: smoothing,
+                    CONF_FILTER_SMOOTHING_WINDOW: 3,
+                }
+            }
+        },
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"frapol-econet300-{coordinator.data.uid}-supply_temperature"
+    )
+
+    simulator.reg_params["curr"]["REKcurSupTemp"] = 25.0
+    await coordinator.async_refresh()
+    assert float(hass.states.get(entity_id).state) < 25.0
+    for _ in range(12):
+        freezer.tick(coordinator.update_interval)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert float(hass.states.get(entity_id).state) == 25.0
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
@@ -0,0 +1,49 @@
+"""Test services of the integration against the simulated controller."""
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_PARAMS,
+    ATTR_PROFILE,
+    DOMAIN,
+    SERVICE_APPLY_PROFILE,
+    SERVICE_SAVE_PROFILE,
+)
+
+
+async def test_apply_profile_writes_params_no_entity_listens_to(
+    hass, config_entry, simulator
+):
+    """Params left out of projected polls are read, written and confirmed."""
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    assert coordinator.get_current_param("REKBypassTemp") is None
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SAVE_PROFILE,
+        {
+            ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+            ATTR_PROFILE: "summer",
+            ATTR_PARAMS: {"REKBypassTemp": 18},
+        },
+        blocking=True,
+    )
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        {
+            ATTR_CONFIG_ENTRY_ID: config_entry.entry_id,
+            ATTR_PROFILE: "summer",
+            ATTR_PARAMS: {"REKNoSuchParam": 1},
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "params": {"REKBypassTemp": "confirmed", "REKNoSuchParam": "unknown_param"}
+    }
+    assert simulator.writes == [("REKBypassTemp", "18.0")]
+    # Once written, the param is left out of polls again
+    await coordinator.async_refresh()
+    assert coordinator.get_current_param("REKBypassTemp") is None
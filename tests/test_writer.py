@@ -0,0 +1,102 @@
+"""Test param writes, and validation of values written as a batch."""
+
+import json
+from datetime import timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.frapol_econet300_heat_recovery.const import (
+    WRITE_DEBOUNCE_COOLDOWN,
+)
+from custom_components.frapol_econet300_heat_recovery.metadata import (
+    FrapolEconet300ParamMetadata,
+)
+from custom_components.frapol_econet300_heat_recovery.writer import (
+    FrapolEconet300WriteStatus,
+    coerce_value,
+)
+
+
+class _Metadata:
+    def __init__(self, params) -> None:
+        self._params = params
+
+    def get(self, param_name) -> FrapolEconet300ParamMetadata | None:
+        return self._params.get(param_name)
+
+
+def test_coerce_value_to_type_of_current_value():
+    """Values given as text or other numbers take the type of the current value."""
+    assert coerce_value(4, "2") == 2
+    assert isinstance(coerce_value(4, 2.0), int)
+    assert coerce_value(19.5, "21") == 21.0
+    assert coerce_value(False, "on") is True  # noqa: FBT003 Boolean positional value in function call
+
+    with pytest.raises(ValueError, match="not an integer"):
+        coerce_value(4, 2.5)
+    with pytest.raises(ValueError, match="could not convert"):
+        coerce_value(4, "auto")
+
+
+def test_coerce_value_checks_range_and_options():
+    """Values out of the range or options described by the device are rejected."""
+    metadata = _Metadata(
+        {
+            "REKcurSetPoint": FrapolEconet300ParamMetadata(min_value=10, max_value=30),
+            "REKWS1": FrapolEconet300ParamMetadata(options=(3, 4, 5)),
+        },
+    )
+
+    assert coerce_value(21, 25, metadata, "REKcurSetPoint") == 25
+    assert coerce_value(4, "5", metadata, "REKWS1") == 5
+    with pytest.raises(ValueError, match="range"):
+        coerce_value(21, 31, metadata, "REKcurSetPoint")
+    with pytest.raises(ValueError, match="one of"):
+        coerce_value(4, 2, metadata, "REKWS1")
+
+
+async def test_write_many_confirms_written_params(config_entry, simulator):
+    """Changed params are sent and confirmed with a poll, unchanged ones are skipped."""
+    runtime_data = config_entry.runtime_data
+
+    statuses = await runtime_data.writer.async_write_many(
+        {"REKcurSetPoint": 22, "REKWS1": 4}
+    )
+
+    assert statuses == {
+        "REKcurSetPoint": FrapolEconet300WriteStatus.CONFIRMED,
+        "REKWS1": FrapolEconet300WriteStatus.UNCHANGED,
+    }
+    assert simulator.writes == [("REKcurSetPoint", "22.0")]
+    assert runtime_data.coordinator.get_current_param("REKcurSetPoint") == 22.0
+
+
+async def test_write_many_rolls_back_values_not_confirmed(config_entry, simulator):
+    """A written value the device does not report is replaced by the reported one."""
+    runtime_data = config_entry.runtime_data
+    # The confirming poll still reports the previous set point
+    simulator.replay([json.dumps(simulator.reg_params).encode()])
+
+    statuses = await runtime_data.writer.async_write_many({"REKcurSetPoint": 22})
+
+    assert statuses == {"REKcurSetPoint": FrapolEconet300WriteStatus.NOT_CONFIRMED}
+    assert simulator.writes == [("REKcurSetPoint", "22.0")]
+    assert runtime_data.coordinator.get_current_param("REKcurSetPoint") == 21.0
+
+
+async def test_writes_are_coalesced(freezer, hass, config_entry, simulator):
+    """Writes of a param within the cooldown are sent once, with the last value."""
+    runtime_data = config_entry.runtime_data
+
+    await runtime_data.writer.async_write("REKWS1", 5)
+    await runtime_data.writer.async_write("REKWS1", 6)
+    assert runtime_data.coordinator.get_current_param("REKWS1") == 6
+    assert simulator.writes == []
+
+    freezer.tick(timedelta(seconds=WRITE_DEBOUNCE_COOLDOWN))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert simulator.writes == [("REKWS1", "6")]
+    assert runtime_data.coordinator.get_current_param("REKWS1") == 6